@@ -0,0 +1 @@
+"""Benchmarks reproduzíveis dos caminhos críticos do downloader."""
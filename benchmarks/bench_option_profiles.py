@@ -0,0 +1,82 @@
+"""
+Custo por item das opções de download: montagem a cada item x perfil pronto.
+
+A variante "montagem" repete o que era feito antes dos perfis: procurar o
+FFmpeg e montar o dicionário de opções para cada item. A variante "perfil"
+apenas copia o perfil imutável montado no início do lote.
+    
+    python -m benchmarks.bench_option_profiles --items 10000
+"""
+
+import argparse
+import time
+from typing import Callable, Dict
+
+from src.models.download_result import DownloadType
+from src.services.ffmpeg_manager import FFmpegManager
+from src.services.youtube_downloader import YouTubeDownloader
+
+
+def _measure(get_options: Callable[[DownloadType], dict], items: int) -> float:
+    """
+    Obtém as opções de ``items`` downloads, alternando áudio e vídeo.
+    
+    Args:
+        get_options: Função que devolve as opções de um tipo de download
+        items: Número de itens
+    
+    Returns:
+        Tempo total em segundos
+    """
+    download_types = (DownloadType.AUDIO, DownloadType.VIDEO)
+    started = time.perf_counter()
+    
+    for index in range(items):
+        get_options(download_types[index % 2])
+    
+    return time.perf_counter() - started
+
+
+def run(items: int = 10000) -> Dict[str, float]:
+    """
+    Executa as duas variantes.
+    
+    Args:
+        items: Itens em cada variante
+    
+    Returns:
+        Microssegundos por item em cada variante
+    """
+    downloader = YouTubeDownloader(FFmpegManager())
+    
+    def rebuilt_options(download_type: DownloadType) -> dict:
+        downloader.ffmpeg_manager.refresh()
+        return downloader._build_download_options(download_type)
+    
+    try:
+        downloader.refresh_option_profiles()
+        rebuilt = _measure(rebuilt_options, items)
+        profiled = _measure(downloader._get_download_options, items)
+        
+        return {
+            "rebuilt_us_per_item": rebuilt * 1_000_000 / items,
+            "profile_us_per_item": profiled * 1_000_000 / items,
+        }
+    finally:
+        downloader.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=10000)
+    args = parser.parse_args()
+    
+    result = run(args.items)
+    
+    print(f"{args.items} itens")
+    print(f"  montagem por item: {result['rebuilt_us_per_item']:8.2f} µs/item")
+    print(f"  perfil pronto:     {result['profile_us_per_item']:8.2f} µs/item")
+
+
+if __name__ == "__main__":
+    main()
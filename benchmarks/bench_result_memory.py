@@ -0,0 +1,110 @@
+"""
+Memória ocupada por um lote de resultados: ``DownloadResult`` com e sem slots.
+
+Cria ``items`` resultados em uma lista, como o lote faz fora do modo
+streaming, e mede o pico de memória alocada com ``tracemalloc``. A variante
+sem slots é uma dataclass comum com os mesmos campos.
+    
+    python -m benchmarks.bench_result_memory --items 1000000
+"""
+
+import argparse
+import dataclasses
+import gc
+import tracemalloc
+from typing import Dict, Type
+
+from src.models.download_result import DownloadResult, DownloadStatus, DownloadType
+
+
+def _plain_result_class() -> Type:
+    """
+    Monta uma dataclass com os campos de ``DownloadResult``, sem ``__slots__``.
+    
+    Returns:
+        Classe equivalente, com ``__dict__`` por instância
+    """
+    specs = []
+    
+    for result_field in dataclasses.fields(DownloadResult):
+        if result_field.default is not dataclasses.MISSING:
+            specs.append((result_field.name, result_field.type, dataclasses.field(default=result_field.default)))
+        elif result_field.default_factory is not dataclasses.MISSING:
+            specs.append((
+                result_field.name, result_field.type,
+                dataclasses.field(default_factory=result_field.default_factory)
+            ))
+        else:
+            specs.append((result_field.name, result_field.type))
+    
+    return dataclasses.make_dataclass("PlainDownloadResult", specs)
+
+
+def _measure(result_class: Type, items: int) -> int:
+    """
+    Mede o pico de memória de uma lista de ``items`` resultados.
+    
+    Args:
+        result_class: Classe do resultado
+        items: Número de resultados
+    
+    Returns:
+        Pico de memória alocada, em bytes
+    """
+    results = []
+    gc.collect()
+    tracemalloc.start()
+    
+    try:
+        for index in range(items):
+            results.append(result_class(
+                url=f"https://www.youtube.com/watch?v={index:011d}",
+                status=DownloadStatus.SUCCESS,
+                download_type=DownloadType.AUDIO,
+                title=f"Vídeo {index}",
+                output_path=f"downloads/Vídeo {index}.mp3",
+                bytes_downloaded=4_000_000,
+                stage_timings={"probe": 0.8, "transfer": 3.1, "postprocess": 1.2},
+            ))
+        
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        results.clear()
+
+
+def run(items: int = 1_000_000) -> Dict[str, float]:
+    """
+    Executa as duas variantes.
+    
+    Args:
+        items: Resultados em cada variante
+    
+    Returns:
+        Pico em MB e bytes por resultado de cada variante
+    """
+    slotted = _measure(DownloadResult, items)
+    plain = _measure(_plain_result_class(), items)
+    
+    return {
+        "slots_mb": slotted / 1_000_000,
+        "plain_mb": plain / 1_000_000,
+        "slots_bytes_per_item": slotted / items,
+        "plain_bytes_per_item": plain / items,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    args = parser.parse_args()
+    
+    result = run(args.items)
+    
+    print(f"{args.items} resultados")
+    print(f"  com slots: {result['slots_mb']:9.1f} MB ({result['slots_bytes_per_item']:.0f} bytes/item)")
+    print(f"  sem slots: {result['plain_mb']:9.1f} MB ({result['plain_bytes_per_item']:.0f} bytes/item)")
+
+
+if __name__ == "__main__":
+    main()
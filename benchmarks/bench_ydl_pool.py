@@ -0,0 +1,131 @@
+"""
+Custo por item da sondagem: ``YoutubeDL`` novo a cada item x pool.
+
+Usa um extrator falso (sem rede), de modo que o tempo medido é só o custo
+fixo de cada sondagem: a construção do ``YoutubeDL`` (registro de
+extratores, cookie jar, opener HTTP) ou o empréstimo de uma instância do
+pool, mais a extração em si.
+    
+    python -m benchmarks.bench_ydl_pool --items 500 --workers 8
+"""
+
+import argparse
+import concurrent.futures
+import time
+from typing import Callable, Dict
+
+import yt_dlp as youtube_dl
+from yt_dlp.extractor.common import InfoExtractor
+
+from src.config.settings import settings
+from src.services.ffmpeg_manager import FFmpegManager
+from src.services.youtube_downloader import YouTubeDownloader
+from src.services.ydl_pool import YDLProfile, YoutubeDLPool
+
+
+class StubIE(InfoExtractor):
+    """Extrator que responde sem acessar a rede."""
+    IE_NAME = "stub"
+    _VALID_URL = r"stub:(?P<id>\w+)"
+    
+    def _real_extract(self, url):
+        video_id = self._match_id(url)
+        return {
+            "id": video_id,
+            "title": f"Vídeo {video_id}",
+            "duration": 60,
+            "formats": [{"format_id": "0", "url": f"http://127.0.0.1/{video_id}.mp4", "ext": "mp4"}],
+        }
+
+
+class StubYoutubeDL(youtube_dl.YoutubeDL):
+    """``YoutubeDL`` com o extrator falso à frente dos extratores padrão."""
+    
+    def add_default_info_extractors(self):
+        self.add_info_extractor(StubIE())
+        super().add_default_info_extractors()
+
+
+class StubPool(YoutubeDLPool):
+    """Pool que cria instâncias de ``StubYoutubeDL``."""
+    
+    def _create(self, profile: YDLProfile) -> youtube_dl.YoutubeDL:
+        ydl = StubYoutubeDL(self._factories[profile]())
+        
+        with self._lock:
+            self._created += 1
+        
+        return ydl
+
+
+def _measure(probe: Callable[[str], object], items: int, workers: int) -> float:
+    """
+    Sonda ``items`` URLs com ``workers`` threads.
+    
+    Args:
+        probe: Função de sondagem de uma URL
+        items: Número de URLs
+        workers: Threads de sondagem
+    
+    Returns:
+        Tempo total em segundos
+    """
+    urls = [f"stub:v{i}" for i in range(items)]
+    started = time.perf_counter()
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(probe, urls))
+    
+    return time.perf_counter() - started
+
+
+def run(items: int = 200, workers: int = 4) -> Dict[str, float]:
+    """
+    Executa as duas variantes.
+    
+    Args:
+        items: Itens sondados em cada variante
+        workers: Threads de sondagem
+    
+    Returns:
+        Milissegundos por item em cada variante e instâncias criadas pelo pool
+    """
+    previous_cache = settings.METADATA_CACHE_ENABLED
+    settings.METADATA_CACHE_ENABLED = False
+    downloader = YouTubeDownloader(FFmpegManager(), StubPool())
+    
+    def fresh_probe(url: str) -> dict:
+        # Comportamento anterior ao pool: uma instância por chamada
+        with StubYoutubeDL(downloader._get_probe_options()) as ydl:
+            return ydl.extract_info(url, download=False, process=False)
+    
+    try:
+        fresh = _measure(fresh_probe, items, workers)
+        pooled = _measure(downloader._probe_video, items, workers)
+        
+        return {
+            "fresh_ms_per_item": fresh * 1000 / items,
+            "pooled_ms_per_item": pooled * 1000 / items,
+            "pooled_instances": downloader.ydl_pool.created_instances,
+        }
+    finally:
+        downloader.close()
+        settings.METADATA_CACHE_ENABLED = previous_cache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    
+    result = run(args.items, args.workers)
+    
+    print(f"{args.items} itens, {args.workers} threads")
+    print(f"  YoutubeDL por item: {result['fresh_ms_per_item']:8.3f} ms/item")
+    print(f"  pool:               {result['pooled_ms_per_item']:8.3f} ms/item "
+          f"({result['pooled_instances']} instâncias criadas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""Permite executar ``python -m src`` em modo não interativo."""
+
+import sys
+
+from colorama import init
+
+# Inicializa colorama para cores no terminal
+init(autoreset=True)
+
+from .core.cli import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,24 +19,69 @@ class Colors:
 class Paths:
     """Configurações de caminhos."""
     FFMPEG_DIR = "./tools/ffmpeg/bin"
-    FFMPEG_PATH = os.path.join(FFMPEG_DIR, "ffmpeg.exe")
+    FFMPEG_EXECUTABLE = "ffmpeg.exe" if os.name == "nt" else "ffmpeg"
+    FFMPEG_PATH = os.path.join(FFMPEG_DIR, FFMPEG_EXECUTABLE)
+    FFMPEG_LOCATION = os.environ.get("FFMPEG_LOCATION")  # executável ou diretório escolhido pelo usuário
+    FFMPEG_CAPABILITIES_PATH = "./tools/ffmpeg/capabilities.json"
     DOWNLOAD_DIR = "./downloads"
+    METADATA_CACHE_FILENAME = ".metadata_cache.sqlite3"
+    JOURNAL_FILENAME = ".download_journal.jsonl"
+    PERFORMANCE_REPORT_FILENAME = "performance_report.json"
+    LOG_JSON_PATH = None  # arquivo JSON-lines com os eventos do log; None desativa
+    RESULTS_FILENAME = ".batch_results.jsonl"  # resultados do lote no modo streaming
 
 
 @dataclass
 class URLs:
     """URLs de download."""
     FFMPEG_DOWNLOAD_URL = "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip"
+    FFMPEG_CHECKSUM_URL = FFMPEG_DOWNLOAD_URL + ".sha256"
 
 
 @dataclass
 class Settings:
     """Configurações gerais da aplicação."""
-    MAX_PARALLEL_DOWNLOADS = 5
-    DEFAULT_AUDIO_QUALITY = "192"
+    MAX_PARALLEL_DOWNLOADS = 5  # valor inicial quando a concorrência é adaptativa
+    ADAPTIVE_CONCURRENCY = True
+    CONCURRENCY_FLOOR = 1
+    CONCURRENCY_CEILING = 32
+    CONCURRENCY_ADJUST_INTERVAL = 5.0  # segundos
+    CONCURRENCY_ERROR_THRESHOLD = 0.2
+    CONCURRENCY_DECREASE_FACTOR = 0.5
+    CONCURRENCY_THROUGHPUT_TOLERANCE = 0.05
+    PROBE_WORKERS = 16
+    PROBE_QUEUE_SIZE = 32  # itens sondados ou em sondagem à frente das transferências
+    MAX_PARALLEL_PLAYLIST_EXPANSIONS = 8
+    PLAYLIST_LOOKAHEAD = 64  # URLs de entrada lidas à frente para resolver playlists em paralelo
+    PROCESS_SHARDS = 1  # processos por lote; 0 = um por núcleo
+    DOWNLOAD_ENGINE = "threads"  # "threads" ou "asyncio" (requer aiohttp)
+    ASYNC_RESOLVE_WORKERS = 8
+    ASYNC_MAX_CONCURRENT_ITEMS = 64
+    ASYNC_MAX_FRAGMENTS = 256  # faixas HTTP simultâneas no motor asyncio
+    ASYNC_CHUNK_SIZE = 10 * 1024 * 1024  # bytes por faixa
+    AUDIO_PROFILE = "mp3"  # "mp3", "native" (só troca o contêiner), "opus" ou "aac"
+    DEFAULT_AUDIO_QUALITY = "192"  # kbps dos perfis que recodificam
+    DECOUPLED_TRANSCODE = True  # converte áudio fora da vaga de download
+    TRANSCODE_WORKERS = 0  # conversões simultâneas no lote (divididas entre os processos); 0 = uma por núcleo
+    TRANSCODE_QUEUE_FACTOR = 2  # conversões em fila por worker; cheia, novas transferências esperam
     DEFAULT_VIDEO_FORMAT = "best[ext=mp4]/best"
     DEFAULT_AUDIO_FORMAT = "bestaudio/best"
     REQUEST_TIMEOUT = 30
+    DOWNLOAD_RETRIES = 3  # novas tentativas do yt-dlp por transferência interrompida
+    METRICS_PORT = 0  # porta do endpoint /metrics (Prometheus); 0 = desativado
+    METRICS_HOST = "127.0.0.1"
+    LOG_LEVEL = "INFO"  # nível mínimo no console: DEBUG, INFO, SUCCESS, WARNING ou ERROR
+    PROGRESS_STATUS_LINE = True  # linha de status única no lugar do progresso do yt-dlp
+    PROGRESS_REFRESH_INTERVAL = 0.5  # segundos
+    STREAM_RESULTS = False  # grava os resultados em disco em vez de mantê-los em memória
+    FFMPEG_DOWNLOAD_PARTS = 4  # requisições paralelas por faixa; 1 = conexão única
+    FFMPEG_VERIFY_CHECKSUM = True
+    METADATA_CACHE_ENABLED = True
+    METADATA_CACHE_TTL = 7 * 24 * 60 * 60  # segundos
+    PLAYLIST_CACHE_TTL = 60 * 60  # segundos; entradas de playlists mudam, 0 = não usar o cache
+    METADATA_CACHE_MAX_ENTRIES = 50000
+    RESUME_FROM_JOURNAL = True
+    JOURNAL_CHECKSUM = True
 
 
 # Instâncias globais das configurações
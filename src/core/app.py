@@ -1,18 +1,25 @@
 """Aplicação principal do YouTube Downloader."""
 
+import collections
+import concurrent.futures
 import os
-from typing import List
+from typing import Iterable, Iterator, List
 
 from ..models.download_result import DownloadType, BatchDownloadResult
 from ..services.ffmpeg_manager import FFmpegManager
 from ..services.youtube_downloader import YouTubeDownloader
 from ..services.playlist_handler import PlaylistHandler
+from ..services.metadata_cache import MetadataCache
+from ..services.metrics import MetricsServer
+from ..services.download_journal import DownloadJournal
+from ..services.ydl_pool import YoutubeDLPool
 from ..ui.input_handler import InputHandler
 from ..ui.menu import MenuDisplay, MenuController
 from ..utils.validators import URLValidator
 from ..utils.file_utils import FileManager, ReportGenerator
 from ..utils.logger import logger
-from ..config.settings import paths
+from ..utils.read_ahead import END, ReadAhead
+from ..config.settings import paths, settings
 
 
 class YouTubeDownloaderApp:
@@ -22,13 +29,22 @@ class YouTubeDownloaderApp:
         # Inicializa componentes
         self.file_manager = FileManager()
         self.ffmpeg_manager = FFmpegManager()
-        self.youtube_downloader = YouTubeDownloader(self.ffmpeg_manager)
-        self.playlist_handler = PlaylistHandler()
+        self.ydl_pool = YoutubeDLPool()
+        self.metadata_cache = MetadataCache()
+        self.journal = DownloadJournal()
+        self.youtube_downloader = YouTubeDownloader(
+            self.ffmpeg_manager, self.ydl_pool, self.metadata_cache, self.journal
+        )
+        self.playlist_handler = PlaylistHandler(self.ydl_pool, self.metadata_cache)
         self.input_handler = InputHandler()
         self.menu_display = MenuDisplay()
+        self.youtube_downloader.progress_renderer = self.menu_display.show_status_line
         self.menu_controller = MenuController(self.input_handler, self.menu_display)
         self.url_validator = URLValidator()
         self.report_generator = ReportGenerator()
+        self.metrics_server = MetricsServer(
+            self.youtube_downloader.metrics, settings.METRICS_PORT, settings.METRICS_HOST
+        )
     
     def setup(self) -> bool:
         """
@@ -43,10 +59,16 @@ class YouTubeDownloaderApp:
                 logger.error("Falha na configuração do FFmpeg")
                 return False
             
+            self.youtube_downloader.refresh_option_profiles()
+            
             # Cria diretório de downloads
             self.file_manager.create_directory_if_not_exists(paths.DOWNLOAD_DIR)
             logger.info("Diretório de downloads criado/verificado")
             
+            # Endpoint de métricas é opcional: uma porta ocupada não impede o uso
+            if settings.METRICS_PORT:
+                self.metrics_server.start()
+            
             return True
             
         except Exception as e:
@@ -86,6 +108,13 @@ class YouTubeDownloaderApp:
         except Exception as e:
             logger.error(f"\nErro durante o processo: {e}")
             logger.info("Verifique sua conexão e tente novamente.")
+        finally:
+            self.close()
+    
+    def close(self) -> None:
+        """Libera os recursos mantidos pelos serviços."""
+        self.metrics_server.stop()
+        self.youtube_downloader.close()
     
     def _handle_single_download(self, download_type: DownloadType) -> None:
         """
@@ -131,16 +160,33 @@ class YouTubeDownloaderApp:
         
         logger.info(f"Modo lote: {len(urls)} URLs para processamento.")
         
-        # Expande playlists em vídeos individuais
-        all_video_urls = self._expand_playlists(urls)
+        self.run_batch(urls, download_type)
+    
+    def run_batch(self, urls: Iterable[str], download_type: DownloadType) -> BatchDownloadResult:
+        """
+        Expande playlists, executa o download em lote e exibe os resultados.
         
-        logger.info(f"Total de {len(all_video_urls)} vídeos para download em lote.")
+        Usado tanto pelo menu interativo quanto pela linha de comando.
+        
+        Args:
+            urls: URLs (lista ou gerador) que podem incluir playlists
+            download_type: Tipo de download (áudio ou vídeo)
+            
+        Returns:
+            Resultado do download em lote
+        """
+        # Expande playlists sob demanda, alimentando os downloads conforme chegam
+        all_video_urls = self._expand_playlists(urls)
         
         # Executa downloads em paralelo
         batch_result = self.youtube_downloader.download_batch(all_video_urls, download_type)
         
+        logger.info(f"Total de {batch_result.total_downloads} vídeos processados em lote.")
+        
         # Exibe resultados
         self._show_batch_download_results(batch_result)
+        
+        return batch_result
     
     def _download_playlist(self, playlist_url: str, download_type: DownloadType) -> None:
         """
@@ -150,15 +196,15 @@ class YouTubeDownloaderApp:
             playlist_url: URL da playlist
             download_type: Tipo de download
         """
-        # Obtém informações da playlist
-        playlist_title = self.playlist_handler.get_playlist_title(playlist_url)
-        video_urls = self.playlist_handler.get_playlist_entries(playlist_url)
+        # Obtém informações da playlist (resolvida uma única vez)
+        playlist_info = self.playlist_handler.resolve_playlist(playlist_url)
+        video_urls = playlist_info.video_urls
         
-        self.menu_display.show_playlist_info(playlist_title, len(video_urls))
+        self.menu_display.show_playlist_info(playlist_info.title, len(video_urls))
         
         # Confirma se o usuário quer continuar
         if not self.input_handler.confirm_action(
-            f"Deseja baixar {len(video_urls)} vídeos da playlist '{playlist_title}'?"
+            f"Deseja baixar {len(video_urls)} vídeos da playlist '{playlist_info.title}'?"
         ):
             logger.info("Download da playlist cancelado.")
             return
@@ -167,28 +213,78 @@ class YouTubeDownloaderApp:
         batch_result = self.youtube_downloader.download_batch(video_urls, download_type)
         self._show_batch_download_results(batch_result)
     
-    def _expand_playlists(self, urls: List[str]) -> List[str]:
+    def _expand_playlists(self, urls: Iterable[str]) -> Iterator[str]:
         """
         Expande URLs de playlist em URLs de vídeos individuais.
         
+        As URLs de entrada são consumidas sob demanda (podem vir de um
+        gerador, como a entrada padrão), com até ``PLAYLIST_LOOKAHEAD`` lidas
+        à frente. Playlists já presentes nessa janela são resolvidas em
+        paralelo por um pool limitado, enquanto a playlist atual é gerada à
+        medida que suas páginas são obtidas. A ordem das URLs de entrada é
+        preservada e vídeos repetidos entre playlists (mesmo ID) são gerados
+        apenas uma vez.
+        
         Args:
-            urls: Lista de URLs que podem incluir playlists
+            urls: URLs (lista ou gerador) que podem incluir playlists
             
-        Returns:
-            Lista de URLs de vídeos individuais
+        Yields:
+            URLs de vídeos individuais, sem repetição
         """
-        all_video_urls = []
+        reader = ReadAhead(urls, settings.PLAYLIST_LOOKAHEAD)
+        lookahead = collections.deque()
+        pending = {}
+        expanded = set()
+        seen_ids = set()
         
-        for url in urls:
-            if self.url_validator.is_playlist_url(url) and self.playlist_handler.is_playlist(url):
-                logger.info(f"Processando playlist: {url}")
-                playlist_videos = self.playlist_handler.get_playlist_entries(url)
-                logger.info(f"Adicionados {len(playlist_videos)} vídeos da playlist.")
-                all_video_urls.extend(playlist_videos)
-            else:
-                all_video_urls.append(url)
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=settings.MAX_PARALLEL_PLAYLIST_EXPANSIONS
+        )
         
-        return all_video_urls
+        try:
+            while True:
+                url = lookahead.popleft() if lookahead else reader.get()
+                if url is END:
+                    break
+                
+                if url in expanded:
+                    continue
+                
+                # Marcada antes de olhar a janela, para que uma repetição da
+                # playlist atual não seja resolvida de novo em segundo plano
+                is_playlist = url in pending or self.url_validator.is_playlist_url(url)
+                if is_playlist:
+                    expanded.add(url)
+                
+                # Playlists que já chegaram à janela são resolvidas à frente
+                for ahead in reader.get_ready(settings.PLAYLIST_LOOKAHEAD - len(lookahead)):
+                    lookahead.append(ahead)
+                    if (
+                        ahead not in pending and ahead not in expanded
+                        and self.url_validator.is_playlist_url(ahead)
+                    ):
+                        pending[ahead] = executor.submit(self.playlist_handler.get_playlist_entries, ahead)
+                
+                if url in pending:
+                    logger.info(f"Processando playlist: {url}")
+                    video_urls = pending.pop(url).result()
+                elif is_playlist:
+                    logger.info(f"Processando playlist: {url}")
+                    video_urls = self.playlist_handler.iter_playlist_entries(url)
+                else:
+                    video_urls = [url]
+                
+                for video_url in video_urls:
+                    video_id = self.url_validator.extract_video_id(video_url) or video_url
+                    
+                    if video_id in seen_ids:
+                        continue
+                    
+                    seen_ids.add(video_id)
+                    yield video_url
+        finally:
+            reader.close()
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def _show_single_download_result(self, result) -> None:
         """
@@ -212,6 +308,7 @@ class YouTubeDownloaderApp:
             batch_result: Resultado do download em lote
         """
         self.menu_display.show_batch_download_summary(batch_result)
+        self._save_performance_report(batch_result)
         
         # Exibe relatório detalhado de falhas
         failed_results = batch_result.get_failed_results()
@@ -219,6 +316,20 @@ class YouTubeDownloaderApp:
             self.menu_display.show_failed_downloads_report(failed_results)
             self._save_failed_downloads_report(failed_results)
     
+    def _save_performance_report(self, batch_result: BatchDownloadResult) -> None:
+        """
+        Salva o relatório de desempenho (tempos por etapa, vazão) em JSON.
+        
+        Args:
+            batch_result: Resultado do download em lote
+        """
+        report_path = os.path.join(paths.DOWNLOAD_DIR, paths.PERFORMANCE_REPORT_FILENAME)
+        
+        if self.report_generator.save_performance_report(batch_result.get_performance_report(), report_path):
+            logger.info(f"Relatório de desempenho salvo em: {report_path}")
+        else:
+            logger.warning("Não foi possível salvar o relatório de desempenho.")
+    
     def _save_failed_downloads_report(self, failed_results: List) -> None:
         """
         Salva relatório de downloads com falha em arquivo.
@@ -0,0 +1,254 @@
+"""Linha de comando não interativa do YouTube Downloader."""
+
+import argparse
+import itertools
+import sys
+from typing import Iterator, List, Optional, TextIO
+
+from .app import YouTubeDownloaderApp
+from ..config.settings import paths, settings
+from ..models.download_result import DownloadType
+from ..services.audio_transcoder import AudioProfile
+from ..utils.logger import LEVELS, logger
+from ..utils.shutdown import drain_on_signals
+from ..utils.validators import URLValidator
+
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_SETUP_ERROR = 2
+EXIT_INTERRUPTED = 130
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Monta o parser de argumentos da linha de comando.
+    
+    Returns:
+        Parser configurado
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src",
+        description="Download de vídeos e áudios do YouTube sem menus interativos."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    download = subparsers.add_parser("download", help="Baixa uma lista de URLs em lote")
+    download.add_argument(
+        "--type",
+        choices=[download_type.value for download_type in DownloadType],
+        default=DownloadType.VIDEO.value,
+        help="Tipo de download (padrão: video)"
+    )
+    download.add_argument(
+        "--audio-profile",
+        choices=[profile.value for profile in AudioProfile],
+        default=settings.AUDIO_PROFILE,
+        help=f"Formato dos áudios; 'native' mantém o codec original (padrão: {settings.AUDIO_PROFILE})"
+    )
+    download.add_argument(
+        "--audio-bitrate",
+        default=settings.DEFAULT_AUDIO_QUALITY,
+        help=f"Bitrate em kbps dos perfis que recodificam (padrão: {settings.DEFAULT_AUDIO_QUALITY})"
+    )
+    download.add_argument(
+        "--from",
+        dest="source",
+        default="-",
+        help="Arquivo com uma URL por linha; '-' lê da entrada padrão (padrão)"
+    )
+    download.add_argument(
+        "--jobs",
+        type=int,
+        default=settings.MAX_PARALLEL_DOWNLOADS,
+        help=(
+            f"Downloads simultâneos iniciais; a concorrência adaptativa ajusta o valor "
+            f"durante o lote, até --max-jobs (use --fixed-jobs para mantê-lo) "
+            f"(padrão: {settings.MAX_PARALLEL_DOWNLOADS})"
+        )
+    )
+    download.add_argument(
+        "--max-jobs",
+        type=int,
+        default=settings.CONCURRENCY_CEILING,
+        help=f"Limite superior da concorrência adaptativa (padrão: {settings.CONCURRENCY_CEILING})"
+    )
+    download.add_argument(
+        "--fixed-jobs",
+        action="store_true",
+        help="Mantém --jobs fixo, sem ajuste adaptativo"
+    )
+    download.add_argument(
+        "--processes",
+        type=int,
+        nargs="?",
+        const=0,
+        default=settings.PROCESS_SHARDS,
+        metavar="N",
+        help="Divide o lote entre N processos; sem N, um por núcleo (padrão: 1)"
+    )
+    download.add_argument(
+        "--out",
+        default=paths.DOWNLOAD_DIR,
+        help=f"Diretório de saída (padrão: {paths.DOWNLOAD_DIR})"
+    )
+    download.add_argument(
+        "--ffmpeg",
+        default=paths.FFMPEG_LOCATION,
+        metavar="CAMINHO",
+        help="Executável (ou diretório) do FFmpeg; por padrão usa o instalado ou o do PATH"
+    )
+    download.add_argument(
+        "--metrics-port",
+        type=int,
+        default=settings.METRICS_PORT,
+        metavar="PORTA",
+        help="Expõe métricas do Prometheus em http://127.0.0.1:PORTA/metrics durante o lote"
+    )
+    download.add_argument(
+        "--log-level",
+        choices=list(LEVELS),
+        default=settings.LOG_LEVEL,
+        help=f"Nível mínimo das mensagens no console (padrão: {settings.LOG_LEVEL})"
+    )
+    download.add_argument(
+        "--log-json",
+        default=paths.LOG_JSON_PATH,
+        metavar="ARQUIVO",
+        help="Grava os eventos (item, etapa, duração, bytes) em um arquivo JSON-lines"
+    )
+    download.add_argument(
+        "--stream-results",
+        action="store_true",
+        help="Grava os resultados do lote em disco (JSON-lines) em vez de mantê-los em memória"
+    )
+    download.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Ignora o diário de downloads e verifica todos os itens novamente"
+    )
+    
+    return parser
+
+
+def iter_urls(stream: TextIO) -> Iterator[str]:
+    """
+    Lê URLs de um arquivo, ignorando linhas vazias, comentários e URLs inválidas.
+    
+    Args:
+        stream: Arquivo ou entrada padrão
+        
+    Yields:
+        URLs válidas do YouTube
+    """
+    for line in stream:
+        url = line.strip()
+        
+        if not url or url.startswith("#"):
+            continue
+        
+        if URLValidator.is_valid_youtube_url(url):
+            yield url
+        else:
+            logger.warning(f"URL inválida ignorada: {url}")
+
+
+def open_source(source: str) -> TextIO:
+    """
+    Abre a origem das URLs.
+    
+    Args:
+        source: Caminho do arquivo ou '-' para a entrada padrão
+        
+    Returns:
+        Arquivo aberto (ou ``sys.stdin``), lido sob demanda por ``iter_urls``
+    """
+    if source == "-":
+        return sys.stdin
+    
+    return open(source, "r", encoding="utf-8")
+
+
+def run_download(args: argparse.Namespace) -> int:
+    """
+    Executa o comando ``download``.
+    
+    Args:
+        args: Argumentos já interpretados
+        
+    Returns:
+        Código de saída do processo
+    """
+    # Configurações precisam ser aplicadas antes de construir os serviços
+    paths.DOWNLOAD_DIR = args.out
+    paths.FFMPEG_LOCATION = args.ffmpeg
+    paths.LOG_JSON_PATH = args.log_json
+    settings.LOG_LEVEL = args.log_level
+    settings.METRICS_PORT = max(0, args.metrics_port)
+    settings.AUDIO_PROFILE = args.audio_profile
+    settings.DEFAULT_AUDIO_QUALITY = str(args.audio_bitrate)
+    settings.MAX_PARALLEL_DOWNLOADS = max(1, args.jobs)
+    settings.CONCURRENCY_CEILING = max(settings.MAX_PARALLEL_DOWNLOADS, args.max_jobs)
+    settings.PROCESS_SHARDS = max(0, args.processes)
+    if args.fixed_jobs:
+        settings.ADAPTIVE_CONCURRENCY = False
+    if args.no_resume:
+        settings.RESUME_FROM_JOURNAL = False
+    if args.stream_results:
+        settings.STREAM_RESULTS = True
+    
+    try:
+        stream = open_source(args.source)
+    except OSError as e:
+        logger.error(f"Não foi possível ler as URLs: {e}")
+        return EXIT_SETUP_ERROR
+    
+    # As URLs são transmitidas ao lote à medida que são lidas; só a primeira
+    # é lida antes, para detectar uma entrada vazia
+    urls = iter_urls(stream)
+    first_url = next(urls, None)
+    
+    if first_url is None:
+        logger.error("Nenhum URL fornecido para download em lote.")
+        stream.close()
+        return EXIT_SETUP_ERROR
+    
+    urls = itertools.chain([first_url], urls)
+    app = YouTubeDownloaderApp()
+    
+    try:
+        if not app.setup():
+            logger.error("Falha na configuração inicial. Encerrando.")
+            return EXIT_SETUP_ERROR
+        
+        # SIGTERM e o primeiro Ctrl+C encerram o lote sem abandonar itens
+        # pela metade; um segundo Ctrl+C cancela o restante
+        with drain_on_signals(app.youtube_downloader.drain_batch):
+            batch_result = app.run_batch(urls, DownloadType(args.type))
+        
+        return EXIT_FAILURES if batch_result.failed else EXIT_OK
+        
+    except KeyboardInterrupt:
+        logger.warning("\nDownload interrompido pelo usuário.")
+        return EXIT_INTERRUPTED
+    finally:
+        app.close()
+        stream.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Ponto de entrada da linha de comando.
+    
+    Args:
+        argv: Argumentos (padrão: ``sys.argv[1:]``)
+        
+    Returns:
+        Código de saída do processo
+    """
+    args = build_parser().parse_args(argv)
+    
+    if args.command == "download":
+        return run_download(args)
+    
+    return EXIT_SETUP_ERROR
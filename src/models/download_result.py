@@ -1,9 +1,12 @@
 """Modelos de dados para resultados de download."""
 
-from dataclasses import dataclass
-from typing import Optional
+import json
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
 from enum import Enum
 
+from ..utils.stage_meter import STAGE_LABELS, summarize_stage_timings
+
 
 class DownloadType(Enum):
     """Tipos de download disponíveis."""
@@ -19,7 +22,7 @@ class DownloadStatus(Enum):
     PENDING = "pending"
 
 
-@dataclass
+@dataclass(slots=True)
 class VideoInfo:
     """Informações de um vídeo."""
     title: str
@@ -28,15 +31,47 @@ class VideoInfo:
     thumbnail: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
+class PlaylistInfo:
+    """Informações resolvidas de uma playlist."""
+    url: str
+    title: str
+    entry_ids: list[str]
+    is_playlist: bool = True
+    
+    @property
+    def video_count(self) -> int:
+        """Número de vídeos da playlist."""
+        return len(self.entry_ids)
+    
+    @property
+    def video_urls(self) -> list[str]:
+        """URLs individuais dos vídeos, ou a própria URL se não for playlist."""
+        if not self.is_playlist:
+            return [self.url]
+        return [f"https://www.youtube.com/watch?v={video_id}" for video_id in self.entry_ids]
+
+
+@dataclass(slots=True)
 class DownloadResult:
-    """Resultado de um download."""
+    """
+    Resultado de um download.
+    
+    Usa ``__slots__`` (sem ``__dict__`` por instância), pois lotes grandes
+    e o modo streaming criam um objeto por item. Para disco, ``to_row`` e
+    ``from_row`` usam uma lista posicional, sem repetir os nomes dos campos.
+    """
     url: str
     status: DownloadStatus
     download_type: DownloadType
     title: str = ""
     error_message: Optional[str] = None
     existing_file: Optional[str] = None
+    output_path: Optional[str] = None
+    bytes_downloaded: int = 0
+    checksum: Optional[str] = None
+    stage_timings: dict[str, float] = field(default_factory=dict)  # etapa -> segundos
+    retries: int = 0  # novas tentativas feitas pelo yt-dlp
     
     @property
     def is_success(self) -> bool:
@@ -52,9 +87,76 @@ class DownloadResult:
     def is_skipped(self) -> bool:
         """Verifica se o download foi pulado."""
         return self.status == DownloadStatus.SKIPPED
+    
+    def to_row(self) -> list:
+        """
+        Converte o resultado em uma linha compacta (ordem de ``__slots__``).
+        
+        Os tempos por etapa viram uma lista na ordem de ``STAGE_LABELS``.
+        
+        Returns:
+            Lista serializável em JSON
+        """
+        timings = self.stage_timings
+        return [
+            self.url, self.status.value, self.download_type.value, self.title,
+            self.error_message, self.existing_file, self.output_path,
+            self.bytes_downloaded, self.checksum,
+            [timings.get(stage) for stage in STAGE_LABELS], self.retries
+        ]
+    
+    @classmethod
+    def from_row(cls, row: list) -> "DownloadResult":
+        """
+        Reconstrói um resultado a partir de ``to_row``.
+        
+        Os enums voltam como os próprios membros e as chaves dos tempos são
+        as de ``STAGE_LABELS``, compartilhadas por todos os resultados.
+        
+        Args:
+            row: Linha gerada por ``to_row``
+        
+        Returns:
+            Resultado reconstruído
+        """
+        (url, status, download_type, title, error_message, existing_file,
+         output_path, bytes_downloaded, checksum, timings, retries) = row
+        
+        return cls(
+            url, _STATUSES[status], _DOWNLOAD_TYPES[download_type], title,
+            error_message, existing_file, output_path, bytes_downloaded, checksum,
+            {stage: seconds for stage, seconds in zip(STAGE_LABELS, timings) if seconds is not None},
+            retries
+        )
+    
+    def to_json_line(self) -> str:
+        """Serializa o resultado como uma linha JSON compacta."""
+        return json.dumps(self.to_row(), ensure_ascii=False, separators=(",", ":")) + "\n"
+    
+    @classmethod
+    def read_jsonl(cls, path: str) -> Iterator["DownloadResult"]:
+        """Lê, um a um, os resultados gravados com ``to_json_line``."""
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield cls.from_row(json.loads(line))
+
+
+# Valor -> membro, para a leitura das linhas compactas
+_STATUSES = {status.value: status for status in DownloadStatus}
+_DOWNLOAD_TYPES = {download_type.value: download_type for download_type in DownloadType}
+
+
+@dataclass(slots=True)
+class ProbedItem:
+    """Item que passou pela etapa de sondagem do pipeline de download."""
+    result: DownloadResult
+    journal_key: str
+    video_info: Optional[VideoInfo] = None
+    info_dict: Optional[dict] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class BatchDownloadResult:
     """Resultado de downloads em lote."""
     total_downloads: int
@@ -62,6 +164,12 @@ class BatchDownloadResult:
     failed: int
     skipped: int
     download_results: list[DownloadResult]
+    concurrency_curve: list[tuple[float, int, float]] = field(default_factory=list)
+    stage_stats: dict[str, dict[str, float]] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+    bytes_downloaded: int = 0
+    retries: int = 0
+    results_path: Optional[str] = None  # resultados em JSON-lines (modo streaming)
     
     @property
     def success_rate(self) -> float:
@@ -70,10 +178,56 @@ class BatchDownloadResult:
             return 0.0
         return (self.successful + self.skipped) / self.total_downloads
     
+    @property
+    def throughput(self) -> float:
+        """Vazão agregada do lote em MB/s."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.bytes_downloaded / 1_000_000 / self.elapsed_seconds
+    
+    def iter_results(self) -> Iterator[DownloadResult]:
+        """Percorre os resultados, da memória ou do arquivo do modo streaming."""
+        if self.results_path is not None:
+            return DownloadResult.read_jsonl(self.results_path)
+        return iter(self.download_results)
+    
+    def get_stage_percentiles(self) -> dict[str, dict[str, float]]:
+        """Retorna p50/p95/p99 e o total de cada etapa do pipeline."""
+        return summarize_stage_timings(result.stage_timings for result in self.iter_results())
+    
+    def get_performance_report(self) -> dict:
+        """Retorna o relatório de desempenho do lote, serializável em JSON."""
+        report = {
+            "elapsed_seconds": self.elapsed_seconds,
+            "bytes_downloaded": self.bytes_downloaded,
+            "mb_per_second": self.throughput,
+            "retries": self.retries,
+            "stages": self.get_stage_percentiles(),
+        }
+        
+        # No modo streaming os itens já estão em disco, um por linha
+        if self.results_path is not None:
+            report["results_path"] = self.results_path
+            return report
+        
+        report["items"] = [
+            {
+                "url": result.url,
+                "title": result.title,
+                "status": result.status.value,
+                "bytes_downloaded": result.bytes_downloaded,
+                "retries": result.retries,
+                "stage_timings": result.stage_timings,
+                "error_message": result.error_message,
+            }
+            for result in self.download_results
+        ]
+        return report
+    
     def get_failed_results(self) -> list[DownloadResult]:
         """Retorna apenas os resultados que falharam."""
-        return [result for result in self.download_results if result.is_failed]
+        return [result for result in self.iter_results() if result.is_failed]
     
     def get_successful_results(self) -> list[DownloadResult]:
         """Retorna apenas os resultados bem-sucedidos."""
-        return [result for result in self.download_results if result.is_success]
+        return [result for result in self.iter_results() if result.is_success]
@@ -0,0 +1,571 @@
+"""Motor de download em lote baseado em asyncio."""
+
+import asyncio
+import concurrent.futures
+import os
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Set, Tuple
+
+from ..config.settings import settings
+from ..models.download_result import DownloadResult, DownloadStatus, DownloadType, ProbedItem
+from ..services.audio_transcoder import get_transcode_workers
+from ..utils.file_utils import FileManager
+from ..utils.logger import logger
+from ..utils.stage_meter import time_stage
+
+try:
+    import aiohttp
+except ImportError:  # dependência opcional
+    aiohttp = None
+
+if TYPE_CHECKING:
+    from .youtube_downloader import YouTubeDownloader
+
+
+class IncompleteRangeError(IOError):
+    """Resposta encerrada antes de entregar todos os bytes da faixa."""
+
+
+class AsyncDownloadEngine:
+    """
+    Executa um lote com as transferências HTTP feitas em um único event loop.
+    
+    O yt-dlp continua resolvendo metadados e formatos, em um pequeno pool de
+    threads, mas os bytes de formatos HTTP simples são buscados pelo
+    ``aiohttp`` em faixas (``Range``) concorrentes, gravadas diretamente em
+    suas posições no arquivo ``.part``. Centenas de faixas podem estar em
+    voo sem o custo de uma thread por conexão. Formatos que exigem o
+    downloader do yt-dlp (HLS, DASH, mesclagem de áudio e vídeo) usam a
+    transferência comum em uma thread do pool. Áudios baixados são
+    convertidos em um pool separado, do tamanho de ``TRANSCODE_WORKERS``.
+    """
+    
+    RANGE_PROTOCOLS = ("http", "https")
+    READ_SIZE = 64 * 1024
+    
+    def __init__(self, downloader: "YouTubeDownloader"):
+        self.downloader = downloader
+    
+    @staticmethod
+    def is_available() -> bool:
+        """
+        Verifica se o cliente HTTP assíncrono está instalado.
+        
+        Returns:
+            True se o ``aiohttp`` puder ser usado
+        """
+        return aiohttp is not None
+    
+    def run(self, urls: Iterable[str], download_type: DownloadType) -> None:
+        """
+        Baixa um lote de URLs.
+        
+        Cada resultado é entregue ao downloader (``_collect_result``) assim
+        que o item termina; nenhuma lista do lote é mantida aqui.
+        
+        Args:
+            urls: URLs a baixar (lista ou gerador)
+            download_type: Tipo de download
+        """
+        return asyncio.run(self._run(urls, download_type))
+    
+    async def _run(self, urls: Iterable[str], download_type: DownloadType) -> None:
+        """
+        Mantém até ``ASYNC_MAX_CONCURRENT_ITEMS`` itens em andamento.
+        
+        O iterável de URLs é avançado em uma thread própria, pois geradores de
+        playlist podem bloquear em chamadas de rede.
+        
+        Args:
+            urls: URLs a baixar
+            download_type: Tipo de download
+        """
+        loop = asyncio.get_running_loop()
+        resolver = concurrent.futures.ThreadPoolExecutor(max_workers=settings.ASYNC_RESOLVE_WORKERS)
+        reader = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        transcoder = concurrent.futures.ThreadPoolExecutor(max_workers=get_transcode_workers())
+        fragment_slots = asyncio.Semaphore(settings.ASYNC_MAX_FRAGMENTS)
+        
+        connector = aiohttp.TCPConnector(limit=settings.ASYNC_MAX_FRAGMENTS)
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=settings.REQUEST_TIMEOUT, sock_read=settings.REQUEST_TIMEOUT)
+        
+        logger.info(
+            f"Motor asyncio: até {settings.ASYNC_MAX_CONCURRENT_ITEMS} itens e "
+            f"{settings.ASYNC_MAX_FRAGMENTS} faixas simultâneas"
+        )
+        
+        url_iter = iter(urls)
+        exhausted = False
+        pending = set()
+        
+        try:
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                while True:
+                    # ``drain_batch``: deixa os itens em andamento terminarem
+                    if self.downloader._drain_requested.is_set():
+                        exhausted = True
+                    
+                    while not exhausted and len(pending) < settings.ASYNC_MAX_CONCURRENT_ITEMS:
+                        url = await loop.run_in_executor(reader, next, url_iter, None)
+                        
+                        if url is None:
+                            exhausted = True
+                            break
+                        
+                        pending.add(asyncio.ensure_future(
+                            self._download_item(session, resolver, transcoder, fragment_slots, url, download_type)
+                        ))
+                    
+                    if not pending:
+                        break
+                    
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    
+                    for task in done:
+                        self.downloader._collect_result(task.result())
+        finally:
+            for task in pending:
+                task.cancel()
+            reader.shutdown(wait=False, cancel_futures=True)
+            resolver.shutdown(wait=True, cancel_futures=True)
+            transcoder.shutdown(wait=True, cancel_futures=True)
+    
+    async def _download_item(
+        self,
+        session: "aiohttp.ClientSession",
+        resolver: concurrent.futures.ThreadPoolExecutor,
+        transcoder: concurrent.futures.ThreadPoolExecutor,
+        fragment_slots: asyncio.Semaphore,
+        url: str,
+        download_type: DownloadType
+    ) -> DownloadResult:
+        """
+        Sonda, resolve o formato, transfere e, se preciso, converte um item.
+        
+        Args:
+            session: Sessão HTTP compartilhada
+            resolver: Pool de threads das chamadas ao yt-dlp
+            transcoder: Pool de threads da conversão de áudio
+            fragment_slots: Limite global de faixas em voo
+            url: URL do vídeo
+            download_type: Tipo de download
+        
+        Returns:
+            Resultado do download
+        """
+        loop = asyncio.get_running_loop()
+        
+        try:
+            item = await loop.run_in_executor(resolver, self.downloader._probe_item, url, download_type)
+        except Exception as e:
+            return DownloadResult(
+                url=url,
+                status=DownloadStatus.FAILED,
+                download_type=download_type,
+                error_message=str(e)
+            )
+        
+        if item.result.status != DownloadStatus.PENDING:
+            return item.result
+        
+        logger.info(f"Baixando: {item.result.title}")
+        profile = self.downloader._get_profile(download_type)
+        timings = item.result.stage_timings
+        
+        try:
+            with self.downloader.ydl_pool.checkout(profile) as ydl:
+                with time_stage(timings, "transfer"):
+                    info = await loop.run_in_executor(resolver, self._resolve_format, ydl, item)
+                
+                with self.downloader.metrics.track_in_flight(), self.downloader.download_meter.track():
+                    if self._is_range_fetchable(info):
+                        filename = ydl.prepare_filename(info)
+                        
+                        with time_stage(timings, "transfer"):
+                            await self._fetch_ranges(session, fragment_slots, info, filename, item.result)
+                        with time_stage(timings, "postprocess"):
+                            info = await loop.run_in_executor(resolver, ydl.post_process, filename, info)
+                        
+                        output_path = info.get("filepath") or filename
+                    else:
+                        with time_stage(timings, "transfer"):
+                            await loop.run_in_executor(
+                                resolver, self.downloader._run_counting_retries, item.result, ydl.process_info, info
+                            )
+                        output_path = info.get("filepath")
+            
+            # Checksum e gravação do diário (com fsync) ficam fora do event loop
+            await loop.run_in_executor(resolver, self.downloader._complete_transfer, item, output_path)
+        
+        except Exception as e:
+            await loop.run_in_executor(resolver, self.downloader._fail_transfer, item, e)
+        
+        if item.result.status == DownloadStatus.PENDING:
+            return await loop.run_in_executor(transcoder, self.downloader._transcode_item, item)
+        
+        return item.result
+    
+    @staticmethod
+    def _resolve_format(ydl, item: ProbedItem) -> dict:
+        """
+        Seleciona o formato a baixar sem transferir nada.
+        
+        Args:
+            ydl: Instância do ``YoutubeDL`` do perfil do download
+            item: Item sondado
+        
+        Returns:
+            Metadados com o formato escolhido mesclado (``url``, ``ext``...)
+        """
+        if item.info_dict is not None:
+            return ydl.process_ie_result(item.info_dict, download=False)
+        
+        # Metadados vieram do cache: é preciso extrair os formatos agora
+        return ydl.extract_info(item.result.url, download=False)
+    
+    @classmethod
+    def _is_range_fetchable(cls, info: dict) -> bool:
+        """
+        Verifica se o formato escolhido é um único arquivo HTTP.
+        
+        A busca por faixas chama apenas ``post_process`` do yt-dlp, sem as
+        correções que ``process_info`` agenda após o download. Formatos que
+        as exigiriam (contêiner DASH, como ``m4a_dash``, ou proporção de
+        pixels não uniforme) seguem pelo ``process_info``.
+        
+        Args:
+            info: Metadados resolvidos
+        
+        Returns:
+            True se o formato puder ser buscado por faixas
+        """
+        return (
+            bool(info.get("url"))
+            and not info.get("requested_formats")
+            and info.get("protocol") in cls.RANGE_PROTOCOLS
+            and not (info.get("container") or "").endswith("_dash")
+            and info.get("stretched_ratio") in (1, None)
+            and not info.get("is_live")
+        )
+    
+    async def _fetch_ranges(
+        self,
+        session: "aiohttp.ClientSession",
+        fragment_slots: asyncio.Semaphore,
+        info: dict,
+        filename: str,
+        result: DownloadResult
+    ) -> None:
+        """
+        Baixa o formato em faixas concorrentes e renomeia o ``.part`` ao final.
+        
+        O arquivo é dividido em faixas de ``ASYNC_CHUNK_SIZE`` bytes. A
+        primeira revela o tamanho total (``Content-Range``) e só uma resposta
+        206 libera as demais; se o servidor ignorar o cabeçalho ``Range``, o
+        corpo inteiro recebido é gravado em sequência.
+        
+        Um ``.part`` de uma execução anterior é retomado: as faixas concluídas
+        ficam registradas em ``<arquivo>.part.ranges``; sem esse registro
+        (arquivo gravado em sequência, como pelo yt-dlp), o tamanho do
+        ``.part`` indica os bytes já baixados. Cada requisição tem até
+        ``DOWNLOAD_RETRIES`` novas tentativas, somadas a ``result.retries``.
+        
+        Args:
+            session: Sessão HTTP compartilhada
+            fragment_slots: Limite global de faixas em voo
+            info: Metadados resolvidos
+            filename: Caminho final do arquivo
+            result: Resultado do item, para contabilizar as novas tentativas
+        """
+        url = info["url"]
+        headers = dict(info.get("http_headers") or {})
+        chunk_size = settings.ASYNC_CHUNK_SIZE
+        part_path = filename + ".part"
+        log_path = part_path + ".ranges"
+        progress_bus = self.downloader.progress_bus
+        
+        FileManager.create_directory_if_not_exists(os.path.dirname(filename) or ".")
+        
+        total, done = self._read_range_log(log_path) if os.path.exists(part_path) else (None, set())
+        offset = os.path.getsize(part_path) if total is None and os.path.exists(part_path) else 0
+        downloaded = offset + sum(
+            min(chunk_size, total - index * chunk_size) for index in done
+        ) if total else offset
+        
+        def on_data(size: int) -> None:
+            nonlocal downloaded
+            downloaded += size
+            progress_bus.publish("downloading", filename, downloaded, total)
+        
+        try:
+            with open(part_path, "r+b" if os.path.exists(part_path) else "wb") as f:
+                if total is None:
+                    # Primeira faixa: a partir dos bytes já gravados em sequência
+                    total = await self._with_retries(
+                        result, self._fetch_first, session, fragment_slots, url, headers, f, offset, on_data
+                    )
+                    done = set(range(offset // chunk_size + 1))
+                    
+                    if total is not None and total > len(done) * chunk_size:
+                        with open(log_path, "w", encoding="utf-8") as log:
+                            log.write(f"{total}\n" + "".join(f"{index}\n" for index in sorted(done)))
+                
+                if total is not None:
+                    missing = [
+                        index for index in range(-(-total // chunk_size)) if index not in done
+                    ]
+                    
+                    if missing:
+                        with open(log_path, "a", encoding="utf-8") as log:
+                            async def fetch_chunk(index: int) -> None:
+                                start = index * chunk_size
+                                await self._with_retries(
+                                    result, self._fetch_range, session, fragment_slots, url, headers, f,
+                                    start, min(start + chunk_size, total) - 1, on_data
+                                )
+                                f.flush()
+                                log.write(f"{index}\n")
+                                log.flush()
+                            
+                            await asyncio.gather(*(fetch_chunk(index) for index in missing))
+        except BaseException:
+            progress_bus.publish("error", filename)
+            raise
+        
+        os.replace(part_path, filename)
+        if os.path.exists(log_path):
+            os.remove(log_path)
+        progress_bus.publish("finished", filename, downloaded, total)
+    
+    async def _fetch_first(
+        self,
+        session: "aiohttp.ClientSession",
+        fragment_slots: asyncio.Semaphore,
+        url: str,
+        headers: dict,
+        f,
+        offset: int,
+        on_data: Callable[[int], None]
+    ) -> Optional[int]:
+        """
+        Busca a faixa que começa em ``offset`` e descobre o tamanho total.
+        
+        Args:
+            session: Sessão HTTP compartilhada
+            fragment_slots: Limite global de faixas em voo
+            url: URL do formato
+            headers: Cabeçalhos HTTP exigidos pelo formato
+            f: Arquivo ``.part`` aberto para escrita
+            offset: Bytes já gravados em sequência no ``.part``
+            on_data: Chamado com o tamanho de cada bloco gravado
+        
+        Returns:
+            Tamanho total, se o servidor respondeu com 206; None se o arquivo
+            já está completo (corpo inteiro recebido ou ``.part`` concluído)
+        """
+        chunk_size = settings.ASYNC_CHUNK_SIZE
+        end = (offset // chunk_size + 1) * chunk_size - 1
+        
+        async with fragment_slots:
+            async with session.get(url, headers={**headers, "Range": f"bytes={offset}-{end}"}) as response:
+                if response.status == 416 and offset and self._get_total_size(response) == offset:
+                    # ``.part`` de uma execução anterior já estava completo
+                    return None
+                
+                response.raise_for_status()
+                total = self._get_total_size(response)
+                
+                if total is None:
+                    # Servidor ignorou o ``Range``: o corpo inteiro vem a partir do byte 0
+                    f.seek(0)
+                    f.truncate()
+                    on_data(-offset)
+                    await self._write_checked(response, f, 0, response.content_length, on_data)
+                    return None
+                
+                await self._write_checked(response, f, offset, min(end, total - 1) - offset + 1, on_data)
+                return total
+    
+    async def _fetch_range(
+        self,
+        session: "aiohttp.ClientSession",
+        fragment_slots: asyncio.Semaphore,
+        url: str,
+        headers: dict,
+        f,
+        start: int,
+        end: int,
+        on_data: Callable[[int], None]
+    ) -> None:
+        """
+        Baixa uma faixa de bytes e a grava na sua posição do arquivo.
+        
+        Args:
+            session: Sessão HTTP compartilhada
+            fragment_slots: Limite global de faixas em voo
+            url: URL do formato
+            headers: Cabeçalhos HTTP exigidos pelo formato
+            f: Arquivo ``.part`` aberto para escrita
+            start: Primeiro byte da faixa
+            end: Último byte da faixa (inclusivo)
+            on_data: Chamado com o tamanho de cada bloco gravado
+        """
+        async with fragment_slots:
+            async with session.get(url, headers={**headers, "Range": f"bytes={start}-{end}"}) as response:
+                response.raise_for_status()
+                
+                if response.status != 206:
+                    raise IOError(f"Servidor não respeitou a faixa {start}-{end} (HTTP {response.status})")
+                
+                await self._write_checked(response, f, start, end - start + 1, on_data)
+    
+    async def _with_retries(self, result: DownloadResult, fetch: Callable, *args):
+        """
+        Executa uma requisição com até ``DOWNLOAD_RETRIES`` novas tentativas.
+        
+        Como no yt-dlp, as novas tentativas são imediatas e cobrem falhas de
+        rede, respostas incompletas e erros HTTP 5xx, 408 e 429.
+        
+        Args:
+            result: Resultado do item (``retries`` é incrementado)
+            fetch: Corrotina da requisição
+            *args: Argumentos da corrotina
+        
+        Returns:
+            Retorno da corrotina
+        """
+        attempt = 0
+        
+        while True:
+            try:
+                return await fetch(*args)
+            except (aiohttp.ClientError, asyncio.TimeoutError, IncompleteRangeError) as e:
+                if attempt >= settings.DOWNLOAD_RETRIES or not self._is_retryable(e):
+                    raise
+                
+                attempt += 1
+                result.retries += 1
+                logger.debug(
+                    f"Nova tentativa ({attempt}/{settings.DOWNLOAD_RETRIES}): {e}",
+                    item_id=result.url, stage="transfer"
+                )
+    
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """
+        Verifica se uma falha de requisição é transitória.
+        
+        Args:
+            error: Exceção da requisição
+        
+        Returns:
+            False para erros HTTP 4xx definitivos (ex.: 403, 404)
+        """
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status >= 500 or error.status in (408, 429)
+        return True
+    
+    @classmethod
+    async def _write_checked(
+        cls,
+        response: "aiohttp.ClientResponse",
+        f,
+        offset: int,
+        expected: Optional[int],
+        on_data: Callable[[int], None]
+    ) -> None:
+        """
+        Grava o corpo de uma resposta e confere se ele chegou inteiro.
+        
+        Em caso de falha, os bytes desta tentativa são descontados do
+        progresso, já que serão baixados de novo.
+        
+        Args:
+            response: Resposta HTTP
+            f: Arquivo aberto para escrita
+            offset: Posição inicial no arquivo
+            expected: Tamanho esperado do corpo, se conhecido
+            on_data: Chamado com o tamanho de cada bloco gravado
+        
+        Raises:
+            IncompleteRangeError: Se o corpo terminou antes do esperado
+        """
+        written = 0
+        
+        def count(size: int) -> None:
+            nonlocal written
+            written += size
+            on_data(size)
+        
+        try:
+            await cls._write_body(response, f, offset, count)
+            
+            if expected is not None and written != expected:
+                raise IncompleteRangeError(
+                    f"Resposta incompleta: {written} de {expected} bytes a partir de {offset}"
+                )
+        except BaseException:
+            on_data(-written)
+            raise
+    
+    @classmethod
+    async def _write_body(
+        cls,
+        response: "aiohttp.ClientResponse",
+        f,
+        offset: int,
+        on_data: Callable[[int], None]
+    ) -> None:
+        """
+        Grava o corpo de uma resposta a partir de uma posição do arquivo.
+        
+        As escritas acontecem apenas na thread do event loop, portanto o par
+        ``seek``/``write`` nunca é intercalado entre faixas.
+        
+        Args:
+            response: Resposta HTTP
+            f: Arquivo aberto para escrita
+            offset: Posição inicial no arquivo
+            on_data: Chamado com o tamanho de cada bloco gravado
+        """
+        async for data in response.content.iter_chunked(cls.READ_SIZE):
+            f.seek(offset)
+            f.write(data)
+            offset += len(data)
+            on_data(len(data))
+    
+    @staticmethod
+    def _get_total_size(response: "aiohttp.ClientResponse") -> Optional[int]:
+        """
+        Obtém o tamanho total do recurso a partir da primeira resposta.
+        
+        Args:
+            response: Resposta à primeira faixa (206, ou 416 com ``bytes */N``)
+        
+        Returns:
+            Tamanho em bytes, ou None se a resposta já contém o corpo inteiro
+        """
+        if response.status not in (206, 416):
+            return None
+        
+        content_range = response.headers.get("Content-Range", "")
+        total = content_range.rpartition("/")[2]
+        return int(total) if total.isdigit() else None
+    
+    @staticmethod
+    def _read_range_log(log_path: str) -> Tuple[Optional[int], Set[int]]:
+        """
+        Lê o registro de faixas concluídas de um ``.part`` interrompido.
+        
+        Args:
+            log_path: Caminho do ``.part.ranges``
+        
+        Returns:
+            Tamanho total e índices das faixas concluídas; (None, vazio) se
+            não houver registro válido
+        """
+        try:
+            with open(log_path, "r", encoding="utf-8") as log:
+                lines = [line.strip() for line in log if line.strip()]
+            return int(lines[0]), {int(line) for line in lines[1:]}
+        except (OSError, ValueError, IndexError):
+            return None, set()
@@ -0,0 +1,179 @@
+"""Conversão de áudio com o FFmpeg fora do yt-dlp."""
+
+import os
+import re
+import subprocess
+from enum import Enum
+from typing import List, Optional, Tuple
+
+from ..config.settings import settings
+from ..services.ffmpeg_manager import FFmpegManager
+
+
+class AudioProfile(Enum):
+    """Perfis de saída de áudio."""
+    MP3 = "mp3"
+    NATIVE = "native"  # mantém o codec original, apenas troca o contêiner
+    OPUS = "opus"
+    AAC = "aac"
+
+
+# Perfil -> (codec, encoder do FFmpeg, extensão de saída)
+PROFILE_CODECS = {
+    AudioProfile.MP3: ("mp3", "libmp3lame", "mp3"),
+    AudioProfile.OPUS: ("opus", "libopus", "opus"),
+    AudioProfile.AAC: ("aac", "aac", "m4a"),
+}
+
+# Codec de origem -> extensão usada no modo NATIVE
+NATIVE_EXTENSIONS = {
+    "aac": "m4a",
+    "alac": "m4a",
+    "opus": "opus",
+    "vorbis": "ogg",
+    "mp3": "mp3",
+    "flac": "flac",
+}
+
+# Perfil -> ``preferredcodec`` do FFmpegExtractAudio (conversão embutida)
+POSTPROCESSOR_CODECS = {
+    AudioProfile.MP3: "mp3",
+    AudioProfile.NATIVE: "best",
+    AudioProfile.OPUS: "opus",
+    AudioProfile.AAC: "aac",
+}
+
+
+def get_transcode_workers() -> int:
+    """
+    Obtém o número de conversões simultâneas.
+    
+    Returns:
+        ``TRANSCODE_WORKERS``, ou o número de núcleos se a configuração for 0
+    """
+    if settings.TRANSCODE_WORKERS > 0:
+        return settings.TRANSCODE_WORKERS
+    
+    return os.cpu_count() or 1
+
+
+class AudioTranscoder:
+    """
+    Converte áudios já baixados para o perfil configurado.
+    
+    Executar a conversão fora da chamada do yt-dlp permite liberar a vaga de
+    download assim que os bytes chegam; a codificação ocorre em um pool
+    próprio, dimensionado pelo número de núcleos. Quando o codec de origem
+    já é o do perfil (ou no perfil NATIVE), o fluxo é apenas copiado para o
+    novo contêiner (``-c:a copy``), sem decodificar.
+    """
+    
+    CODEC_PATTERN = re.compile(r"Stream #\S+.*?: Audio: (\w+)")
+    
+    def __init__(self, ffmpeg_manager: FFmpegManager, profile: Optional[AudioProfile] = None):
+        self.ffmpeg_manager = ffmpeg_manager
+        self.profile = profile
+    
+    def get_profile(self) -> AudioProfile:
+        """
+        Obtém o perfil de saída em uso.
+        
+        Returns:
+            Perfil informado no construtor ou ``settings.AUDIO_PROFILE``
+        """
+        return self.profile or AudioProfile(settings.AUDIO_PROFILE)
+    
+    def transcode(self, source_path: str) -> str:
+        """
+        Converte (ou remultiplexa) um arquivo de áudio e remove o original.
+        
+        Args:
+            source_path: Arquivo bruto baixado
+        
+        Returns:
+            Caminho do arquivo final
+        
+        Raises:
+            RuntimeError: Se o FFmpeg não estiver disponível ou a conversão falhar
+        """
+        ffmpeg_path = self.ffmpeg_manager.get_ffmpeg_path()
+        if not ffmpeg_path:
+            raise RuntimeError("FFmpeg não disponível para converter o áudio")
+        
+        source_codec = self.probe_codec(ffmpeg_path, source_path)
+        extension, codec_args = self._get_codec_args(source_codec)
+        
+        base_path, source_extension = os.path.splitext(source_path)
+        
+        # Mesmo codec e mesmo contêiner: não há nada a fazer
+        if codec_args == ["-c:a", "copy"] and source_extension == f".{extension}":
+            return source_path
+        
+        output_path = f"{base_path}.{extension}"
+        temp_path = f"{base_path}.temp.{extension}"
+        
+        command = [
+            ffmpeg_path, "-hide_banner", "-nostdin", "-loglevel", "error", "-y",
+            "-i", source_path, "-vn", *codec_args, temp_path
+        ]
+        
+        process = subprocess.run(command, capture_output=True, text=True, errors="replace")
+        
+        if process.returncode != 0:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            details = process.stderr.strip().splitlines()[-1:] or [f"código {process.returncode}"]
+            raise RuntimeError(f"Falha na conversão do áudio: {details[0]}")
+        
+        os.replace(temp_path, output_path)
+        if os.path.abspath(source_path) != os.path.abspath(output_path):
+            os.remove(source_path)
+        
+        return output_path
+    
+    def _get_codec_args(self, source_codec: Optional[str]) -> Tuple[str, List[str]]:
+        """
+        Escolhe a extensão de saída e os argumentos de codec do FFmpeg.
+        
+        Args:
+            source_codec: Codec do áudio de origem, se identificado
+        
+        Returns:
+            Tupla (extensão, argumentos do FFmpeg)
+        """
+        profile = self.get_profile()
+        
+        if profile == AudioProfile.NATIVE:
+            return NATIVE_EXTENSIONS.get(source_codec, "mka"), ["-c:a", "copy"]
+        
+        codec, encoder, extension = PROFILE_CODECS[profile]
+        
+        if source_codec == codec:
+            return extension, ["-c:a", "copy"]
+        
+        if not self.ffmpeg_manager.has_encoder(encoder):
+            raise RuntimeError(f"O FFmpeg encontrado não oferece o encoder {encoder}")
+        
+        return extension, ["-c:a", encoder, "-b:a", f"{settings.DEFAULT_AUDIO_QUALITY}k"]
+    
+    @classmethod
+    def probe_codec(cls, ffmpeg_path: str, source_path: str) -> Optional[str]:
+        """
+        Identifica o codec do primeiro fluxo de áudio de um arquivo.
+        
+        Usa a saída do próprio ``ffmpeg -i``, já que apenas o executável do
+        FFmpeg (sem o ffprobe) é instalado pela aplicação.
+        
+        Args:
+            ffmpeg_path: Caminho do FFmpeg
+            source_path: Arquivo de áudio
+        
+        Returns:
+            Nome do codec (ex.: "aac", "opus") ou None se não identificado
+        """
+        process = subprocess.run(
+            [ffmpeg_path, "-hide_banner", "-nostdin", "-i", source_path],
+            capture_output=True, text=True, errors="replace"
+        )
+        match = cls.CODEC_PATTERN.search(process.stderr)
+        return match.group(1) if match else None
@@ -0,0 +1,134 @@
+"""Controle adaptativo do número de downloads simultâneos."""
+
+import time
+from typing import List, Optional, Tuple
+
+from ..config.settings import settings
+from ..models.download_result import DownloadResult
+
+
+class AdaptiveConcurrencyController:
+    """
+    Ajusta o limite de downloads simultâneos no estilo AIMD.
+    
+    A cada intervalo, o controlador compara a vazão agregada da janela com a
+    anterior: sem erros, o limite cresce de um em um (aumento aditivo)
+    enquanto a vazão acompanhar; respostas HTTP 429 ou taxa de erro acima do
+    limiar reduzem o limite pela metade (redução multiplicativa). O limite
+    permanece sempre entre ``floor`` e ``ceiling``.
+    """
+    
+    THROTTLE_MARKERS = ("429", "Too Many Requests")
+    
+    def __init__(
+        self,
+        initial: Optional[int] = None,
+        floor: Optional[int] = None,
+        ceiling: Optional[int] = None,
+        adaptive: Optional[bool] = None
+    ):
+        initial = initial or settings.MAX_PARALLEL_DOWNLOADS
+        adaptive = settings.ADAPTIVE_CONCURRENCY if adaptive is None else adaptive
+        
+        if adaptive:
+            self.floor = max(1, floor or settings.CONCURRENCY_FLOOR)
+            self.ceiling = max(self.floor, ceiling or settings.CONCURRENCY_CEILING)
+        else:
+            self.floor = self.ceiling = max(1, initial)
+        
+        self.limit = min(max(initial, self.floor), self.ceiling)
+        
+        self._start = time.monotonic()
+        self._window_start = self._start
+        self._window_bytes = 0
+        self._window_completed = 0
+        self._window_errors = 0
+        self._window_throttled = 0
+        self._last_throughput = 0.0
+        self._curve: List[Tuple[float, int, float]] = [(0.0, self.limit, 0.0)]
+    
+    @classmethod
+    def is_throttled(cls, result: DownloadResult) -> bool:
+        """
+        Verifica se a falha de um download indica limitação do servidor.
+        
+        Args:
+            result: Resultado do download
+        
+        Returns:
+            True se a mensagem de erro indicar HTTP 429
+        """
+        message = result.error_message or ""
+        return any(marker in message for marker in cls.THROTTLE_MARKERS)
+    
+    def record(self, result: DownloadResult) -> None:
+        """
+        Registra um item concluído e reajusta o limite se o intervalo venceu.
+        
+        Args:
+            result: Resultado do download
+        """
+        self._window_completed += 1
+        self._window_bytes += result.bytes_downloaded
+        
+        if result.is_failed:
+            self._window_errors += 1
+            if self.is_throttled(result):
+                self._window_throttled += 1
+        
+        now = time.monotonic()
+        if now - self._window_start >= settings.CONCURRENCY_ADJUST_INTERVAL:
+            self._adjust(now)
+    
+    def _adjust(self, now: float) -> None:
+        """
+        Aplica a regra AIMD com as medições da janela atual.
+        
+        Args:
+            now: Instante atual (``time.monotonic``)
+        """
+        throughput = self._window_bytes / max(now - self._window_start, 1e-9)
+        error_rate = self._window_errors / max(self._window_completed, 1)
+        
+        if self._window_throttled or error_rate > settings.CONCURRENCY_ERROR_THRESHOLD:
+            self.limit = max(self.floor, int(self.limit * settings.CONCURRENCY_DECREASE_FACTOR))
+        elif throughput >= self._last_throughput * (1 - settings.CONCURRENCY_THROUGHPUT_TOLERANCE):
+            self.limit = min(self.ceiling, self.limit + 1)
+        else:
+            # Mais downloads não trouxeram mais vazão: recua um passo
+            self.limit = max(self.floor, self.limit - 1)
+        
+        self._last_throughput = throughput
+        self._curve.append((now - self._start, self.limit, throughput))
+        
+        self._window_start = now
+        self._window_bytes = 0
+        self._window_completed = 0
+        self._window_errors = 0
+        self._window_throttled = 0
+    
+    def get_curve(self) -> List[Tuple[float, int, float]]:
+        """
+        Retorna a evolução do limite ao longo do lote.
+        
+        Returns:
+            Lista de (segundos_desde_o_início, limite, vazão_em_bytes_por_segundo)
+        """
+        return list(self._curve)
+    
+    def format_curve(self) -> str:
+        """
+        Formata a curva de concorrência em uma linha legível.
+        
+        Returns:
+            Texto no formato "0s:5 → 5s:6 (3.2 MB/s) → ..."
+        """
+        points = []
+        
+        for elapsed, limit, throughput in self._curve:
+            point = f"{elapsed:.0f}s:{limit}"
+            if throughput:
+                point += f" ({throughput / 1_000_000:.1f} MB/s)"
+            points.append(point)
+        
+        return " → ".join(points)
@@ -0,0 +1,197 @@
+"""Diário de downloads para retomada de lotes interrompidos."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from ..config.settings import paths, settings
+from ..models.download_result import DownloadResult, DownloadType
+from ..utils.file_utils import FileManager
+from ..utils.logger import logger
+
+
+class DownloadJournal:
+    """
+    Registro durável (JSON Lines) do desfecho de cada download.
+    
+    Cada resultado é acrescentado como uma linha completa em uma única
+    escrita, seguida de ``fsync``, de modo que uma interrupção nunca deixa
+    registros parciais válidos. Ao carregar, o registro mais recente de cada
+    item prevalece e linhas truncadas são ignoradas; se houver linhas assim,
+    o arquivo é reescrito só com os registros vigentes, para que não cresça
+    a cada execução. Processos que gravam no mesmo diário ao mesmo tempo
+    (``ShardedBatchRunner``) usam ``compact=False``: só o processo pai, antes
+    de iniciá-los, reescreve o arquivo.
+    """
+    
+    CHUNK_SIZE = 1024 * 1024
+    
+    def __init__(self, journal_path: Optional[str] = None, compact: bool = True):
+        self.journal_path = journal_path or os.path.join(paths.DOWNLOAD_DIR, paths.JOURNAL_FILENAME)
+        self.compact = compact
+        self._records: Optional[Dict[str, dict]] = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(item_id: str, download_type: DownloadType) -> str:
+        """
+        Monta a chave de um item no diário.
+        
+        Args:
+            item_id: ID do vídeo (ou a URL, se não houver ID)
+            download_type: Tipo de download
+        
+        Returns:
+            Chave única por item e tipo de download
+        """
+        return f"{download_type.value}:{item_id}"
+    
+    def _load(self) -> Dict[str, dict]:
+        """
+        Carrega o diário do disco na primeira utilização.
+        
+        Returns:
+            Dicionário chave -> registro mais recente
+        """
+        if self._records is not None:
+            return self._records
+        
+        records = {}
+        lines = 0
+        
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        record = json.loads(line)
+                        records[record["key"]] = record
+                    except (ValueError, KeyError):
+                        continue
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Não foi possível ler o diário de downloads: {e}")
+        
+        if self.compact and lines > len(records):
+            self._rewrite(records)
+            logger.info(
+                f"Diário de downloads compactado: {len(records)} registros "
+                f"({lines - len(records)} linhas antigas descartadas)"
+            )
+        
+        self._records = records
+        return records
+    
+    def _rewrite(self, records: Dict[str, dict]) -> None:
+        """
+        Substitui o arquivo pelos registros vigentes, de forma atômica.
+        
+        Args:
+            records: Dicionário chave -> registro mais recente
+        """
+        temp_path = f"{self.journal_path}.tmp"
+        
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for record in records.values():
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            
+            os.replace(temp_path, self.journal_path)
+        except OSError as e:
+            logger.warning(f"Não foi possível compactar o diário de downloads: {e}")
+    
+    def load(self) -> None:
+        """Carrega o diário agora (compactando-o), em vez de no primeiro uso."""
+        with self._lock:
+            self._load()
+    
+    def get_completed(self, key: str) -> Optional[dict]:
+        """
+        Obtém o registro de um item já concluído cujo arquivo ainda existe.
+        
+        Args:
+            key: Chave do item (ver ``make_key``)
+        
+        Returns:
+            Registro do item ou None se não estiver concluído
+        """
+        with self._lock:
+            record = self._load().get(key)
+        
+        if record is None or record.get("status") != "success":
+            return None
+        
+        output_path = record.get("output_path")
+        if not output_path or not os.path.exists(output_path):
+            return None
+        
+        return record
+    
+    def record(self, key: str, result: DownloadResult) -> None:
+        """
+        Registra o desfecho de um download de forma atômica.
+        
+        Args:
+            key: Chave do item (ver ``make_key``)
+            result: Resultado do download
+        """
+        entry = {
+            "key": key,
+            "url": result.url,
+            "status": result.status.value,
+            "title": result.title,
+            "output_path": result.output_path,
+            "bytes": result.bytes_downloaded,
+            "checksum": result.checksum,
+            "error": result.error_message,
+            "timestamp": time.time()
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        
+        try:
+            with self._lock:
+                records = self._load()
+                FileManager.create_directory_if_not_exists(os.path.dirname(self.journal_path) or ".")
+                
+                fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, line.encode("utf-8"))
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                
+                records[key] = entry
+        
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar no diário de downloads: {e}")
+    
+    @classmethod
+    def compute_checksum(cls, file_path: str) -> Optional[str]:
+        """
+        Calcula o SHA-256 de um arquivo, se habilitado nas configurações.
+        
+        Args:
+            file_path: Caminho do arquivo
+        
+        Returns:
+            Hash hexadecimal ou None se desabilitado ou se a leitura falhar
+        """
+        if not settings.JOURNAL_CHECKSUM:
+            return None
+        
+        digest = hashlib.sha256()
+        
+        try:
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(cls.CHUNK_SIZE), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        
+        return digest.hexdigest()
@@ -1,11 +1,18 @@
 """Gerenciador do FFmpeg."""
 
+import concurrent.futures
+import hashlib
+import json
 import os
+import re
 import requests
+import shutil
+import subprocess
+import threading
 import zipfile
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
-from ..config.settings import paths, urls, settings
+from ..config.settings import URLs, paths, urls, settings
 from ..utils.logger import logger
 from ..utils.file_utils import FileManager
 
@@ -13,11 +20,30 @@ from ..utils.file_utils import FileManager
 class FFmpegManager:
     """Gerenciador responsável pelo setup do FFmpeg."""
     
+    CHUNK_SIZE = 1024 * 1024
+    
+    ENCODER_PATTERN = re.compile(r"^\s*[VAS][F.][S.][X.][B.][D.]\s+(\S+)", re.MULTILINE)
+    HARDWARE_ENCODER_SUFFIXES = (
+        "_nvenc", "_qsv", "_vaapi", "_amf", "_videotoolbox", "_v4l2m2m",
+        "_mf", "_omx", "_mediacodec", "_vulkan", "_d3d12va"
+    )
+    
     def __init__(self):
         self.ffmpeg_dir = paths.FFMPEG_DIR
         self.ffmpeg_path = paths.FFMPEG_PATH
         self.download_url = urls.FFMPEG_DOWNLOAD_URL
+        self.checksum_url = urls.FFMPEG_CHECKSUM_URL
         self.file_manager = FileManager()
+        self._progress_lock = threading.Lock()
+        self._progress_total = 0
+        self._progress_done = 0
+        self._progress_logged = 0
+        self._lock = threading.Lock()
+        self._resolved = False
+        self._resolved_path: Optional[str] = None
+        self._resolved_mtime: Optional[float] = None
+        self.generation = 0
+        self._capabilities: Optional[Dict[str, object]] = None
     
     def is_ffmpeg_available(self) -> bool:
         """
@@ -26,7 +52,34 @@ class FFmpegManager:
         Returns:
             True se o FFmpeg estiver disponível, False caso contrário
         """
-        return self.file_manager.file_exists(self.ffmpeg_path)
+        return self.get_ffmpeg_path() is not None
+    
+    def _find_ffmpeg(self) -> Optional[str]:
+        """
+        Procura o executável do FFmpeg.
+        
+        Ordem: local configurado (``FFMPEG_LOCATION``, arquivo ou diretório),
+        cópia instalada pela aplicação e, por fim, o ``PATH`` do sistema.
+        
+        Returns:
+            Caminho do executável ou None se não encontrado
+        """
+        candidates = []
+        
+        location = paths.FFMPEG_LOCATION
+        if location:
+            if os.path.isdir(location):
+                location = os.path.join(location, paths.FFMPEG_EXECUTABLE)
+            candidates.append(location)
+        
+        candidates.append(self.ffmpeg_path)
+        candidates.append(shutil.which("ffmpeg"))
+        
+        for candidate in candidates:
+            if candidate and os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                return candidate
+        
+        return None
     
     def setup_ffmpeg(self) -> bool:
         """
@@ -36,9 +89,19 @@ class FFmpegManager:
             True se o setup foi bem-sucedido, False caso contrário
         """
         if self.is_ffmpeg_available():
-            logger.success("FFmpeg já existe, pulando download.")
+            logger.success(f"FFmpeg encontrado em {self.get_ffmpeg_path()}, pulando download.")
             return True
         
+        # O pacote padrão é um build para Windows; nos demais sistemas o
+        # FFmpeg deve vir do gerenciador de pacotes ou de uma URL configurada
+        if os.name != "nt" and self.download_url == URLs.FFMPEG_DOWNLOAD_URL:
+            logger.error(
+                "FFmpeg não encontrado. Instale-o pelo gerenciador de pacotes "
+                "(ex.: 'apt install ffmpeg' ou 'brew install ffmpeg') ou informe "
+                "o executável na variável de ambiente FFMPEG_LOCATION."
+            )
+            return False
+        
         logger.info("Configurando FFmpeg...")
         
         try:
@@ -47,6 +110,8 @@ class FFmpegManager:
             self._extract_ffmpeg(zip_path)
             self._cleanup_zip_file(zip_path)
             
+            self.refresh()
+            
             logger.success("FFmpeg configurado com sucesso!")
             return True
             
@@ -61,29 +126,211 @@ class FFmpegManager:
     
     def _download_ffmpeg(self) -> str:
         """
-        Baixa o arquivo ZIP do FFmpeg.
+        Baixa o arquivo ZIP do FFmpeg direto para o disco.
+        
+        O download é retomável: os bytes chegam em arquivos ``.part`` e uma
+        execução interrompida continua de onde parou com ``Range``. Se o
+        servidor aceitar faixas, o arquivo é dividido em
+        ``FFMPEG_DOWNLOAD_PARTS`` requisições paralelas. O SHA-256 é
+        conferido antes de o ZIP ser entregue para extração.
         
         Returns:
             Caminho para o arquivo ZIP baixado
             
         Raises:
-            Exception: Se o download falhar
+            Exception: Se o download falhar ou o checksum não conferir
         """
         zip_path = os.path.join(self.ffmpeg_dir, "ffmpeg.zip")
         
         logger.info("Baixando a última versão do FFmpeg...")
         
-        response = requests.get(
-            self.download_url, 
-            timeout=settings.REQUEST_TIMEOUT
-        )
-        response.raise_for_status()
+        total_size, accepts_ranges = self._get_remote_size()
+        self._progress_total = total_size
+        self._progress_done = 0
+        self._progress_logged = 0
+        
+        parts = settings.FFMPEG_DOWNLOAD_PARTS if accepts_ranges and total_size else 1
         
-        with open(zip_path, "wb") as file:
-            file.write(response.content)
+        if parts > 1 and total_size >= parts * self.CHUNK_SIZE:
+            self._download_in_parts(zip_path, total_size, parts)
+        else:
+            part_path = zip_path + ".part"
+            # Com o tamanho conhecido, um ``.part`` já completo não gera requisição
+            end = total_size - 1 if accepts_ranges and total_size else None
+            self._fetch_range(part_path, 0, end, resumable=accepts_ranges)
+            os.replace(part_path, zip_path)
         
+        self._verify_checksum(zip_path)
         return zip_path
     
+    def _get_remote_size(self) -> Tuple[int, bool]:
+        """
+        Consulta o tamanho do ZIP e se o servidor aceita faixas.
+        
+        Returns:
+            Tupla (tamanho em bytes ou 0 se desconhecido, aceita_range)
+        """
+        try:
+            response = requests.head(
+                self.download_url,
+                allow_redirects=True,
+                timeout=settings.REQUEST_TIMEOUT
+            )
+            response.raise_for_status()
+        except requests.RequestException:
+            return 0, False
+        
+        total_size = int(response.headers.get("Content-Length") or 0)
+        accepts_ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+        return total_size, accepts_ranges
+    
+    def _download_in_parts(self, zip_path: str, total_size: int, parts: int) -> None:
+        """
+        Baixa o ZIP em faixas paralelas e junta as partes.
+        
+        Cada faixa tem seu próprio arquivo, nomeado pelos bytes que cobre,
+        para que uma retomada continue cada faixa separadamente.
+        
+        Args:
+            zip_path: Caminho final do ZIP
+            total_size: Tamanho total em bytes
+            parts: Número de faixas
+        """
+        part_size = -(-total_size // parts)
+        ranges = [
+            (start, min(start + part_size, total_size) - 1)
+            for start in range(0, total_size, part_size)
+        ]
+        part_paths = [f"{zip_path}.{start}-{end}.part" for start, end in ranges]
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(self._fetch_range, part_path, start, end)
+                for part_path, (start, end) in zip(part_paths, ranges)
+            ]
+            for future in futures:
+                future.result()
+        
+        part_path = zip_path + ".part"
+        with open(part_path, "wb") as output:
+            for segment_path in part_paths:
+                with open(segment_path, "rb") as segment:
+                    shutil.copyfileobj(segment, output, self.CHUNK_SIZE)
+        
+        os.replace(part_path, zip_path)
+        for segment_path in part_paths:
+            os.remove(segment_path)
+    
+    def _fetch_range(
+        self,
+        part_path: str,
+        start: int,
+        end: Optional[int],
+        resumable: bool = True
+    ) -> None:
+        """
+        Baixa uma faixa do ZIP em blocos, retomando um ``.part`` existente.
+        
+        Args:
+            part_path: Arquivo parcial da faixa
+            start: Primeiro byte da faixa
+            end: Último byte da faixa (inclusivo) ou None até o fim
+            resumable: Se o servidor aceita ``Range`` para retomar
+            
+        Raises:
+            Exception: Se a requisição falhar ou o servidor ignorar a faixa
+        """
+        offset = os.path.getsize(part_path) if resumable and os.path.exists(part_path) else 0
+        
+        if end is not None and start + offset > end:
+            self._report_progress(offset)
+            return  # faixa já completa
+        
+        headers = {}
+        if start + offset > 0 or end is not None:
+            headers["Range"] = f"bytes={start + offset}-{'' if end is None else end}"
+        
+        with requests.get(
+            self.download_url,
+            headers=headers,
+            stream=True,
+            timeout=settings.REQUEST_TIMEOUT
+        ) as response:
+            if response.status_code == 416 and offset:
+                # Nada além do ``.part``: ou ele já está completo, ou não
+                # corresponde mais ao arquivo remoto e é baixado de novo
+                remote_size = response.headers.get("Content-Range", "").rpartition("/")[2]
+                if remote_size.isdigit() and int(remote_size) == start + offset:
+                    self._report_progress(offset)
+                    return
+                
+                os.remove(part_path)
+                return self._fetch_range(part_path, start, end, resumable)
+            
+            response.raise_for_status()
+            
+            if headers and response.status_code != 206:
+                if start or end is not None:
+                    raise Exception("Servidor não respeitou a faixa solicitada do FFmpeg")
+                offset = 0  # servidor ignorou a retomada: recomeça do zero
+            
+            self._report_progress(offset)
+            
+            with open(part_path, "ab" if offset else "wb") as file:
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    file.write(chunk)
+                    self._report_progress(len(chunk))
+    
+    def _report_progress(self, size: int) -> None:
+        """
+        Contabiliza bytes baixados e registra o progresso a cada 10%.
+        
+        Args:
+            size: Bytes recebidos desde a última chamada
+        """
+        with self._progress_lock:
+            self._progress_done += size
+            
+            if not self._progress_total:
+                return
+            
+            percent = self._progress_done * 100 // self._progress_total
+            if percent >= self._progress_logged + 10:
+                self._progress_logged = percent - percent % 10
+                logger.info(f"FFmpeg: {self._progress_logged}% baixado")
+    
+    def _verify_checksum(self, zip_path: str) -> None:
+        """
+        Confere o SHA-256 do ZIP com o publicado pelo servidor.
+        
+        Args:
+            zip_path: Caminho do ZIP baixado
+            
+        Raises:
+            Exception: Se o checksum não conferir (o ZIP é removido)
+        """
+        if not settings.FFMPEG_VERIFY_CHECKSUM:
+            return
+        
+        try:
+            response = requests.get(self.checksum_url, timeout=settings.REQUEST_TIMEOUT)
+            response.raise_for_status()
+            expected = response.text.split()[0].lower()
+        except (requests.RequestException, IndexError):
+            logger.warning("Checksum do FFmpeg indisponível; seguindo sem verificação.")
+            return
+        
+        digest = hashlib.sha256()
+        with open(zip_path, "rb") as file:
+            for chunk in iter(lambda: file.read(self.CHUNK_SIZE), b""):
+                digest.update(chunk)
+        
+        if digest.hexdigest() != expected:
+            os.remove(zip_path)
+            raise Exception("Checksum do FFmpeg não confere; o arquivo baixado foi descartado")
+        
+        logger.info("Checksum do FFmpeg verificado.")
+    
     def _extract_ffmpeg(self, zip_path: str) -> None:
         """
         Extrai o executável do FFmpeg do arquivo ZIP.
@@ -98,13 +345,17 @@ class FFmpegManager:
         
         with zipfile.ZipFile(zip_path, "r") as zip_ref:
             for file in zip_ref.namelist():
-                if "bin/ffmpeg.exe" in file:
+                if file.endswith(("bin/ffmpeg.exe", "bin/ffmpeg")):
                     zip_ref.extract(file, self.ffmpeg_dir)
                     extracted_path = os.path.join(self.ffmpeg_dir, file)
-                    os.rename(extracted_path, self.ffmpeg_path)
+                    os.replace(extracted_path, self.ffmpeg_path)
                     break
             else:
                 raise Exception("FFmpeg executável não encontrado no arquivo ZIP")
+        
+        # O ZIP não preserva a permissão de execução
+        if os.name != "nt":
+            os.chmod(self.ffmpeg_path, 0o755)
     
     def _cleanup_zip_file(self, zip_path: str) -> None:
         """
@@ -122,7 +373,185 @@ class FFmpegManager:
         """
         Retorna o caminho do FFmpeg se estiver disponível.
         
+        A busca ocorre uma única vez; o resultado é reaproveitado até uma
+        nova instalação pelo ``setup_ffmpeg``.
+        
         Returns:
             Caminho do FFmpeg ou None se não estiver disponível
         """
-        return self.ffmpeg_path if self.is_ffmpeg_available() else None
+        with self._lock:
+            if not self._resolved:
+                self._resolved_path = self._find_ffmpeg()
+                self._resolved_mtime = self._get_mtime(self._resolved_path)
+                self._resolved = True
+            
+            return self._resolved_path
+    
+    def refresh(self) -> int:
+        """
+        Refaz a busca do FFmpeg e detecta se o executável mudou.
+        
+        Quando o caminho ou a data de modificação mudam, ``generation`` é
+        incrementado para que quem guardou opções derivadas do FFmpeg
+        (perfis do yt-dlp, capacidades) saiba que deve recalculá-las.
+        
+        Returns:
+            Geração atual do FFmpeg
+        """
+        with self._lock:
+            previous = (self._resolved_path, self._resolved_mtime)
+            self._resolved = False
+        
+        path = self.get_ffmpeg_path()
+        
+        with self._lock:
+            if (path, self._resolved_mtime) != previous:
+                self.generation += 1
+                self._capabilities = None
+            
+            return self.generation
+    
+    @staticmethod
+    def _get_mtime(path: Optional[str]) -> Optional[float]:
+        """
+        Obtém a data de modificação de um executável.
+        
+        Args:
+            path: Caminho do executável
+        
+        Returns:
+            Data de modificação ou None se o arquivo não existir
+        """
+        try:
+            return os.path.getmtime(path) if path else None
+        except OSError:
+            return None
+    
+    def get_capabilities(self) -> Dict[str, object]:
+        """
+        Obtém a versão e os encoders do FFmpeg encontrado.
+        
+        O resultado de ``-version``/``-encoders`` é guardado em disco
+        (``FFMPEG_CAPABILITIES_PATH``), indexado pelo caminho do executável e
+        sua data de modificação, e só é refeito quando o binário muda.
+        
+        Returns:
+            Dicionário com "version", "encoders" e "software_encoders", ou
+            vazio se o FFmpeg não estiver disponível
+        """
+        ffmpeg_path = self.get_ffmpeg_path()
+        if not ffmpeg_path:
+            return {}
+        
+        with self._lock:
+            if self._capabilities is not None:
+                return self._capabilities
+            
+            key = os.path.abspath(ffmpeg_path)
+            mtime = os.path.getmtime(ffmpeg_path)
+            cache = self._load_capability_cache()
+            entry = cache.get(key)
+            
+            if not entry or entry.get("mtime") != mtime:
+                entry = self._probe_capabilities(ffmpeg_path)
+                entry["mtime"] = mtime
+                cache[key] = entry
+                self._save_capability_cache(cache)
+            
+            self._capabilities = entry
+            return entry
+    
+    def has_encoder(self, encoder: str) -> bool:
+        """
+        Verifica se o FFmpeg oferece um encoder.
+        
+        Args:
+            encoder: Nome do encoder (ex.: "libmp3lame")
+        
+        Returns:
+            True se disponível, ou se as capacidades não puderem ser lidas
+        """
+        encoders = self.get_capabilities().get("encoders")
+        return encoder in encoders if encoders else True
+    
+    def _probe_capabilities(self, ffmpeg_path: str) -> Dict[str, object]:
+        """
+        Executa o FFmpeg para listar versão e encoders.
+        
+        Args:
+            ffmpeg_path: Caminho do executável
+        
+        Returns:
+            Dicionário com "version", "encoders" e "software_encoders"
+        """
+        version_output = self._run_ffmpeg(ffmpeg_path, "-version")
+        first_line = version_output.splitlines()[0] if version_output else ""
+        version = first_line.split()[2] if first_line.startswith("ffmpeg version") else ""
+        
+        encoders: List[str] = self.ENCODER_PATTERN.findall(self._run_ffmpeg(ffmpeg_path, "-encoders"))
+        encoders = [name for name in encoders if name != "="]
+        
+        return {
+            "version": version,
+            "encoders": encoders,
+            "software_encoders": [
+                name for name in encoders if not name.endswith(self.HARDWARE_ENCODER_SUFFIXES)
+            ]
+        }
+    
+    @staticmethod
+    def _run_ffmpeg(ffmpeg_path: str, option: str) -> str:
+        """
+        Executa o FFmpeg com uma opção informativa.
+        
+        Args:
+            ffmpeg_path: Caminho do executável
+            option: Opção como "-version" ou "-encoders"
+        
+        Returns:
+            Saída padrão, ou texto vazio se a execução falhar
+        """
+        try:
+            process = subprocess.run(
+                [ffmpeg_path, "-hide_banner", option],
+                capture_output=True, text=True, errors="replace",
+                timeout=settings.REQUEST_TIMEOUT
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"Não foi possível consultar o FFmpeg: {e}")
+            return ""
+        
+        return process.stdout
+    
+    @staticmethod
+    def _load_capability_cache() -> Dict[str, dict]:
+        """
+        Lê o cache de capacidades do disco.
+        
+        Returns:
+            Dicionário caminho do executável -> capacidades
+        """
+        try:
+            with open(paths.FFMPEG_CAPABILITIES_PATH, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    @staticmethod
+    def _save_capability_cache(cache: Dict[str, dict]) -> None:
+        """
+        Grava o cache de capacidades no disco.
+        
+        Args:
+            cache: Dicionário caminho do executável -> capacidades
+        """
+        try:
+            FileManager.create_directory_if_not_exists(
+                os.path.dirname(paths.FFMPEG_CAPABILITIES_PATH) or "."
+            )
+            temp_path = paths.FFMPEG_CAPABILITIES_PATH + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(temp_path, paths.FFMPEG_CAPABILITIES_PATH)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar as capacidades do FFmpeg: {e}")
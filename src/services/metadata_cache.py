@@ -0,0 +1,232 @@
+"""Cache persistente de metadados extraídos pelo yt-dlp."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from ..config.settings import paths, settings
+from ..utils.file_utils import FileManager
+from ..utils.logger import logger
+
+
+class MetadataCache:
+    """
+    Cache em SQLite de metadados de vídeos e playlists, indexado por ID.
+    
+    As entradas expiram após ``ttl`` segundos e, quando o cache excede
+    ``max_entries``, as menos acessadas recentemente são removidas (LRU).
+    Os horários de acesso dos acertos ficam em memória e são gravados em
+    lotes, para que uma leitura não custe uma escrita no disco.
+    """
+    
+    EVICTION_FRACTION = 0.1
+    ACCESS_FLUSH_SIZE = 256  # acessos acumulados antes de gravá-los
+    
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.db_path = db_path or os.path.join(paths.DOWNLOAD_DIR, paths.METADATA_CACHE_FILENAME)
+        self.ttl = settings.METADATA_CACHE_TTL if ttl is None else ttl
+        self.max_entries = settings.METADATA_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.enabled = settings.METADATA_CACHE_ENABLED if enabled is None else enabled
+        
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        
+        self._connection: Optional[sqlite3.Connection] = None
+        self._size = 0
+        self._pending_access: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Abre a conexão com o banco na primeira utilização.
+        
+        Returns:
+            Conexão SQLite compartilhada entre as threads
+        """
+        if self._connection is None:
+            FileManager.create_directory_if_not_exists(os.path.dirname(self.db_path) or ".")
+            
+            connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Com WAL, NORMAL não sincroniza o disco a cada commit e continua
+            # sem risco de corromper o banco (só os últimos commits podem se perder)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                "key TEXT PRIMARY KEY, payload TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_metadata_accessed ON metadata (accessed_at)"
+            )
+            connection.commit()
+            
+            self._size = connection.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+            self._connection = connection
+        
+        return self._connection
+    
+    def get(self, key: Optional[str], ttl: Optional[int] = None) -> Optional[dict]:
+        """
+        Obtém os metadados de uma chave, se presentes e dentro do TTL.
+        
+        Args:
+            key: Chave da entrada (ID do vídeo ou da playlist)
+            ttl: TTL desta consulta em segundos (padrão: o do cache)
+        
+        Returns:
+            Metadados armazenados ou None em caso de ausência
+        """
+        if not self.enabled or not key:
+            return None
+        
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        
+        try:
+            with self._lock:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT payload, created_at FROM metadata WHERE key = ?", (key,)
+                ).fetchone()
+                
+                if row is None:
+                    self.misses += 1
+                    return None
+                
+                payload, created_at = row
+                
+                if ttl and now - created_at > ttl:
+                    connection.execute("DELETE FROM metadata WHERE key = ?", (key,))
+                    connection.commit()
+                    self._size -= 1
+                    self.expirations += 1
+                    self.misses += 1
+                    return None
+                
+                self._pending_access[key] = now
+                if len(self._pending_access) >= self.ACCESS_FLUSH_SIZE:
+                    self._flush_access(connection)
+                    connection.commit()
+                self.hits += 1
+            
+            return json.loads(payload)
+        
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Falha ao ler o cache de metadados: {e}")
+            return None
+    
+    def put(self, key: Optional[str], metadata: dict) -> None:
+        """
+        Armazena os metadados de uma chave.
+        
+        Args:
+            key: Chave da entrada (ID do vídeo ou da playlist)
+            metadata: Metadados serializáveis em JSON
+        """
+        if not self.enabled or not key:
+            return
+        
+        now = time.time()
+        
+        try:
+            payload = json.dumps(metadata, ensure_ascii=False)
+            
+            with self._lock:
+                connection = self._connect()
+                exists = connection.execute(
+                    "SELECT 1 FROM metadata WHERE key = ?", (key,)
+                ).fetchone()
+                connection.execute(
+                    "INSERT OR REPLACE INTO metadata (key, payload, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, payload, now, now)
+                )
+                
+                if not exists:
+                    self._size += 1
+                
+                if self.max_entries and self._size > self.max_entries:
+                    self._flush_access(connection)
+                    self._evict(connection)
+                
+                connection.commit()
+        
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Falha ao gravar no cache de metadados: {e}")
+    
+    def _flush_access(self, connection: sqlite3.Connection) -> None:
+        """
+        Grava os horários de acesso acumulados (sem ``commit``).
+        
+        Args:
+            connection: Conexão SQLite aberta
+        """
+        if not self._pending_access:
+            return
+        
+        connection.executemany(
+            "UPDATE metadata SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in self._pending_access.items()]
+        )
+        self._pending_access.clear()
+    
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """
+        Remove as entradas menos acessadas recentemente.
+        
+        Remove uma fração extra além do excedente para não executar a
+        remoção a cada nova inserção.
+        
+        Args:
+            connection: Conexão SQLite aberta
+        """
+        excess = self._size - self.max_entries
+        count = excess + int(self.max_entries * self.EVICTION_FRACTION)
+        
+        cursor = connection.execute(
+            "DELETE FROM metadata WHERE key IN "
+            "(SELECT key FROM metadata ORDER BY accessed_at ASC LIMIT ?)",
+            (count,)
+        )
+        
+        self._size -= cursor.rowcount
+        self.evictions += cursor.rowcount
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Retorna os contadores do cache.
+        
+        Returns:
+            Dicionário com acertos, falhas, expirações, remoções e tamanho
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "size": self._size
+        }
+    
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            if self._connection is not None:
+                try:
+                    self._flush_access(self._connection)
+                    self._connection.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Falha ao gravar no cache de metadados: {e}")
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,317 @@
+"""Métricas dos downloads no formato de exposição de texto do Prometheus."""
+
+import bisect
+import http.server
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from ..models.download_result import DownloadResult, DownloadStatus
+from ..utils.logger import logger
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRIC_PREFIX = "youtube_downloader"
+
+# Limites (segundos) dos histogramas de duração
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def format_value(value: float) -> str:
+    """
+    Formata um valor sem notação científica para inteiros.
+    
+    Args:
+        value: Valor da amostra
+    
+    Returns:
+        Texto da amostra (ex.: "3858410" ou "2.5")
+    """
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class Counter:
+    """Contador monotônico, opcionalmente com um rótulo."""
+    
+    def __init__(self, name: str, description: str, label: Optional[str] = None):
+        self.name = f"{METRIC_PREFIX}_{name}"
+        self.description = description
+        self.label = label
+        self._values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: float = 1, label_value: str = "") -> None:
+        """
+        Incrementa o contador.
+        
+        Args:
+            amount: Valor a somar
+            label_value: Valor do rótulo, se o contador tiver um
+        """
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0) + amount
+    
+    def render(self, kind: str = "counter") -> List[str]:
+        """
+        Formata o contador para a exposição.
+        
+        Args:
+            kind: Tipo declarado em ``# TYPE``
+        
+        Returns:
+            Linhas do formato de texto
+        """
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {kind}"]
+        
+        with self._lock:
+            values = sorted(self._values.items())
+        
+        for label_value, value in values or [("", 0)]:
+            labels = f'{{{self.label}="{label_value}"}}' if self.label and label_value else ""
+            lines.append(f"{self.name}{labels} {format_value(value)}")
+        
+        return lines
+
+
+class Gauge(Counter):
+    """Valor que sobe e desce (ex.: downloads em andamento)."""
+    
+    def dec(self, amount: float = 1, label_value: str = "") -> None:
+        """
+        Decrementa o valor.
+        
+        Args:
+            amount: Valor a subtrair
+            label_value: Valor do rótulo, se houver
+        """
+        self.inc(-amount, label_value)
+    
+    def render(self, kind: str = "gauge") -> List[str]:
+        """Formata o valor para a exposição."""
+        return super().render(kind)
+
+
+class Histogram:
+    """Histograma de durações com limites fixos."""
+    
+    def __init__(self, name: str, description: str, buckets: Sequence[float] = DURATION_BUCKETS):
+        self.name = f"{METRIC_PREFIX}_{name}"
+        self.description = description
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float) -> None:
+        """
+        Registra uma observação.
+        
+        Args:
+            value: Valor observado (segundos)
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+    
+    def render(self) -> List[str]:
+        """
+        Formata o histograma com as contagens acumuladas por limite.
+        
+        Returns:
+            Linhas do formato de texto
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {cumulative}')
+        
+        cumulative += counts[-1]
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {cumulative}')
+        lines.append(f"{self.name}_sum {format_value(total)}")
+        lines.append(f"{self.name}_count {cumulative}")
+        
+        return lines
+
+
+class DownloadMetrics:
+    """
+    Métricas acumuladas pelo downloader ao longo da vida do processo.
+    
+    Os itens são contabilizados quando finalizados, a partir do
+    ``DownloadResult`` (status, bytes e tempos por etapa), de modo que os
+    motores de threads e asyncio alimentam as mesmas séries. Em lotes
+    divididos entre processos, cada resultado chega ao processo pai assim
+    que o item termina, com a variação do cache de metadados do processo
+    (``merge_cache_stats``); só ``downloads_in_flight`` se limita às
+    transferências deste processo (nenhuma, nesse caso). As estatísticas
+    do cache local são lidas no momento da coleta.
+    """
+    
+    def __init__(self, cache_stats: Optional[Callable[[], Dict[str, int]]] = None):
+        self.cache_stats = cache_stats
+        self.items = Counter("items_total", "Itens finalizados por status.", label="status")
+        self.bytes = Counter("downloaded_bytes_total", "Bytes transferidos.")
+        self.retries = Counter("retries_total", "Novas tentativas feitas pelo yt-dlp.")
+        self.in_flight = Gauge("downloads_in_flight", "Transferências em andamento.")
+        self.probe_seconds = Histogram("probe_duration_seconds", "Duração da sondagem de metadados.")
+        self.transfer_seconds = Histogram("transfer_duration_seconds", "Duração das transferências.")
+        self.ffmpeg_seconds = Histogram("ffmpeg_duration_seconds", "Duração da conversão pelo FFmpeg.")
+        self._shard_cache_stats: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def record_result(self, result: DownloadResult) -> None:
+        """
+        Contabiliza um item finalizado.
+        
+        Args:
+            result: Resultado do download
+        """
+        if result.status == DownloadStatus.PENDING:
+            return
+        
+        self.items.inc(label_value=result.status.value)
+        self.bytes.inc(result.bytes_downloaded if result.is_success else 0)
+        self.retries.inc(result.retries)
+        
+        for stage, histogram in (
+            ("probe", self.probe_seconds),
+            ("transfer", self.transfer_seconds),
+            ("postprocess", self.ffmpeg_seconds),
+        ):
+            if stage in result.stage_timings:
+                histogram.observe(result.stage_timings[stage])
+    
+    def merge_cache_stats(self, cache_stats: Dict[str, int]) -> None:
+        """
+        Soma estatísticas de cache vindas de outros processos.
+        
+        Args:
+            cache_stats: Contadores retornados pelos processos de um lote
+        """
+        with self._lock:
+            for key, value in cache_stats.items():
+                self._shard_cache_stats[key] = self._shard_cache_stats.get(key, 0) + value
+    
+    @contextmanager
+    def track_in_flight(self) -> Iterator[None]:
+        """
+        Marca uma transferência em andamento enquanto o bloco executa.
+        
+        Yields:
+            Nada
+        """
+        self.in_flight.inc()
+        
+        try:
+            yield
+        finally:
+            self.in_flight.dec()
+    
+    def render(self) -> str:
+        """
+        Gera a exposição de texto de todas as métricas.
+        
+        Returns:
+            Corpo da resposta de ``/metrics``
+        """
+        lines: List[str] = []
+        
+        for metric in (
+            self.items, self.bytes, self.retries, self.in_flight,
+            self.probe_seconds, self.transfer_seconds, self.ffmpeg_seconds
+        ):
+            lines.extend(metric.render())
+        
+        with self._lock:
+            cache_stats = dict(self._shard_cache_stats)
+        
+        if self.cache_stats is not None:
+            for key, value in self.cache_stats().items():
+                cache_stats[key] = cache_stats.get(key, 0) + value
+        
+        for key, description in (
+            ("hits", "Acertos do cache de metadados."),
+            ("misses", "Falhas do cache de metadados."),
+            ("evictions", "Entradas removidas do cache de metadados."),
+        ):
+            name = f"{METRIC_PREFIX}_metadata_cache_{key}_total"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {cache_stats.get(key, 0)}")
+        
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Servidor HTTP (biblioteca padrão) que expõe ``/metrics`` em uma thread.
+    
+    Pensado para lotes longos: o Prometheus (ou um simples ``curl``) pode
+    coletar as métricas enquanto os downloads ocorrem.
+    """
+    
+    def __init__(self, metrics: DownloadMetrics, port: int, host: str = "127.0.0.1"):
+        self.metrics = metrics
+        self.port = port
+        self.host = host
+        self._server: Optional[http.server.ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> bool:
+        """
+        Inicia o servidor.
+        
+        Returns:
+            True se o servidor foi iniciado, False se a porta não pôde ser usada
+        """
+        metrics = self.metrics
+        
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        try:
+            self._server = http.server.ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            logger.warning(f"Não foi possível expor as métricas na porta {self.port}: {e}")
+            return False
+        
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        
+        logger.info(f"Métricas disponíveis em http://{self.host}:{self.port}/metrics")
+        return True
+    
+    def stop(self) -> None:
+        """Encerra o servidor, se estiver em execução."""
+        if self._server is None:
+            return
+        
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
@@ -1,21 +1,128 @@
 """Manipulador de playlists do YouTube."""
 
-import yt_dlp as youtube_dl
-from typing import List, Optional
+import threading
+from typing import Dict, Iterator, List, Optional
 
-from ..models.download_result import VideoInfo
+from yt_dlp.utils import PagedList
+
+from ..config.settings import settings
+from ..models.download_result import PlaylistInfo
+from ..services.metadata_cache import MetadataCache
+from ..services.ydl_pool import YDLProfile, YoutubeDLPool
 from ..utils.logger import logger
+from ..utils.validators import URLValidator
 
 
 class PlaylistHandler:
     """Responsável por manipular playlists do YouTube."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        ydl_pool: Optional[YoutubeDLPool] = None,
+        metadata_cache: Optional[MetadataCache] = None
+    ):
         self.ydl_opts = {
             "quiet": True, 
             "extract_flat": True,
             "no_warnings": True
         }
+        self.ydl_pool = ydl_pool or YoutubeDLPool()
+        self.ydl_pool.register_profile(YDLProfile.FLAT_PLAYLIST, lambda: dict(self.ydl_opts))
+        self.metadata_cache = metadata_cache or MetadataCache()
+        self.url_validator = URLValidator()
+        self._resolved: Dict[str, PlaylistInfo] = {}
+        self._resolved_lock = threading.Lock()
+    
+    def resolve_playlist(self, url: str) -> PlaylistInfo:
+        """
+        Resolve uma URL de playlist com uma única extração.
+        
+        O resultado é memorizado por URL durante a sessão, de modo que
+        verificar o tipo, obter o título, as entradas e a contagem de vídeos
+        de uma mesma playlist percorre suas páginas apenas uma vez.
+        
+        Args:
+            url: URL a resolver
+            
+        Returns:
+            Informações resolvidas da playlist
+        """
+        with self._resolved_lock:
+            resolved = self._resolved.get(url)
+        
+        if resolved is not None:
+            return resolved
+        
+        info = self.get_playlist_info(url)
+        
+        if info is None:
+            # Falhas não são memorizadas para permitir nova tentativa
+            return PlaylistInfo(url=url, title="Playlist desconhecida", entry_ids=[], is_playlist=False)
+        
+        return self._memoize(url, info)
+    
+    def _memoize(self, url: str, info: dict) -> PlaylistInfo:
+        """
+        Constrói e memoriza o PlaylistInfo a partir do resumo da playlist.
+        
+        Args:
+            url: URL da playlist
+            info: Resumo no formato retornado por ``get_playlist_info``
+            
+        Returns:
+            Informações resolvidas da playlist
+        """
+        resolved = PlaylistInfo(
+            url=url,
+            title=info.get("title") or "Playlist sem título",
+            entry_ids=[entry["id"] for entry in info.get("entries", []) if entry.get("id")],
+            is_playlist=info.get("_type") == "playlist"
+        )
+        
+        with self._resolved_lock:
+            self._resolved[url] = resolved
+        
+        return resolved
+    
+    def _get_cache_key(self, url: str) -> Optional[str]:
+        """
+        Obtém a chave do cache de metadados de uma playlist.
+        
+        Args:
+            url: URL da playlist
+            
+        Returns:
+            Chave baseada no ID da playlist ou None se a URL não tiver um
+            (ou se ``PLAYLIST_CACHE_TTL`` desativar o cache de playlists)
+        """
+        if settings.PLAYLIST_CACHE_TTL <= 0:
+            return None
+        
+        playlist_id = self.url_validator.extract_playlist_id(url)
+        return f"playlist:{playlist_id}" if playlist_id else None
+    
+    def _get_cached(self, cache_key: Optional[str]) -> Optional[dict]:
+        """
+        Consulta o cache com o TTL curto das playlists.
+        
+        Ao contrário dos metadados de um vídeo, a lista de entradas muda
+        quando vídeos são adicionados, por isso não usa ``METADATA_CACHE_TTL``.
+        
+        Args:
+            cache_key: Chave retornada por ``_get_cache_key``
+            
+        Returns:
+            Resumo da playlist ou None se ausente ou expirado
+        """
+        cached = self.metadata_cache.get(cache_key, ttl=settings.PLAYLIST_CACHE_TTL)
+        
+        if cached is not None:
+            logger.info(
+                f"Entradas da playlist lidas do cache (válido por até "
+                f"{settings.PLAYLIST_CACHE_TTL // 60} min): {cached.get('title') or cache_key}"
+            )
+        
+        return cached
     
     def is_playlist(self, url: str) -> bool:
         """
@@ -27,13 +134,98 @@ class PlaylistHandler:
         Returns:
             True se for uma playlist, False caso contrário
         """
+        return self.resolve_playlist(url).is_playlist
+    
+    def iter_playlist_entries(self, playlist_url: str) -> Iterator[str]:
+        """
+        Gera as URLs dos vídeos de uma playlist à medida que as páginas chegam.
+        
+        A extração é feita sem processamento (``process=False``), mantendo as
+        entradas do yt-dlp como gerador: cada página é buscada apenas quando o
+        consumidor pede mais URLs. Como o gerador fica preso à instância do
+        yt-dlp até o fim da playlist, é usada uma instância própria em vez de
+        uma do pool. Ao esgotar a playlist, o resultado é memorizado e gravado
+        no cache como em ``resolve_playlist``.
+        
+        Args:
+            playlist_url: URL da playlist
+            
+        Yields:
+            URLs de vídeos individuais (ou a própria URL se não for playlist)
+        """
+        with self._resolved_lock:
+            resolved = self._resolved.get(playlist_url)
+        
+        cache_key = self._get_cache_key(playlist_url)
+        
+        if resolved is None:
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                resolved = self._memoize(playlist_url, cached)
+        
+        if resolved is not None:
+            yield from resolved.video_urls
+            return
+        
+        entry_ids = []
+        
         try:
-            with youtube_dl.YoutubeDL(self.ydl_opts) as ydl:
-                info_dict = ydl.extract_info(url, download=False)
-                return info_dict.get("_type") == "playlist"
+            with self.ydl_pool.dedicated(YDLProfile.FLAT_PLAYLIST) as ydl:
+                info = ydl.extract_info(playlist_url, download=False, process=False)
+                
+                if info.get("_type") != "playlist":
+                    # Redirecionamentos e vídeos únicos seguem o caminho completo
+                    yield from self.resolve_playlist(playlist_url).video_urls
+                    return
+                
+                entries = info.get("entries") or []
+                if isinstance(entries, PagedList):
+                    entries = self._iter_pages(entries)
+                
+                for entry in entries:
+                    if entry and entry.get("id"):
+                        entry_ids.append(entry["id"])
+                        yield f"https://www.youtube.com/watch?v={entry['id']}"
+                        
         except Exception as e:
-            logger.warning(f"Não foi possível verificar se é playlist: {e}")
-            return False
+            logger.error(f"Erro ao extrair playlist: {e}")
+            if not entry_ids:
+                yield playlist_url
+            return
+        
+        summary = {
+            "_type": "playlist",
+            "id": info.get("id"),
+            "title": info.get("title"),
+            "entries": [{"id": video_id} for video_id in entry_ids]
+        }
+        self._memoize(playlist_url, summary)
+        self.metadata_cache.put(cache_key, summary)
+    
+    @staticmethod
+    def _iter_pages(entries: PagedList) -> Iterator[dict]:
+        """
+        Percorre uma ``PagedList`` buscando uma página por vez.
+        
+        ``getslice()`` sem limites buscaria todas as páginas antes de
+        devolver a primeira entrada.
+        
+        Args:
+            entries: Entradas paginadas retornadas pelo extrator
+            
+        Yields:
+            Entradas da playlist, na ordem
+        """
+        page_size = max(1, getattr(entries, "_pagesize", 0) or 1)
+        start = 0
+        
+        while True:
+            page = entries.getslice(start, start + page_size)
+            yield from page
+            
+            if len(page) < page_size:
+                return
+            start += page_size
     
     def get_playlist_entries(self, playlist_url: str) -> List[str]:
         """
@@ -45,44 +237,47 @@ class PlaylistHandler:
         Returns:
             Lista de URLs de vídeos individuais
         """
-        try:
-            with youtube_dl.YoutubeDL(self.ydl_opts) as ydl:
-                playlist_info = ydl.extract_info(playlist_url, download=False)
-                
-                if playlist_info.get("_type") == "playlist":
-                    entries = playlist_info.get("entries", [])
-                    urls = []
-                    
-                    for entry in entries:
-                        if entry and entry.get("id"):
-                            video_url = f"https://www.youtube.com/watch?v={entry['id']}"
-                            urls.append(video_url)
-                    
-                    return urls
-                else:
-                    # Não é uma playlist, retorna apenas a URL original
-                    return [playlist_url]
-                    
-        except Exception as e:
-            logger.error(f"Erro ao extrair playlist: {e}")
-            return [playlist_url]
+        return self.resolve_playlist(playlist_url).video_urls
     
     def get_playlist_info(self, playlist_url: str) -> Optional[dict]:
         """
         Obtém informações básicas de uma playlist.
         
+        Consulta o cache de metadados antes de acessar a rede. Apenas o tipo,
+        o ID, o título e os IDs/títulos das entradas são mantidos.
+        
         Args:
             playlist_url: URL da playlist
             
         Returns:
             Dicionário com informações da playlist ou None se falhar
         """
+        cache_key = self._get_cache_key(playlist_url)
+        
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            with youtube_dl.YoutubeDL(self.ydl_opts) as ydl:
-                return ydl.extract_info(playlist_url, download=False)
+            with self.ydl_pool.checkout(YDLProfile.FLAT_PLAYLIST) as ydl:
+                info = ydl.extract_info(playlist_url, download=False)
         except Exception as e:
             logger.error(f"Erro ao obter informações da playlist: {e}")
             return None
+        
+        summary = {
+            "_type": info.get("_type"),
+            "id": info.get("id"),
+            "title": info.get("title"),
+            "entries": [
+                {"id": entry.get("id"), "title": entry.get("title")}
+                for entry in info.get("entries") or []
+                if entry
+            ]
+        }
+        self.metadata_cache.put(cache_key, summary)
+        
+        return summary
     
     def get_playlist_title(self, playlist_url: str) -> str:
         """
@@ -94,8 +289,7 @@ class PlaylistHandler:
         Returns:
             Título da playlist ou string padrão se não conseguir obter
         """
-        info = self.get_playlist_info(playlist_url)
-        return info.get("title", "Playlist sem título") if info else "Playlist desconhecida"
+        return self.resolve_playlist(playlist_url).title
     
     def get_playlist_video_count(self, playlist_url: str) -> int:
         """
@@ -107,5 +301,4 @@ class PlaylistHandler:
         Returns:
             Número de vídeos na playlist
         """
-        entries = self.get_playlist_entries(playlist_url)
-        return len(entries)
+        return len(self.get_playlist_entries(playlist_url))
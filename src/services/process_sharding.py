@@ -0,0 +1,386 @@
+"""Execução de lotes divididos entre vários processos."""
+
+import collections
+import multiprocessing
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sized, Tuple
+
+from ..config.settings import paths, settings
+from ..models.download_result import DownloadResult, DownloadStatus, DownloadType
+from ..services.audio_transcoder import get_transcode_workers
+from ..utils.logger import logger
+from ..utils.shutdown import drain_on_signals
+
+
+ShardStats = Dict[str, Dict[str, float]]
+
+# Mensagens enviadas pelos processos de trabalho
+RESULT = "result"
+DONE = "done"
+ERROR = "error"
+
+# Intervalo (segundos) em que as filas conferem pedidos de encerramento
+QUEUE_POLL_SECONDS = 0.2
+
+
+def get_shard_count() -> int:
+    """
+    Obtém o número de processos configurado para lotes.
+    
+    Returns:
+        ``PROCESS_SHARDS``, ou o número de núcleos se a configuração for 0
+    """
+    if settings.PROCESS_SHARDS > 0:
+        return settings.PROCESS_SHARDS
+    
+    return os.cpu_count() or 1
+
+
+def _snapshot(config: object) -> Dict[str, object]:
+    """
+    Copia os valores atuais de um objeto de configuração.
+    
+    Args:
+        config: Instância de ``Paths`` ou ``Settings``
+    
+    Returns:
+        Dicionário nome -> valor dos atributos em maiúsculas
+    """
+    return {name: getattr(config, name) for name in dir(config) if name.isupper()}
+
+
+def _iter_work(work: "multiprocessing.Queue", drain: "multiprocessing.synchronize.Event") -> Iterator[str]:
+    """
+    Lê as URLs da fila compartilhada pelos processos do lote.
+    
+    Args:
+        work: Fila de URLs alimentada pelo processo pai
+        drain: Pedido de encerramento gradual repassado pelo processo pai
+    
+    Yields:
+        URLs, até a sentinela ``None`` ou um pedido de encerramento
+    """
+    while not drain.is_set():
+        try:
+            url = work.get(timeout=QUEUE_POLL_SECONDS)
+        except queue.Empty:
+            continue
+        
+        if url is None:
+            return
+        
+        yield url
+
+
+@contextmanager
+def _forward_drain(drain: "multiprocessing.synchronize.Event", on_drain: Callable[[], None]) -> Iterator[None]:
+    """
+    Chama ``on_drain`` se o processo pai pedir o encerramento do lote.
+    
+    Args:
+        drain: Evento definido pelo processo pai
+        on_drain: Função que encerra o lote gradualmente neste processo
+    
+    Yields:
+        Nada; o bloco executa o lote
+    """
+    finished = threading.Event()
+    
+    def watch() -> None:
+        while not finished.is_set():
+            if drain.wait(QUEUE_POLL_SECONDS):
+                on_drain()
+                return
+    
+    watcher = threading.Thread(target=watch, name="shard-drain", daemon=True)
+    watcher.start()
+    
+    try:
+        yield
+    finally:
+        finished.set()
+        watcher.join()
+
+
+def _download_shard(
+    index: int,
+    shards: int,
+    work: "multiprocessing.Queue",
+    results: "multiprocessing.Queue",
+    drain: "multiprocessing.synchronize.Event",
+    download_type_value: str,
+    path_values: Dict[str, object],
+    setting_values: Dict[str, object]
+) -> None:
+    """
+    Baixa as URLs da fila compartilhada em um processo de trabalho.
+    
+    Executada no processo filho: reaplica as configurações do processo pai
+    (que podem ter sido alteradas pela linha de comando e não são herdadas
+    quando o processo é criado por ``spawn``) e monta um downloader próprio,
+    com seus próprios pools de threads. Cada item finalizado é enviado ao
+    processo pai por ``results`` (``RESULT``), junto com a variação das
+    estatísticas do cache de metadados; ao final seguem a vazão por etapa
+    (``DONE``) ou o erro que interrompeu o processo (``ERROR``).
+    
+    Args:
+        index: Índice do processo
+        shards: Número de processos do lote
+        work: Fila de URLs alimentada pelo processo pai
+        results: Fila de mensagens para o processo pai
+        drain: Pedido de encerramento gradual repassado pelo processo pai
+        download_type_value: Valor de ``DownloadType``
+        path_values: Configurações de caminhos do processo pai
+        setting_values: Configurações gerais do processo pai
+    """
+    from .download_journal import DownloadJournal
+    from .ffmpeg_manager import FFmpegManager
+    from .youtube_downloader import YouTubeDownloader
+    
+    for name, value in path_values.items():
+        setattr(paths, name, value)
+    for name, value in setting_values.items():
+        setattr(settings, name, value)
+    
+    # As conversões do lote são divididas entre os processos, para não
+    # executar núcleos x núcleos codificações do FFmpeg ao mesmo tempo
+    settings.TRANSCODE_WORKERS = max(1, get_transcode_workers() // shards)
+    
+    # Cada processo executa sua parte com o pipeline comum
+    settings.PROCESS_SHARDS = 1
+    
+    # O diário é gravado por todos os processos ao mesmo tempo: nenhum deles
+    # pode reescrevê-lo (o processo pai já o compactou)
+    downloader = YouTubeDownloader(FFmpegManager(), journal=DownloadJournal(compact=False))
+    reported_cache_stats: Dict[str, int] = {}
+    
+    def cache_stats_delta() -> Dict[str, int]:
+        stats = downloader.metadata_cache.get_stats()
+        delta = {key: value - reported_cache_stats.get(key, 0) for key, value in stats.items()}
+        reported_cache_stats.update(stats)
+        return delta
+    
+    # Os resultados não ficam neste processo: cada um segue para o pai
+    downloader.result_listener = lambda result: results.put((RESULT, index, result, cache_stats_delta()))
+    
+    try:
+        # Sinais enviados ao grupo de processos (Ctrl+C, término do agendador)
+        # também chegam aqui; um sinal só para o pai chega por ``drain``
+        with drain_on_signals(downloader.drain_batch), _forward_drain(drain, downloader.drain_batch):
+            batch_result = downloader.download_batch(_iter_work(work, drain), DownloadType(download_type_value))
+        
+        results.put((DONE, index, batch_result.stage_stats, cache_stats_delta()))
+    except Exception as e:
+        results.put((ERROR, index, str(e), cache_stats_delta()))
+    finally:
+        downloader.close()
+
+
+class ShardedBatchRunner:
+    """
+    Divide um lote entre processos para paralelizar o trabalho de CPU.
+    
+    A conversão de áudio do FFmpeg e a extração do yt-dlp disputam o GIL
+    quando rodam em threads de um único processo. Aqui ``shards`` processos,
+    cada um com seu próprio downloader, consomem as URLs de uma fila
+    limitada, alimentada aos poucos pelo processo pai, e devolvem cada
+    resultado assim que o item termina. O diário e o cache de metadados são
+    compartilhados pelo disco.
+    """
+    
+    def __init__(self, shards: int):
+        self.shards = max(1, shards)
+    
+    def run(
+        self,
+        urls: Iterable[str],
+        download_type: DownloadType,
+        on_result: Callable[[DownloadResult], None],
+        on_cache_stats: Optional[Callable[[Dict[str, int]], None]] = None,
+        drain_requested: Optional[threading.Event] = None
+    ) -> Tuple[Dict[str, int], ShardStats]:
+        """
+        Executa o lote nos processos de trabalho.
+        
+        O iterável é lido em uma thread, que só avança quando há espaço na
+        fila (``PROBE_QUEUE_SIZE`` por processo). Os resultados são
+        repassados a ``on_result`` à medida que os itens terminam, em
+        qualquer processo. Um pedido de encerramento (``drain_requested``)
+        interrompe a leitura e é repassado aos processos, que concluem os
+        itens em andamento.
+        
+        Args:
+            urls: URLs a baixar (lista ou gerador)
+            download_type: Tipo de download
+            on_result: Função chamada com cada resultado
+            on_cache_stats: Função chamada com a variação das estatísticas do
+                cache de metadados de cada processo, junto de cada resultado
+            drain_requested: Pedido de encerramento gradual do lote
+        
+        Returns:
+            Estatísticas somadas do cache e vazão por etapa (bytes somados;
+            tempo ativo do processo mais lento)
+        """
+        shards = min(self.shards, len(urls)) if isinstance(urls, Sized) else self.shards
+        cache_stats: Dict[str, int] = {}
+        stage_stats: ShardStats = {}
+        
+        if not shards:
+            return cache_stats, stage_stats
+        
+        if isinstance(urls, Sized):
+            logger.info(f"Dividindo {len(urls)} itens entre {shards} processos...")
+        else:
+            logger.info(f"Dividindo o lote entre {shards} processos...")
+        
+        drain_requested = drain_requested or threading.Event()
+        context = multiprocessing.get_context()
+        work = context.Queue(maxsize=settings.PROBE_QUEUE_SIZE * shards)
+        results = context.Queue()
+        drain = context.Event()
+        
+        processes = [
+            context.Process(
+                target=_download_shard,
+                args=(
+                    index, shards, work, results, drain,
+                    download_type.value, _snapshot(paths), _snapshot(settings)
+                ),
+                name=f"shard-{index}"
+            )
+            for index in range(shards)
+        ]
+        for process in processes:
+            process.start()
+        
+        # URLs entregues à fila e ainda sem resultado: se um processo morrer,
+        # as que ele havia retirado são dadas como falhas
+        outstanding: collections.Counter[str] = collections.Counter()
+        outstanding_lock = threading.Lock()
+        stop_feeding = threading.Event()
+        running = set(range(shards))
+        crashed: List[int] = []
+        
+        def put(item: Optional[str]) -> bool:
+            while not stop_feeding.is_set():
+                try:
+                    work.put(item, timeout=QUEUE_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def feed() -> None:
+            try:
+                for url in urls:
+                    with outstanding_lock:
+                        outstanding[url] += 1
+                    if not put(url):
+                        with outstanding_lock:
+                            outstanding[url] -= 1
+                        return
+            except Exception as e:
+                logger.error(f"Falha ao ler as URLs do lote: {e}")
+            
+            for _ in range(shards):
+                put(None)
+        
+        def handle(message: tuple) -> None:
+            kind, index, payload, cache_delta = message
+            
+            for key, value in cache_delta.items():
+                cache_stats[key] = cache_stats.get(key, 0) + value
+            if on_cache_stats is not None:
+                on_cache_stats(cache_delta)
+            
+            if kind == RESULT:
+                with outstanding_lock:
+                    if outstanding[payload.url] > 1:
+                        outstanding[payload.url] -= 1
+                    else:
+                        outstanding.pop(payload.url, None)
+                on_result(payload)
+                return
+            
+            running.discard(index)
+            
+            if kind == ERROR:
+                logger.error(f"Falha em um processo de download: {payload}")
+                crashed.append(index)
+                return
+            
+            for name, stats in payload.items():
+                merged = stage_stats.setdefault(name, {"items": 0, "bytes": 0, "seconds": 0.0})
+                merged["items"] += stats["items"]
+                merged["bytes"] += stats["bytes"]
+                merged["seconds"] = max(merged["seconds"], stats["seconds"])
+        
+        feeder = threading.Thread(target=feed, name="shard-feeder", daemon=True)
+        feeder.start()
+        
+        try:
+            while running:
+                if drain_requested.is_set() and not drain.is_set():
+                    stop_feeding.set()
+                    drain.set()
+                
+                try:
+                    handle(results.get(timeout=QUEUE_POLL_SECONDS))
+                    continue
+                except queue.Empty:
+                    pass
+                
+                # Processo encerrado sem enviar ``DONE`` (ex.: morto pelo sistema)
+                for index in list(running):
+                    if processes[index].exitcode not in (None, 0):
+                        logger.error(
+                            f"Processo de download {index} encerrado inesperadamente "
+                            f"(código {processes[index].exitcode})"
+                        )
+                        running.discard(index)
+                        crashed.append(index)
+        finally:
+            stop_feeding.set()
+            drain.set()
+            feeder.join()
+            
+            # Um processo só termina depois que suas mensagens saem da fila
+            while any(process.is_alive() for process in processes):
+                try:
+                    handle(results.get(timeout=QUEUE_POLL_SECONDS))
+                except queue.Empty:
+                    pass
+            
+            for process in processes:
+                process.join()
+            
+            # Mensagens enviadas pouco antes de um processo terminar
+            while True:
+                try:
+                    handle(results.get(timeout=QUEUE_POLL_SECONDS))
+                except queue.Empty:
+                    break
+            
+            # URLs que ficaram na fila não foram retiradas por nenhum processo
+            while True:
+                try:
+                    url = work.get(timeout=QUEUE_POLL_SECONDS)
+                except queue.Empty:
+                    break
+                if url is not None:
+                    outstanding[url] -= 1
+        
+        if crashed:
+            for url, count in outstanding.items():
+                for _ in range(count):
+                    on_result(DownloadResult(
+                        url=url,
+                        status=DownloadStatus.FAILED,
+                        download_type=download_type,
+                        error_message="Falha no processo de download"
+                    ))
+        
+        return cache_stats, stage_stats
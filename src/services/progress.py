@@ -0,0 +1,224 @@
+"""Barramento e agregação do progresso dos downloads."""
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+# Evento: (status, chave_do_item, bytes_baixados, bytes_totais, velocidade, eta)
+ITEM_DONE = "item_done"
+
+
+class ProgressBus:
+    """
+    Fila de eventos de progresso publicada pelas threads de download.
+    
+    A publicação é um ``put`` em uma ``queue.SimpleQueue`` (implementada em
+    C, sem trava em Python), de modo que centenas de downloads simultâneos
+    não disputam nenhum lock para reportar bytes. Eventos só são aceitos
+    enquanto há um agregador consumindo a fila.
+    """
+    
+    def __init__(self):
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.active = False
+    
+    def publish_hook(self, status: dict) -> None:
+        """
+        Hook de progresso do yt-dlp (``progress_hooks``).
+        
+        Args:
+            status: Dicionário de progresso repassado pelo yt-dlp
+        """
+        if not self.active:
+            return
+        
+        info_dict = status.get("info_dict") or {}
+        self._queue.put((
+            status.get("status"),
+            info_dict.get("id") or status.get("filename"),
+            status.get("downloaded_bytes") or 0,
+            status.get("total_bytes") or status.get("total_bytes_estimate"),
+            status.get("speed"),
+            status.get("eta")
+        ))
+    
+    def publish(
+        self,
+        status: str,
+        key: Optional[str] = None,
+        downloaded: int = 0,
+        total: Optional[int] = None
+    ) -> None:
+        """
+        Publica um evento de progresso fora do yt-dlp.
+        
+        Args:
+            status: "downloading", "finished", "error" ou ``ITEM_DONE``
+            key: Chave do item
+            downloaded: Bytes já baixados do item
+            total: Tamanho total do item, se conhecido
+        """
+        if self.active:
+            self._queue.put((status, key, downloaded, total, None, None))
+    
+    def drain(self, timeout: float) -> List[tuple]:
+        """
+        Retira todos os eventos pendentes, esperando até ``timeout`` pelo primeiro.
+        
+        Args:
+            timeout: Espera máxima em segundos
+        
+        Returns:
+            Eventos na ordem de publicação
+        """
+        events = []
+        
+        try:
+            events.append(self._queue.get(timeout=timeout))
+            while True:
+                events.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        
+        return events
+
+
+class ProgressAggregator:
+    """
+    Consome o ``ProgressBus`` em uma thread e renderiza uma linha de status.
+    
+    Mantém o estado de cada item em andamento e calcula a vazão total a
+    partir da variação dos bytes baixados entre renderizações, o que vale
+    tanto para o yt-dlp quanto para o motor asyncio, que não informa
+    velocidade.
+    """
+    
+    def __init__(
+        self,
+        bus: ProgressBus,
+        render: Callable[[str], None],
+        interval: float = 0.5,
+        on_stop: Optional[Callable[[], None]] = None
+    ):
+        self.bus = bus
+        self.render = render
+        self.interval = interval
+        self.on_stop = on_stop
+        
+        self.completed_items = 0
+        self._active: Dict[str, List] = {}
+        self._finished_bytes = 0
+        self._last_bytes = 0
+        self._last_time = 0.0
+        self._throughput = 0.0
+        
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def __enter__(self) -> "ProgressAggregator":
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+    
+    def start(self) -> None:
+        """Ativa o barramento e inicia a thread de agregação."""
+        self._last_time = time.monotonic()
+        self.bus.active = True
+        self._thread = threading.Thread(target=self._run, name="progress-aggregator", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Desativa o barramento e aguarda a thread terminar."""
+        self.bus.active = False
+        self._stop.set()
+        
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        
+        if self.on_stop is not None:
+            self.on_stop()
+    
+    def _run(self) -> None:
+        """Laço da thread: aplica eventos e renderiza a cada intervalo."""
+        next_render = time.monotonic() + self.interval
+        
+        while not self._stop.is_set():
+            for event in self.bus.drain(timeout=self.interval):
+                self._apply(event)
+            
+            if self._stop.is_set():
+                break
+            
+            now = time.monotonic()
+            if now >= next_render:
+                self.render(self.format_status(now))
+                next_render = now + self.interval
+        
+        # Descarta o que sobrou na fila após a desativação
+        self.bus.drain(timeout=0)
+    
+    def _apply(self, event: tuple) -> None:
+        """
+        Atualiza o estado com um evento.
+        
+        Args:
+            event: Tupla publicada no barramento
+        """
+        status, key, downloaded, total, speed, eta = event
+        
+        if status == ITEM_DONE:
+            self.completed_items += 1
+        elif status == "downloading":
+            self._active[key] = [downloaded, total]
+        elif status in ("finished", "error"):
+            state = self._active.pop(key, None)
+            if status == "finished":
+                self._finished_bytes += downloaded or (state[0] if state else 0)
+    
+    def get_downloaded_bytes(self) -> int:
+        """
+        Soma os bytes baixados, concluídos e em andamento.
+        
+        Returns:
+            Total de bytes recebidos no lote
+        """
+        return self._finished_bytes + sum(state[0] for state in self._active.values())
+    
+    def format_status(self, now: float) -> str:
+        """
+        Monta a linha de status com o estado agregado.
+        
+        Args:
+            now: Instante atual (``time.monotonic``)
+        
+        Returns:
+            Texto como "Progresso: 3 concluídos | 5 ativos | 45.2 MB | 8.3 MB/s | ETA 00:42"
+        """
+        downloaded = self.get_downloaded_bytes()
+        elapsed = now - self._last_time
+        
+        if elapsed > 0:
+            self._throughput = max(downloaded - self._last_bytes, 0) / elapsed
+            self._last_bytes = downloaded
+            self._last_time = now
+        
+        parts = [
+            f"Progresso: {self.completed_items} concluídos",
+            f"{len(self._active)} ativos",
+            f"{downloaded / 1_000_000:.1f} MB",
+            f"{self._throughput / 1_000_000:.1f} MB/s"
+        ]
+        
+        remaining = sum(
+            state[1] - state[0] for state in self._active.values() if state[1]
+        )
+        if remaining > 0 and self._throughput > 0:
+            minutes, seconds = divmod(int(remaining / self._throughput), 60)
+            parts.append(f"ETA {minutes:02d}:{seconds:02d}")
+        
+        return " | ".join(parts)
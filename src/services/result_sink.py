@@ -0,0 +1,72 @@
+"""Coleta dos resultados de um lote, em memória ou em disco."""
+
+import os
+from typing import Callable, List, Optional, TextIO
+
+from ..models.download_result import DownloadResult
+from ..utils.file_utils import FileManager
+
+
+class BatchResultSink:
+    """
+    Recebe os resultados de um lote e mantém contadores acumulados.
+    
+    Sem ``path``, os resultados ficam em uma lista, como sempre foi. Com
+    ``path`` (modo streaming), cada resultado é gravado como uma linha
+    JSON e descartado da memória, de modo que lotes de centenas de
+    milhares de itens ocupam memória constante; os contadores bastam para
+    o resumo e os detalhes são relidos do arquivo quando necessários. Com
+    ``forward``, cada resultado é repassado (ex.: de um processo de trabalho
+    ao processo pai) e também não é mantido.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        forward: Optional[Callable[[DownloadResult], None]] = None
+    ):
+        self.path = path
+        self.forward = forward
+        self.results: List[DownloadResult] = []
+        self.total = 0
+        self.successful = 0
+        self.failed = 0
+        self.skipped = 0
+        self.bytes_downloaded = 0
+        self.retries = 0
+        self._file: Optional[TextIO] = None
+        
+        if path is not None:
+            FileManager.create_directory_if_not_exists(os.path.dirname(path) or ".")
+            self._file = open(path, "w", encoding="utf-8")
+    
+    def add(self, result: DownloadResult) -> None:
+        """
+        Contabiliza e guarda (ou grava) um resultado finalizado.
+        
+        Args:
+            result: Resultado do download
+        """
+        self.total += 1
+        self.bytes_downloaded += result.bytes_downloaded
+        self.retries += result.retries
+        
+        if result.is_success:
+            self.successful += 1
+        elif result.is_failed:
+            self.failed += 1
+        elif result.is_skipped:
+            self.skipped += 1
+        
+        if self.forward is not None:
+            self.forward(result)
+        elif self._file is not None:
+            self._file.write(result.to_json_line())
+        else:
+            self.results.append(result)
+    
+    def close(self) -> None:
+        """Grava o que estiver pendente e fecha o arquivo do modo streaming."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,156 @@
+"""Submissão de tarefas em janela deslizante."""
+
+import concurrent.futures
+from typing import Callable, Dict, Generic, Iterable, Iterator, List, Optional, TypeVar, Union
+
+from ..utils.read_ahead import EMPTY, END, ReadAhead
+
+
+T = TypeVar("T")
+
+
+class SlidingWindowScheduler(Generic[T]):
+    """
+    Mantém no máximo ``window`` tarefas em andamento em um executor.
+    
+    Os itens são puxados do iterador de origem apenas quando há vaga na
+    janela, de modo que o número de futures (e a memória ocupada por eles)
+    depende do tamanho da janela, e não do lote. Sem origem, os itens são
+    enviados com ``submit`` por quem controla o pipeline.
+    
+    Se a origem for uma ``ReadAhead``, ``fill`` nunca bloqueia: envia só os
+    itens já lidos pela thread da origem, e ``source_ready`` dá uma future
+    para esperar pelos próximos junto com as tarefas em andamento.
+    
+    ``drain`` para de puxar novos itens e deixa os em andamento
+    terminarem; ``cancel`` também cancela as tarefas que ainda aguardam
+    uma thread livre no executor.
+    """
+    
+    def __init__(
+        self,
+        submit: Callable[[T], concurrent.futures.Future],
+        window: Optional[int] = None,
+        source: Optional[Union[Iterable[T], ReadAhead[T]]] = None
+    ):
+        self.submit_task = submit
+        self.window = window
+        self._source: Optional[Union[Iterator[T], ReadAhead[T]]] = (
+            source if source is None or isinstance(source, ReadAhead) else iter(source)
+        )
+        self._futures: Dict[concurrent.futures.Future, T] = {}
+    
+    def __len__(self) -> int:
+        return len(self._futures)
+    
+    def __contains__(self, future: concurrent.futures.Future) -> bool:
+        return future in self._futures
+    
+    def __iter__(self) -> Iterator[concurrent.futures.Future]:
+        return iter(list(self._futures))
+    
+    @property
+    def exhausted(self) -> bool:
+        """Indica se não há mais itens a puxar da origem."""
+        return self._source is None
+    
+    def has_room(self, reserved: int = 0) -> bool:
+        """
+        Verifica se há vaga na janela.
+        
+        Args:
+            reserved: Vagas ocupadas fora do executor (ex.: itens já
+                sondados aguardando a próxima etapa)
+        
+        Returns:
+            True se uma nova tarefa pode ser enviada
+        """
+        return self.window is None or len(self._futures) + reserved < self.window
+    
+    def submit(self, item: T) -> concurrent.futures.Future:
+        """
+        Envia um item ao executor, sem consultar a janela.
+        
+        Args:
+            item: Item da tarefa
+        
+        Returns:
+            Future da tarefa
+        """
+        future = self.submit_task(item)
+        self._futures[future] = item
+        return future
+    
+    def fill(self, reserved: int = 0) -> int:
+        """
+        Puxa itens da origem até completar a janela.
+        
+        Args:
+            reserved: Vagas ocupadas fora do executor
+        
+        Returns:
+            Número de tarefas enviadas
+        """
+        submitted = 0
+        
+        while self._source is not None and self.has_room(reserved):
+            if isinstance(self._source, ReadAhead):
+                item = self._source.poll()
+                if item is EMPTY:
+                    break
+            else:
+                item = next(self._source, END)
+            
+            if item is END:
+                self._source = None
+                break
+            
+            self.submit(item)
+            submitted += 1
+        
+        return submitted
+    
+    def source_ready(self, reserved: int = 0) -> Optional[concurrent.futures.Future]:
+        """
+        Obtém a future da próxima leitura da origem, se ela puder ser usada.
+        
+        Args:
+            reserved: Vagas ocupadas fora do executor
+        
+        Returns:
+            Future concluída quando a ``ReadAhead`` de origem tiver um item,
+            ou None se não houver origem assim ou vaga na janela
+        """
+        if not isinstance(self._source, ReadAhead) or not self.has_room(reserved):
+            return None
+        
+        return self._source.when_ready()
+    
+    def pop(self, future: concurrent.futures.Future) -> T:
+        """
+        Retira da janela uma tarefa concluída.
+        
+        Args:
+            future: Future concluída
+        
+        Returns:
+            Item da tarefa
+        """
+        return self._futures.pop(future)
+    
+    def drain(self) -> None:
+        """Para de puxar itens da origem; as tarefas enviadas seguem até o fim."""
+        if isinstance(self._source, ReadAhead):
+            self._source.close()
+        self._source = None
+    
+    def cancel(self) -> List[T]:
+        """
+        Para de puxar itens e cancela as tarefas que ainda não começaram.
+        
+        Returns:
+            Itens das tarefas canceladas
+        """
+        self.drain()
+        cancelled = [future for future in self._futures if future.cancel()]
+        return [self._futures.pop(future) for future in cancelled]
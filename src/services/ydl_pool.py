@@ -0,0 +1,166 @@
+"""Pool de instâncias reutilizáveis do yt-dlp."""
+
+import queue
+import threading
+from contextlib import contextmanager
+from enum import Enum
+from typing import Callable, Dict, Iterator
+
+import yt_dlp as youtube_dl
+
+
+class YDLProfile(Enum):
+    """Perfis de opções do yt-dlp mantidos no pool."""
+    PROBE = "probe"
+    AUDIO = "audio"
+    VIDEO = "video"
+    FLAT_PLAYLIST = "flat_playlist"
+
+
+class YoutubeDLPool:
+    """
+    Mantém instâncias pré-configuradas do ``YoutubeDL`` por perfil.
+    
+    Construir um ``YoutubeDL`` registra todos os extratores, o cookie jar e o
+    opener HTTP. As threads de trabalho pegam uma instância ociosa do perfil
+    desejado e a devolvem ao terminar, de modo que cada thread paga esse custo
+    apenas uma vez por perfil.
+    
+    Cada instância guarda a geração do perfil em que foi criada; após
+    ``invalidate``, instâncias de gerações anteriores são fechadas em vez de
+    reaproveitadas.
+    """
+    
+    def __init__(self):
+        self._factories: Dict[YDLProfile, Callable[[], dict]] = {}
+        self._idle: Dict[YDLProfile, queue.LifoQueue] = {
+            profile: queue.LifoQueue() for profile in YDLProfile
+        }
+        self._generations: Dict[YDLProfile, int] = {profile: 0 for profile in YDLProfile}
+        self._lock = threading.Lock()
+        self._created = 0
+    
+    def register_profile(self, profile: YDLProfile, options_factory: Callable[[], dict]) -> None:
+        """
+        Registra a fábrica de opções de um perfil.
+        
+        Args:
+            profile: Perfil a registrar
+            options_factory: Função que retorna as opções do yt-dlp do perfil
+        """
+        self._factories[profile] = options_factory
+    
+    def invalidate(self, profile: YDLProfile) -> None:
+        """
+        Descarta as instâncias de um perfil cujas opções mudaram.
+        
+        As instâncias ociosas são fechadas agora; as emprestadas, na devolução.
+        
+        Args:
+            profile: Perfil a invalidar
+        """
+        with self._lock:
+            self._generations[profile] += 1
+        
+        self._drain(self._idle[profile])
+    
+    @property
+    def created_instances(self) -> int:
+        """Número de instâncias do ``YoutubeDL`` criadas pelo pool."""
+        return self._created
+    
+    @contextmanager
+    def checkout(self, profile: YDLProfile) -> Iterator[youtube_dl.YoutubeDL]:
+        """
+        Empresta uma instância do perfil informado.
+        
+        Args:
+            profile: Perfil de opções desejado
+        
+        Yields:
+            Instância do ``YoutubeDL`` exclusiva da thread até a devolução
+        """
+        idle = self._idle[profile]
+        
+        while True:
+            try:
+                generation, ydl = idle.get_nowait()
+            except queue.Empty:
+                generation = self._generations[profile]
+                ydl = self._create(profile)
+                break
+            
+            if generation == self._generations[profile]:
+                break
+            ydl.close()
+        
+        try:
+            yield ydl
+        finally:
+            if generation == self._generations[profile]:
+                idle.put((generation, ydl))
+            else:
+                ydl.close()
+    
+    @contextmanager
+    def dedicated(self, profile: YDLProfile) -> Iterator[youtube_dl.YoutubeDL]:
+        """
+        Cria uma instância do perfil que não volta ao pool.
+        
+        Para usos longos, como percorrer uma playlist enquanto o consumidor
+        processa as entradas: os extratores e geradores de páginas ficam
+        presos à instância que os criou, que por isso não pode ser emprestada
+        a outra thread entre uma página e outra.
+        
+        Args:
+            profile: Perfil de opções desejado
+        
+        Yields:
+            Instância do ``YoutubeDL``, fechada ao sair do bloco
+        """
+        ydl = self._create(profile)
+        
+        try:
+            yield ydl
+        finally:
+            ydl.close()
+    
+    def _create(self, profile: YDLProfile) -> youtube_dl.YoutubeDL:
+        """
+        Cria uma nova instância para o perfil.
+        
+        Args:
+            profile: Perfil de opções
+        
+        Returns:
+            Nova instância do ``YoutubeDL``
+        
+        Raises:
+            KeyError: Se o perfil não tiver sido registrado
+        """
+        ydl = youtube_dl.YoutubeDL(self._factories[profile]())
+        
+        with self._lock:
+            self._created += 1
+        
+        return ydl
+    
+    def close(self) -> None:
+        """Fecha todas as instâncias ociosas do pool."""
+        for idle in self._idle.values():
+            self._drain(idle)
+    
+    @staticmethod
+    def _drain(idle: queue.LifoQueue) -> None:
+        """
+        Fecha as instâncias ociosas de uma fila.
+        
+        Args:
+            idle: Fila de instâncias ociosas de um perfil
+        """
+        while True:
+            try:
+                _, ydl = idle.get_nowait()
+            except queue.Empty:
+                break
+            ydl.close()
@@ -1,28 +1,80 @@
 """Serviço principal de download do YouTube."""
 
+import collections
 import concurrent.futures
-import yt_dlp as youtube_dl
-from typing import List, Optional, Tuple
+import contextlib
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Callable, ContextManager, Dict, Iterable, List, Mapping, Optional, Sized, Tuple
 
 from ..models.download_result import (
     DownloadResult, 
     DownloadStatus, 
     DownloadType, 
     BatchDownloadResult,
+    ProbedItem,
     VideoInfo
 )
 from ..config.settings import paths, settings
 from ..utils.logger import logger
-from ..utils.file_utils import FilenameUtils
+from ..utils.file_utils import DirectoryIndex, FileManager
+from ..utils.read_ahead import ReadAhead
+from ..utils.stage_meter import StageMeter, time_stage
+from ..utils.validators import URLValidator
+from ..services.async_engine import AsyncDownloadEngine
+from ..services.audio_transcoder import (
+    POSTPROCESSOR_CODECS, AudioProfile, AudioTranscoder, get_transcode_workers
+)
+from ..services.concurrency_controller import AdaptiveConcurrencyController
+from ..services.download_journal import DownloadJournal
 from ..services.ffmpeg_manager import FFmpegManager
+from ..services.metadata_cache import MetadataCache
+from ..services.metrics import DownloadMetrics
+from ..services.process_sharding import ShardedBatchRunner, get_shard_count
+from ..services.result_sink import BatchResultSink
+from ..services.sliding_window import SlidingWindowScheduler
+from ..services.progress import ITEM_DONE, ProgressAggregator, ProgressBus
+from ..services.ydl_pool import YDLProfile, YoutubeDLPool
 
 
 class YouTubeDownloader:
     """Serviço principal para downloads do YouTube."""
     
-    def __init__(self, ffmpeg_manager: FFmpegManager):
+    def __init__(
+        self,
+        ffmpeg_manager: FFmpegManager,
+        ydl_pool: Optional[YoutubeDLPool] = None,
+        metadata_cache: Optional[MetadataCache] = None,
+        journal: Optional[DownloadJournal] = None
+    ):
         self.ffmpeg_manager = ffmpeg_manager
-        self.filename_utils = FilenameUtils()
+        self.directory_index = DirectoryIndex()
+        self.url_validator = URLValidator()
+        self.metadata_cache = metadata_cache or MetadataCache()
+        self.journal = journal or DownloadJournal()
+        self.transcoder = AudioTranscoder(ffmpeg_manager)
+        self.download_meter = StageMeter("Download")
+        self.transcode_meter = StageMeter("Conversão")
+        self._option_profiles: Dict[DownloadType, Mapping[str, object]] = {}
+        self._options_generation: Optional[int] = None
+        self.progress_bus = ProgressBus()
+        self.metrics = DownloadMetrics(self.metadata_cache.get_stats)
+        self.progress_renderer: Optional[Callable[[str], None]] = None
+        self.result_listener: Optional[Callable[[DownloadResult], None]] = None
+        self._retry_scope = threading.local()
+        self._batch_started = 0.0
+        self._batch_results = BatchResultSink()
+        self._drain_requested = threading.Event()
+        self.ydl_pool = ydl_pool or YoutubeDLPool()
+        self.ydl_pool.register_profile(YDLProfile.PROBE, self._get_probe_options)
+        self.ydl_pool.register_profile(
+            YDLProfile.AUDIO, lambda: self._get_download_options(DownloadType.AUDIO)
+        )
+        self.ydl_pool.register_profile(
+            YDLProfile.VIDEO, lambda: self._get_download_options(DownloadType.VIDEO)
+        )
     
     def check_video_availability(self, url: str) -> Tuple[bool, Optional[VideoInfo]]:
         """
@@ -35,27 +87,150 @@ class YouTubeDownloader:
             Tupla (disponível, informações_do_vídeo)
         """
         try:
-            ydl_opts = {"quiet": True, "no_warnings": True}
-            with youtube_dl.YoutubeDL(ydl_opts) as ydl:
-                info_dict = ydl.extract_info(url, download=False)
-                
-                video_info = VideoInfo(
-                    title=info_dict.get('title', 'Título desconhecido'),
-                    url=url,
-                    duration=info_dict.get('duration'),
-                    thumbnail=info_dict.get('thumbnail')
-                )
-                
-                return True, video_info
-                
+            video_info, _ = self._probe_video(url)
+            return True, video_info
         except Exception as e:
             logger.error(f"Vídeo indisponível: {url} - {str(e)}")
             return False, None
     
+    def _probe_video(self, url: str) -> Tuple[VideoInfo, Optional[dict]]:
+        """
+        Extrai os metadados de um vídeo uma única vez.
+        
+        Consulta primeiro o cache de metadados; nesse caso não há acesso à
+        rede e o info_dict retornado é None. Caso contrário, a extração é feita
+        sem processamento de formatos (``process=False``), de modo que o
+        dicionário retornado pode ser entregue diretamente a
+        ``process_ie_result`` no momento do download, sem uma nova extração.
+        
+        Args:
+            url: URL do vídeo
+            
+        Returns:
+            Tupla (informações_do_vídeo, info_dict)
+            
+        Raises:
+            Exception: Se o vídeo estiver indisponível
+        """
+        video_id = self.url_validator.extract_video_id(url)
+        cached = self.metadata_cache.get(video_id)
+        
+        if cached is not None:
+            return self._build_video_info(cached, url), None
+        
+        with self.ydl_pool.checkout(YDLProfile.PROBE) as ydl:
+            info_dict = ydl.extract_info(url, download=False, process=False)
+        
+        video_info = self._build_video_info(info_dict, url)
+        self.metadata_cache.put(video_id, {
+            "id": info_dict.get('id'),
+            "title": video_info.title,
+            "duration": video_info.duration,
+            "thumbnail": video_info.thumbnail
+        })
+        
+        return video_info, info_dict
+    
+    def _build_video_info(self, info_dict: dict, url: str) -> VideoInfo:
+        """
+        Monta um VideoInfo a partir de metadados extraídos ou em cache.
+        
+        Args:
+            info_dict: Dicionário de metadados
+            url: URL do vídeo
+            
+        Returns:
+            Informações do vídeo
+        """
+        return VideoInfo(
+            title=info_dict.get('title', 'Título desconhecido'),
+            url=url,
+            duration=info_dict.get('duration'),
+            thumbnail=self._get_thumbnail(info_dict)
+        )
+    
+    @staticmethod
+    def _get_thumbnail(info_dict: dict) -> Optional[str]:
+        """
+        Obtém a miniatura de um info_dict ainda não processado.
+        
+        Args:
+            info_dict: Dicionário retornado pelo extrator
+            
+        Returns:
+            URL da miniatura ou None
+        """
+        if info_dict.get('thumbnail'):
+            return info_dict['thumbnail']
+        
+        thumbnails = info_dict.get('thumbnails') or []
+        return thumbnails[-1].get('url') if thumbnails else None
+    
+    @staticmethod
+    def _get_probe_options() -> dict:
+        """
+        Obtém as opções usadas na extração de metadados.
+        
+        Returns:
+            Dicionário com opções do yt-dlp
+        """
+        return {"quiet": True, "no_warnings": True, "noplaylist": True}
+    
+    @staticmethod
+    def _get_profile(download_type: DownloadType) -> YDLProfile:
+        """
+        Obtém o perfil do pool correspondente ao tipo de download.
+        
+        Args:
+            download_type: Tipo de download (AUDIO ou VIDEO)
+            
+        Returns:
+            Perfil de opções do yt-dlp
+        """
+        return YDLProfile.AUDIO if download_type == DownloadType.AUDIO else YDLProfile.VIDEO
+    
+    def refresh_option_profiles(self) -> None:
+        """
+        Monta os perfis imutáveis de opções de download, se necessário.
+        
+        Os perfis são calculados uma vez (na configuração da aplicação e no
+        início de cada lote apenas se confere a geração do FFmpeg). Quando o
+        executável do FFmpeg muda, os perfis são refeitos e as instâncias do
+        yt-dlp criadas com as opções antigas são descartadas do pool.
+        """
+        generation = self.ffmpeg_manager.refresh()
+        
+        if generation == self._options_generation:
+            return
+        
+        self._option_profiles = {
+            download_type: MappingProxyType(self._build_download_options(download_type))
+            for download_type in DownloadType
+        }
+        self._options_generation = generation
+        
+        for download_type in DownloadType:
+            self.ydl_pool.invalidate(self._get_profile(download_type))
+    
     def _get_download_options(self, download_type: DownloadType) -> dict:
         """
         Obtém as opções de download baseadas no tipo.
         
+        Args:
+            download_type: Tipo de download (AUDIO ou VIDEO)
+            
+        Returns:
+            Cópia do perfil pré-montado (o ``YoutubeDL`` altera suas opções)
+        """
+        if download_type not in self._option_profiles:
+            self.refresh_option_profiles()
+        
+        return dict(self._option_profiles[download_type])
+    
+    def _build_download_options(self, download_type: DownloadType) -> dict:
+        """
+        Monta as opções de download de um tipo.
+        
         Args:
             download_type: Tipo de download (AUDIO ou VIDEO)
             
@@ -65,20 +240,32 @@ class YouTubeDownloader:
         base_options = {
             "ffmpeg_location": self.ffmpeg_manager.get_ffmpeg_path(),
             "outtmpl": f"{paths.DOWNLOAD_DIR}/%(title)s.%(ext)s",
-            "ignoreerrors": True,
             "extract_flat": False,
-            "noplaylist": True
+            "noplaylist": True,
+            "continuedl": True,  # retoma arquivos .part de execuções interrompidas
+            "progress_hooks": (self.progress_bus.publish_hook,),
+            "retries": settings.DOWNLOAD_RETRIES,
+            "fragment_retries": settings.DOWNLOAD_RETRIES,
+            # Sem espera entre tentativas (padrão do yt-dlp); só contabiliza
+            "retry_sleep_functions": MappingProxyType({
+                kind: self._count_retry for kind in ("http", "fragment", "file_access")
+            })
         }
         
+        # A linha de status substitui as mensagens e barras do próprio yt-dlp
+        if self._shows_status_line():
+            base_options.update({"quiet": True, "noprogress": True})
+        
         if download_type == DownloadType.AUDIO:
-            base_options.update({
-                "format": settings.DEFAULT_AUDIO_FORMAT,
-                "postprocessors": [{
+            base_options["format"] = settings.DEFAULT_AUDIO_FORMAT
+            
+            # Com a conversão desacoplada, o yt-dlp entrega o áudio bruto
+            if not settings.DECOUPLED_TRANSCODE:
+                base_options["postprocessors"] = (MappingProxyType({
                     "key": "FFmpegExtractAudio",
-                    "preferredcodec": "mp3",
+                    "preferredcodec": POSTPROCESSOR_CODECS[AudioProfile(settings.AUDIO_PROFILE)],
                     "preferredquality": settings.DEFAULT_AUDIO_QUALITY,
-                }]
-            })
+                }),)
         else:  # VIDEO
             base_options.update({
                 "format": settings.DEFAULT_VIDEO_FORMAT
@@ -86,6 +273,69 @@ class YouTubeDownloader:
         
         return base_options
     
+    def _count_retry(self, n: int) -> float:
+        """
+        Contabiliza uma nova tentativa do yt-dlp no item da thread atual.
+        
+        Registrada em ``retry_sleep_functions``, que o yt-dlp chama antes de
+        cada nova tentativa de uma transferência.
+        
+        Args:
+            n: Número da tentativa que falhou (a partir de 0)
+            
+        Returns:
+            Segundos de espera antes da nova tentativa
+        """
+        result = getattr(self._retry_scope, "result", None)
+        if result is not None:
+            result.retries += 1
+        return 0.0
+    
+    def _run_counting_retries(self, result: DownloadResult, func: Callable, *args):
+        """
+        Executa uma chamada ao yt-dlp atribuindo as novas tentativas ao item.
+        
+        Args:
+            result: Resultado do item em transferência
+            func: Chamada ao ``YoutubeDL``
+            *args: Argumentos da chamada
+            
+        Returns:
+            Retorno da chamada
+        """
+        self._retry_scope.result = result
+        
+        try:
+            return func(*args)
+        finally:
+            self._retry_scope.result = None
+    
+    def _shows_status_line(self) -> bool:
+        """
+        Verifica se o progresso é exibido na linha de status agregada.
+        
+        Returns:
+            True se habilitado e houver um renderizador configurado
+        """
+        return settings.PROGRESS_STATUS_LINE and self.progress_renderer is not None
+    
+    def _track_progress(self) -> ContextManager:
+        """
+        Obtém o contexto que agrega e exibe o progresso enquanto ativo.
+        
+        Returns:
+            ``ProgressAggregator`` ou um contexto vazio se desabilitado
+        """
+        if not self._shows_status_line():
+            return contextlib.nullcontext()
+        
+        return ProgressAggregator(
+            self.progress_bus,
+            self.progress_renderer,
+            interval=settings.PROGRESS_REFRESH_INTERVAL,
+            on_stop=logger.clear_status
+        )
+    
     def _check_existing_file(self, video_info: VideoInfo, download_type: DownloadType) -> Tuple[bool, Optional[str]]:
         """
         Verifica se já existe um arquivo com o mesmo título.
@@ -98,14 +348,11 @@ class YouTubeDownloader:
             Tupla (existe, nome_do_arquivo)
         """
         if download_type == DownloadType.AUDIO:
-            extensions = ['.mp3', '.m4a', '.webm', '.opus']
+            extensions = ['.mp3', '.m4a', '.webm', '.opus', '.ogg', '.flac', '.mka']
         else:
             extensions = ['.mp4', '.mkv', '.webm', '.avi']
         
-        return self.filename_utils.check_file_exists_with_extensions(
-            video_info.title, 
-            extensions
-        )
+        return self.directory_index.find(video_info.title, extensions)
     
     def download_single(self, url: str, download_type: DownloadType) -> DownloadResult:
         """
@@ -118,110 +365,632 @@ class YouTubeDownloader:
         Returns:
             Resultado do download
         """
+        item = self._probe_item(url, download_type)
+        
+        if item.result.status == DownloadStatus.PENDING:
+            with self._track_progress():
+                self._transfer_item(item)
+        
+        if item.result.status == DownloadStatus.PENDING:
+            self._transcode_item(item)
+        
+        self.metrics.record_result(item.result)
+        return item.result
+    
+    def _probe_item(self, url: str, download_type: DownloadType) -> ProbedItem:
+        """
+        Etapa de metadados: resolve o vídeo e decide se ele deve ser pulado.
+        
+        Consulta o diário de retomada, extrai os metadados (uma única vez) e
+        verifica se o arquivo já existe. Itens que não precisam de download
+        saem desta etapa com o resultado final; os demais ficam PENDING.
+        
+        Args:
+            url: URL do vídeo
+            download_type: Tipo de download
+            
+        Returns:
+            Item sondado, pronto para a etapa de transferência se PENDING
+        """
         result = DownloadResult(
             url=url,
             status=DownloadStatus.PENDING,
             download_type=download_type
         )
+        item = ProbedItem(
+            result=result,
+            journal_key=DownloadJournal.make_key(
+                self.url_validator.extract_video_id(url) or url, download_type
+            )
+        )
+        
+        # Retomada: itens concluídos no diário são pulados sem acesso à rede
+        if settings.RESUME_FROM_JOURNAL:
+            with time_stage(result.stage_timings, "probe"):
+                record = self.journal.get_completed(item.journal_key)
+            
+            if record is not None:
+                result.status = DownloadStatus.SKIPPED
+                result.title = record.get("title", "")
+                result.existing_file = record["output_path"]
+                result.output_path = record["output_path"]
+                return item
         
+        # Verifica disponibilidade (extração única, reaproveitada no download)
         try:
-            # Verifica disponibilidade
-            is_available, video_info = self.check_video_availability(url)
+            with time_stage(result.stage_timings, "probe"):
+                item.video_info, item.info_dict = self._probe_video(url)
+        except Exception as e:
+            logger.error(f"Vídeo indisponível: {url} - {str(e)}", item_id=item.journal_key, stage="probe")
+            result.status = DownloadStatus.FAILED
+            result.error_message = f"Vídeo indisponível: {str(e)}"
+            self.journal.record(item.journal_key, result)
+            return item
+        
+        result.title = item.video_info.title
+        
+        # Verifica se arquivo já existe
+        with time_stage(result.stage_timings, "existence_check"):
+            file_exists, existing_file = self._check_existing_file(item.video_info, download_type)
+        
+        if file_exists:
+            logger.warning(f"Arquivo já existe: {existing_file}", item_id=item.journal_key, stage="probe")
+            result.status = DownloadStatus.SKIPPED
+            result.existing_file = existing_file
+        
+        logger.debug(
+            f"Sondado: {result.title}",
+            item_id=item.journal_key, stage="probe", duration=result.stage_timings["probe"]
+        )
+        return item
+    
+    def _transfer_item(self, item: ProbedItem) -> DownloadResult:
+        """
+        Etapa de transferência: baixa um item já sondado.
+        
+        Args:
+            item: Item PENDING retornado por ``_probe_item``
             
-            if not is_available:
-                result.status = DownloadStatus.FAILED
-                result.error_message = "Vídeo indisponível"
-                return result
+        Returns:
+            Resultado do download (PENDING se ainda precisa de conversão)
+        """
+        result = item.result
+        
+        try:
+            logger.info(f"Baixando: {result.title}")
             
-            result.title = video_info.title
+            profile = self._get_profile(result.download_type)
             
-            # Verifica se arquivo já existe
-            file_exists, existing_file = self._check_existing_file(video_info, download_type)
+            with (
+                time_stage(result.stage_timings, "transfer"),
+                self.metrics.track_in_flight(),
+                self.download_meter.track(),
+                self.ydl_pool.checkout(profile) as ydl
+            ):
+                if item.info_dict is not None:
+                    downloaded_info = self._run_counting_retries(
+                        result, ydl.process_ie_result, item.info_dict, True
+                    )
+                else:
+                    # Metadados vieram do cache: a extração ocorre só agora
+                    downloaded_info = self._run_counting_retries(result, ydl.extract_info, result.url, True)
             
-            if file_exists:
-                logger.warning(f"Arquivo já existe: {existing_file}")
-                result.status = DownloadStatus.SKIPPED
-                result.existing_file = existing_file
-                return result
+            output_path = self._get_output_path(downloaded_info)
+            if not output_path:
+                raise RuntimeError("O yt-dlp não gerou o arquivo de saída")
             
-            # Realiza o download
-            logger.info(f"Baixando: {video_info.title}")
+            self._complete_transfer(item, output_path)
             
-            options = self._get_download_options(download_type)
+        except Exception as e:
+            self._fail_transfer(item, e)
+        
+        return result
+    
+    def _needs_transcode(self, download_type: DownloadType) -> bool:
+        """
+        Verifica se os downloads do tipo passam pela etapa de conversão.
+        
+        Args:
+            download_type: Tipo de download
+            
+        Returns:
+            True para áudio com a conversão desacoplada habilitada
+        """
+        return download_type == DownloadType.AUDIO and settings.DECOUPLED_TRANSCODE
+    
+    def _complete_transfer(self, item: ProbedItem, output_path: Optional[str]) -> None:
+        """
+        Encerra a etapa de transferência de um item baixado.
+        
+        Áudios que precisam de conversão permanecem PENDING, com
+        ``output_path`` apontando para o arquivo bruto; os demais são
+        finalizados.
+        
+        Args:
+            item: Item transferido
+            output_path: Caminho do arquivo baixado, se conhecido
+        """
+        result = item.result
+        
+        if output_path:
+            result.bytes_downloaded = FileManager.get_file_size(output_path)
+        self.download_meter.add(result.bytes_downloaded)
+        
+        logger.debug(
+            f"Transferido: {result.title}",
+            item_id=item.journal_key, stage="transfer",
+            duration=result.stage_timings.get("transfer"), bytes=result.bytes_downloaded, retries=result.retries
+        )
+        
+        if output_path and self._needs_transcode(result.download_type):
+            result.output_path = output_path
+            # A conversão só usa o arquivo: libera o info_dict enquanto o item aguarda
+            item.info_dict = None
+            return
+        
+        self._finish_transfer(item, output_path)
+    
+    def _transcode_item(self, item: ProbedItem) -> DownloadResult:
+        """
+        Etapa de conversão: converte o áudio bruto de um item transferido.
+        
+        Args:
+            item: Item PENDING retornado pela transferência
             
-            with youtube_dl.YoutubeDL(options) as ydl:
-                ydl.download([url])
+        Returns:
+            Resultado do download
+        """
+        result = item.result
+        
+        try:
+            logger.info(f"Convertendo: {result.title}")
             
-            result.status = DownloadStatus.SUCCESS
-            logger.success(f"Download concluído: {video_info.title}")
+            with time_stage(result.stage_timings, "postprocess"), self.transcode_meter.track():
+                output_path = self.transcoder.transcode(result.output_path)
+            
+            self.transcode_meter.add(result.bytes_downloaded)
+            logger.debug(
+                f"Convertido: {result.title}",
+                item_id=item.journal_key, stage="postprocess",
+                duration=result.stage_timings["postprocess"], bytes=result.bytes_downloaded
+            )
+            self._finish_transfer(item, output_path)
             
         except Exception as e:
-            result.status = DownloadStatus.FAILED
-            result.error_message = str(e)
-            logger.error(f"Erro no download: {str(e)}")
+            self._fail_transfer(item, e, stage="postprocess")
         
         return result
     
-    def download_batch(self, urls: List[str], download_type: DownloadType) -> BatchDownloadResult:
+    def _finish_transfer(self, item: ProbedItem, output_path: Optional[str]) -> None:
+        """
+        Conclui um item transferido com sucesso e o registra no diário.
+        
+        Compartilhado pelos motores de download (threads e asyncio) e pela
+        etapa de conversão.
+        
+        Args:
+            item: Item transferido
+            output_path: Caminho final do arquivo, se conhecido
+        """
+        result = item.result
+        result.output_path = output_path
+        
+        with time_stage(result.stage_timings, "finalize"):
+            if output_path:
+                self.directory_index.add(output_path)
+                # Áudios convertidos mantêm o tamanho baixado, não o do MP3
+                result.bytes_downloaded = result.bytes_downloaded or FileManager.get_file_size(output_path)
+                result.checksum = DownloadJournal.compute_checksum(output_path)
+            
+            result.status = DownloadStatus.SUCCESS
+            
+            # Libera o info_dict (formatos, URLs) assim que possível
+            item.info_dict = None
+            self.journal.record(item.journal_key, result)
+        
+        logger.success(
+            f"Download concluído: {result.title}",
+            item_id=item.journal_key, stage="done", bytes=result.bytes_downloaded
+        )
+    
+    def _fail_transfer(self, item: ProbedItem, error: Exception, stage: str = "transfer") -> None:
+        """
+        Marca um item como falho na transferência e o registra no diário.
+        
+        Args:
+            item: Item cuja transferência falhou
+            error: Exceção ocorrida
+            stage: Etapa em que a falha ocorreu
+        """
+        result = item.result
+        result.status = DownloadStatus.FAILED
+        result.error_message = str(error)
+        logger.error(f"Erro no download: {str(error)}", item_id=item.journal_key, stage=stage)
+        
+        item.info_dict = None
+        self.journal.record(item.journal_key, result)
+    
+    @staticmethod
+    def _get_output_path(info_dict: Optional[dict]) -> Optional[str]:
+        """
+        Obtém o caminho final do arquivo baixado (após pós-processamento).
+        
+        Args:
+            info_dict: Dicionário retornado pelo yt-dlp após o download
+            
+        Returns:
+            Caminho do arquivo ou None se não puder ser determinado
+        """
+        if not info_dict:
+            return None
+        
+        requested = info_dict.get('requested_downloads') or [{}]
+        return requested[0].get('filepath') or info_dict.get('filepath')
+    
+    def download_batch(self, urls: Iterable[str], download_type: DownloadType) -> BatchDownloadResult:
         """
         Baixa múltiplos vídeos/áudios em paralelo.
         
+        O motor é escolhido por ``settings.DOWNLOAD_ENGINE``: "threads" (pipeline
+        de sondagem e transferência em pools de threads) ou "asyncio" (busca
+        HTTP assíncrona por faixas, ver ``AsyncDownloadEngine``). Com
+        ``settings.PROCESS_SHARDS`` diferente de 1, o lote é dividido entre
+        processos (ver ``ShardedBatchRunner``), cada um usando esse motor.
+        
         Args:
-            urls: Lista de URLs
+            urls: URLs a baixar (lista ou gerador)
             download_type: Tipo de download
             
         Returns:
             Resultado do download em lote
         """
-        logger.info(f"Iniciando downloads em paralelo de {len(urls)} itens...")
-        logger.info(f"Máximo de {settings.MAX_PARALLEL_DOWNLOADS} downloads simultâneos.")
+        if isinstance(urls, Sized):
+            logger.info(f"Iniciando downloads em paralelo de {len(urls)} itens...")
+        else:
+            logger.info("Iniciando downloads em paralelo...")
         
-        results = []
+        self.download_meter = StageMeter("Download")
+        self.transcode_meter = StageMeter("Conversão")
+        self.refresh_option_profiles()
+        self._batch_started = time.monotonic()
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=settings.MAX_PARALLEL_DOWNLOADS) as executor:
-            # Submete todas as tarefas
-            future_to_url = {
-                executor.submit(self.download_single, url, download_type): url 
-                for url in urls
-            }
+        # Modo streaming: resultados vão para o disco e só os contadores ficam em memória
+        results_path = None
+        if settings.STREAM_RESULTS and self.result_listener is None:
+            results_path = os.path.join(paths.DOWNLOAD_DIR, paths.RESULTS_FILENAME)
+        self._batch_results = BatchResultSink(results_path, forward=self.result_listener)
+        
+        try:
+            shards = get_shard_count()
+            if shards > 1:
+                # Os processos dividem o diário e não o compactam; o pai o faz antes
+                self.journal.load()
+                cache_stats, stage_stats = ShardedBatchRunner(shards).run(
+                    urls, download_type, self._record_result,
+                    on_cache_stats=self.metrics.merge_cache_stats,
+                    drain_requested=self._drain_requested
+                )
+                return self._build_batch_result(cache_stats=cache_stats, stage_stats=stage_stats)
+            
+            if settings.DOWNLOAD_ENGINE == "asyncio":
+                if AsyncDownloadEngine.is_available():
+                    with self._track_progress():
+                        AsyncDownloadEngine(self).run(urls, download_type)
+                    return self._build_batch_result()
+                
+                logger.warning("Motor asyncio indisponível (instale 'aiohttp'); usando threads.")
+            
+            return self._run_threaded_pipeline(urls, download_type)
+        finally:
+            # Limpo só ao fim: um pedido feito antes do início (ex.: SIGTERM
+            # durante a expansão das playlists) também encerra este lote
+            self._drain_requested.clear()
+            self._batch_results.close()
+    
+    def _run_threaded_pipeline(self, urls: Iterable[str], download_type: DownloadType) -> BatchDownloadResult:
+        """
+        Executa o lote com pools de threads, em duas etapas.
+        
+        Um pool largo de sondagem (``PROBE_WORKERS``) resolve metadados e
+        decisões de pular, à frente de um pool de transferência cujo número de
+        downloads ativos é ajustado pelo ``AdaptiveConcurrencyController``. As
+        etapas são ligadas por uma fila limitada (``PROBE_QUEUE_SIZE``): o
+        iterável de URLs só é avançado quando há espaço nela, o que aplica
+        backpressure a geradores de playlist e mantém o link ocupado enquanto
+        as sondagens dos próximos itens correm à frente. O iterável é lido em
+        uma thread própria (``ReadAhead``): a busca da próxima página de uma
+        playlist não impede o laço de coletar e iniciar transferências.
+        Áudios baixados seguem para um terceiro pool, de conversão
+        (``TRANSCODE_WORKERS``), liberando a vaga de download antes da
+        codificação. A fila de conversão é limitada a
+        ``TRANSCODE_QUEUE_FACTOR`` itens por worker: quando está cheia, novas
+        transferências esperam, em vez de acumular áudios brutos no disco.
+        
+        Cada etapa é uma ``SlidingWindowScheduler``: só existem futures para
+        os itens dentro das janelas, qualquer que seja o tamanho do lote. Com
+        ``drain_batch`` os itens já iniciados terminam e nenhum outro é
+        puxado; com Ctrl+C as tarefas que ainda não começaram são canceladas.
+        
+        Args:
+            urls: URLs a baixar (lista ou gerador)
+            download_type: Tipo de download
+            
+        Returns:
+            Resultado do download em lote
+        """
+        controller = AdaptiveConcurrencyController()
+        
+        logger.info(
+            f"Downloads simultâneos: {controller.limit} "
+            f"(mínimo {controller.floor}, máximo {controller.ceiling}); "
+            f"{settings.PROBE_WORKERS} sondagens simultâneas."
+        )
+        
+        ready = collections.deque()
+        reader = ReadAhead(urls, settings.PROBE_QUEUE_SIZE)
+        
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=settings.PROBE_WORKERS
+        ) as probe_executor, concurrent.futures.ThreadPoolExecutor(
+            max_workers=controller.ceiling
+        ) as transfer_executor, concurrent.futures.ThreadPoolExecutor(
+            max_workers=get_transcode_workers()
+        ) as transcode_executor, self._track_progress():
+            probes = SlidingWindowScheduler(
+                lambda url: probe_executor.submit(self._probe_item, url, download_type),
+                settings.PROBE_QUEUE_SIZE,
+                source=reader
+            )
+            transfers = SlidingWindowScheduler(
+                lambda item: transfer_executor.submit(self._transfer_item, item)
+            )
+            transcodes = SlidingWindowScheduler(
+                lambda item: transcode_executor.submit(self._transcode_item, item),
+                max(1, settings.TRANSCODE_QUEUE_FACTOR * get_transcode_workers())
+            )
             
-            # Processa resultados conforme completam
-            for future in concurrent.futures.as_completed(future_to_url):
-                try:
-                    result = future.result()
-                    results.append(result)
+            try:
+                while True:
+                    if self._drain_requested.is_set() and not probes.exhausted:
+                        probes.drain()
+                        logger.warning("Encerrando o lote: aguardando os itens em andamento...")
+                    
+                    # Etapa 1: sondagens à frente, limitadas pela fila
+                    probes.fill(reserved=len(ready))
+                    
+                    # Etapa 2: transferências até o limite atual do controlador,
+                    # enquanto houver vaga na fila de conversão
+                    transfers.window = controller.limit
+                    while ready and transfers.has_room() and transcodes.has_room():
+                        transfers.submit(ready.popleft())
                     
-                    if result.is_success:
-                        logger.success(f"Download concluído: {result.title}")
-                    elif result.is_skipped:
-                        logger.warning(f"Download pulado: {result.title}")
-                    else:
-                        logger.error(f"Download falhou: {result.url}")
-                        
-                except Exception as e:
-                    url = future_to_url[future]
-                    error_result = DownloadResult(
-                        url=url,
-                        status=DownloadStatus.FAILED,
-                        download_type=download_type,
-                        error_message=str(e)
+                    if not probes and not transfers and not transcodes and probes.exhausted:
+                        break
+                    
+                    # Acorda também quando a origem entregar a próxima URL
+                    waiting = [*probes, *transfers, *transcodes]
+                    source_ready = probes.source_ready(reserved=len(ready))
+                    if source_ready is not None:
+                        waiting.append(source_ready)
+                    
+                    done, _ = concurrent.futures.wait(
+                        waiting, return_when=concurrent.futures.FIRST_COMPLETED
                     )
-                    results.append(error_result)
-                    logger.error(f"Erro no processamento de {url}: {str(e)}")
+                    
+                    for future in done:
+                        if future is source_ready:
+                            continue
+                        if future in probes:
+                            url = probes.pop(future)
+                            item = self._collect_probe(future, url, download_type)
+                            
+                            if item.result.status == DownloadStatus.PENDING:
+                                ready.append(item)
+                                continue
+                            
+                            result = self._collect_result(item.result)
+                            
+                            # Vídeos indisponíveis não indicam congestionamento; só HTTP 429
+                            if controller.is_throttled(result):
+                                controller.record(result)
+                        elif future in transfers:
+                            item = transfers.pop(future)
+                            result = self._get_future_result(future, item.result.url, download_type)
+                            controller.record(result)
+                            
+                            # Etapa 3: áudio bruto segue para a conversão (transferências
+                            # já em andamento podem ultrapassar a janela)
+                            if result.status == DownloadStatus.PENDING:
+                                transcodes.submit(item)
+                                continue
+                            
+                            result = self._collect_result(result)
+                        else:
+                            item = transcodes.pop(future)
+                            self._collect_result(self._get_future_result(future, item.result.url, download_type))
+            except KeyboardInterrupt:
+                # Só as tarefas já iniciadas seguem até o fim ao sair dos executores
+                ready.clear()
+                cancelled = sum(len(window.cancel()) for window in (probes, transfers, transcodes))
+                logger.warning(
+                    f"Lote interrompido: {cancelled} tarefas canceladas; "
+                    f"aguardando {len(probes) + len(transfers) + len(transcodes)} em andamento..."
+                )
+                raise
+            finally:
+                reader.close()
+        
+        batch_result = self._build_batch_result(controller.get_curve())
+        logger.info(f"Curva de concorrência: {controller.format_curve()}")
+        
+        return batch_result
+    
+    def _build_batch_result(
+        self,
+        concurrency_curve: Optional[List[Tuple[float, int, float]]] = None,
+        cache_stats: Optional[Dict[str, int]] = None,
+        stage_stats: Optional[Dict[str, Dict[str, float]]] = None
+    ) -> BatchDownloadResult:
+        """
+        Consolida os resultados coletados no lote e registra o resumo.
         
-        # Calcula estatísticas
-        successful = sum(1 for r in results if r.is_success)
-        failed = sum(1 for r in results if r.is_failed)
-        skipped = sum(1 for r in results if r.is_skipped)
+        Args:
+            concurrency_curve: Evolução do limite de concorrência, se houver
+            cache_stats: Estatísticas do cache (padrão: as deste processo)
+            stage_stats: Vazão por etapa (padrão: a medida neste processo)
+            
+        Returns:
+            Resultado do download em lote
+        """
+        sink = self._batch_results
+        sink.close()
+        
+        if stage_stats is None:
+            stage_stats = {
+                meter.name: meter.get_stats()
+                for meter in (self.download_meter, self.transcode_meter)
+            }
         
         batch_result = BatchDownloadResult(
-            total_downloads=len(results),
-            successful=successful,
-            failed=failed,
-            skipped=skipped,
-            download_results=results
+            total_downloads=sink.total,
+            successful=sink.successful,
+            failed=sink.failed,
+            skipped=sink.skipped,
+            download_results=sink.results,
+            concurrency_curve=concurrency_curve or [],
+            stage_stats=stage_stats,
+            elapsed_seconds=time.monotonic() - self._batch_started,
+            bytes_downloaded=sink.bytes_downloaded,
+            retries=sink.retries,
+            results_path=sink.path
+        )
+        
+        logger.info(
+            f"Downloads finalizados. Sucesso: {sink.successful}, Falhas: {sink.failed}, "
+            f"Pulados: {sink.skipped}"
         )
+        if sink.path is not None:
+            logger.info(f"Resultados gravados em: {sink.path}")
+        logger.info(
+            f"Lote: {batch_result.bytes_downloaded / 1_000_000:.1f} MB em "
+            f"{batch_result.elapsed_seconds:.1f}s ({batch_result.throughput:.1f} MB/s)",
+            stage="batch", duration=batch_result.elapsed_seconds, bytes=batch_result.bytes_downloaded
+        )
+        
+        for name, stats in stage_stats.items():
+            if stats["items"]:
+                logger.info(StageMeter.format_stats(name, stats))
         
-        logger.info(f"Downloads finalizados. Sucesso: {successful}, Falhas: {failed}, Pulados: {skipped}")
+        if cache_stats is None:
+            cache_stats = self.metadata_cache.get_stats()
+        logger.info(
+            f"Cache de metadados: {cache_stats.get('hits', 0)} acertos, "
+            f"{cache_stats.get('misses', 0)} falhas, {cache_stats.get('evictions', 0)} removidos."
+        )
         
         return batch_result
+    
+    def _collect_probe(
+        self,
+        future: concurrent.futures.Future,
+        url: str,
+        download_type: DownloadType
+    ) -> ProbedItem:
+        """
+        Obtém o item de uma sondagem concluída.
+        
+        Args:
+            future: Tarefa de sondagem concluída
+            url: URL associada à tarefa
+            download_type: Tipo de download
+            
+        Returns:
+            Item sondado (com resultado FAILED se a tarefa lançou exceção)
+        """
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Erro no processamento de {url}: {str(e)}")
+            return ProbedItem(
+                result=DownloadResult(
+                    url=url,
+                    status=DownloadStatus.FAILED,
+                    download_type=download_type,
+                    error_message=str(e)
+                ),
+                journal_key=""
+            )
+    
+    @staticmethod
+    def _get_future_result(
+        future: concurrent.futures.Future,
+        url: str,
+        download_type: DownloadType
+    ) -> DownloadResult:
+        """
+        Obtém o resultado de uma transferência concluída.
+        
+        Args:
+            future: Tarefa de transferência concluída
+            url: URL associada à tarefa
+            download_type: Tipo de download
+            
+        Returns:
+            Resultado do download (FAILED se a tarefa lançou exceção)
+        """
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Erro no processamento de {url}: {str(e)}")
+            return DownloadResult(
+                url=url,
+                status=DownloadStatus.FAILED,
+                download_type=download_type,
+                error_message=str(e)
+            )
+    
+    def _collect_result(self, result: DownloadResult) -> DownloadResult:
+        """
+        Registra o desfecho de um item finalizado.
+        
+        Args:
+            result: Resultado do download
+            
+        Returns:
+            O próprio resultado
+        """
+        self.progress_bus.publish(ITEM_DONE)
+        self._record_result(result)
+        
+        if result.is_success:
+            logger.success(f"Download concluído: {result.title}")
+        elif result.is_skipped:
+            logger.warning(f"Download pulado: {result.title}")
+        else:
+            logger.error(f"Download falhou: {result.url}")
+        
+        return result
+    
+    def drain_batch(self) -> None:
+        """
+        Encerra o lote em andamento sem interromper os itens já iniciados.
+        
+        Pode ser chamado de outra thread; nenhuma URL nova é puxada e
+        ``download_batch`` retorna quando os itens em andamento terminam.
+        """
+        self._drain_requested.set()
+    
+    def _record_result(self, result: DownloadResult) -> None:
+        """
+        Contabiliza um item finalizado nas métricas e nos resultados do lote.
+        
+        Args:
+            result: Resultado do download
+        """
+        self.metrics.record_result(result)
+        self._batch_results.add(result)
+    
+    def close(self) -> None:
+        """Libera as instâncias do yt-dlp e o cache de metadados."""
+        self.ydl_pool.close()
+        self.metadata_cache.close()
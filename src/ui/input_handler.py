@@ -21,6 +21,7 @@ class InputHandler:
             URL válida do YouTube
         """
         while True:
+            logger.flush()
             url = input(f"Digite o link do YouTube: ").strip()
             
             if self.input_validator.is_empty_string(url):
@@ -46,6 +47,7 @@ class InputHandler:
         empty_line_count = 0
         
         while True:
+            logger.flush()
             line = input(f"Link {len(urls) + 1} (ou Enter para concluir): ").strip()
             
             if self.input_validator.is_empty_string(line):
@@ -79,6 +81,7 @@ class InputHandler:
             Escolha válida do usuário
         """
         while True:
+            logger.flush()
             choice = input(prompt).strip()
             
             if self.input_validator.is_valid_choice(choice, valid_choices):
@@ -4,6 +4,7 @@ from typing import List
 
 from ..models.download_result import BatchDownloadResult, DownloadResult
 from ..utils.logger import logger
+from ..utils.stage_meter import STAGE_LABELS, format_stage_timings
 from ..config.settings import paths
 
 
@@ -14,7 +15,7 @@ class MenuDisplay:
         """Exibe o cabeçalho de boas-vindas."""
         logger.header("YouTube Downloader v3.0", 50)
         logger.info("Baixe vídeos e áudios do YouTube!")
-        print()
+        logger.plain("")
     
     def show_main_menu(self) -> None:
         """Exibe o menu principal."""
@@ -74,12 +75,40 @@ class MenuDisplay:
         success_rate = result.success_rate * 100
         logger.info(f"Taxa de sucesso: {success_rate:.1f}%")
         
+        self.show_performance_summary(result)
+        
         if result.failed > 0:
             logger.warning("\nVídeos que falharam:")
             for i, failed_result in enumerate(result.get_failed_results(), 1):
                 logger.error(f"  {i}. {failed_result.title or failed_result.url}")
                 logger.error(f"     Erro: {failed_result.error_message}")
     
+    def show_performance_summary(self, result: BatchDownloadResult) -> None:
+        """
+        Exibe a vazão do lote e os percentis de tempo de cada etapa.
+        
+        Args:
+            result: Resultado do download em lote
+        """
+        stages = result.get_stage_percentiles()
+        if not stages:
+            return
+        
+        logger.info("\nDESEMPENHO")
+        logger.info(
+            f"Vazão: {result.bytes_downloaded / 1_000_000:.1f} MB em "
+            f"{result.elapsed_seconds:.1f}s ({result.throughput:.1f} MB/s)"
+        )
+        
+        if result.retries:
+            logger.warning(f"Novas tentativas: {result.retries}")
+        
+        for stage, stats in stages.items():
+            logger.info(
+                f"  {STAGE_LABELS.get(stage, stage)}: p50 {stats['p50']:.2f}s | "
+                f"p95 {stats['p95']:.2f}s | p99 {stats['p99']:.2f}s ({stats['count']} itens)"
+            )
+    
     def show_failed_downloads_report(self, failed_results: List[DownloadResult]) -> None:
         """
         Exibe relatório detalhado de downloads com falha.
@@ -102,6 +131,8 @@ class MenuDisplay:
             logger.error(f"URL: {failure.url}")
             logger.error(f"Título: {failure.title or 'Não disponível'}")
             logger.error(f"Motivo: {failure.error_message}")
+            logger.error(f"Etapas: {format_stage_timings(failure.stage_timings)}")
+            logger.error(f"Novas tentativas: {failure.retries}")
             logger.separator("─", 40)
     
     def show_progress_info(self, current: int, total: int, title: str = "") -> None:
@@ -119,6 +150,15 @@ class MenuDisplay:
         if title:
             logger.info(f"Processando: {title}")
     
+    def show_status_line(self, status: str) -> None:
+        """
+        Exibe a linha de status dos downloads em andamento.
+        
+        Args:
+            status: Texto já formatado pelo agregador de progresso
+        """
+        logger.status(status)
+    
     def show_playlist_info(self, title: str, video_count: int) -> None:
         """
         Exibe informações sobre uma playlist.
@@ -1,10 +1,15 @@
 """Utilitários para manipulação de arquivos."""
 
+import json
 import os
 import re
-from typing import Tuple, List, Optional
+import threading
+from typing import Dict, Tuple, List, Optional
 import os
 
+from ..config.settings import paths
+from .stage_meter import format_stage_timings
+
 
 class FileManager:
     """Gerenciador de arquivos e diretórios."""
@@ -76,36 +81,85 @@ class FilenameUtils:
         filename = filename.strip()
         
         return filename
+
+
+class DirectoryIndex:
+    """
+    Índice em memória dos arquivos de um diretório, por nome sanitizado.
     
-    @classmethod
-    def check_file_exists_with_extensions(
-        cls, 
-        base_filename: str, 
-        extensions: List[str], 
-        directory: str = "./downloads"
-    ) -> Tuple[bool, Optional[str]]:
-        """
-        Verifica se existe um arquivo com o nome base e uma das extensões fornecidas.
+    O diretório é percorrido uma única vez (``os.scandir``) na primeira
+    consulta; a partir daí, as verificações de existência são consultas em
+    dicionário e novos arquivos são registrados com ``add`` ao final de cada
+    download, sem novas chamadas ao sistema de arquivos.
+    """
+    
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or paths.DOWNLOAD_DIR
+        self._index: Optional[Dict[str, Dict[str, str]]] = None
+        self._lock = threading.Lock()
+    
+    def _ensure_built(self) -> Dict[str, Dict[str, str]]:
+        """
+        Constrói o índice na primeira utilização.
+        
+        Returns:
+            Dicionário nome_sanitizado -> {extensão: nome_do_arquivo}
+        """
+        if self._index is None:
+            index: Dict[str, Dict[str, str]] = {}
+            
+            try:
+                with os.scandir(self.directory) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            self._insert(index, entry.name)
+            except FileNotFoundError:
+                pass
+            
+            self._index = index
+        
+        return self._index
+    
+    @staticmethod
+    def _insert(index: Dict[str, Dict[str, str]], filename: str) -> None:
+        """
+        Insere um nome de arquivo no índice.
+        
+        Args:
+            index: Índice a atualizar
+            filename: Nome do arquivo (sem diretório)
+        """
+        stem, ext = os.path.splitext(filename)
+        index.setdefault(FilenameUtils.sanitize_filename(stem), {})[ext] = filename
+    
+    def add(self, file_path: str) -> None:
+        """
+        Registra um arquivo recém-criado no índice.
+        
+        Args:
+            file_path: Caminho do arquivo
+        """
+        with self._lock:
+            self._insert(self._ensure_built(), os.path.basename(file_path))
+    
+    def find(self, base_filename: str, extensions: List[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Procura um arquivo com o nome base e uma das extensões fornecidas.
         
         Args:
             base_filename: Nome base do arquivo (sem extensão)
-            extensions: Lista de extensões para verificar
-            directory: Diretório onde procurar (padrão: diretório de downloads)
+            extensions: Extensões aceitas, em ordem de preferência
             
         Returns:
-            Tupla (existe, nome_do_arquivo) onde existe é booleano e nome_do_arquivo
-            é o nome completo do arquivo encontrado ou None        """
-        if directory is None:
-            directory = "./downloads"
-            
-        sanitized_filename = cls.sanitize_filename(base_filename)
+            Tupla (existe, nome_do_arquivo)
+        """
+        with self._lock:
+            candidates = self._ensure_built().get(FilenameUtils.sanitize_filename(base_filename))
         
-        for ext in extensions:
-            full_filename = f"{sanitized_filename}{ext}"
-            full_path = os.path.join(directory, full_filename)
-            
-            if os.path.exists(full_path):
-                return True, full_filename
+        if candidates:
+            for ext in extensions:
+                if ext in candidates:
+                    return True, candidates[ext]
         
         return False, None
 
@@ -135,9 +189,33 @@ class ReportGenerator:
                     f.write(f"URL: {failure.url}\n")
                     f.write(f"Título: {failure.title}\n")
                     f.write(f"Erro: {failure.error_message}\n")
+                    
+                    f.write(f"Etapas: {format_stage_timings(failure.stage_timings)}\n")
+                    f.write(f"Novas tentativas: {failure.retries}\n")
                     f.write("-" * 40 + "\n\n")
             
             return True
             
         except Exception:
             return False
+    
+    @staticmethod
+    def save_performance_report(report: dict, output_path: str) -> bool:
+        """
+        Salva o relatório de desempenho de um lote em JSON.
+        
+        Args:
+            report: Relatório de ``BatchDownloadResult.get_performance_report``
+            output_path: Caminho onde salvar o relatório
+            
+        Returns:
+            True se o relatório foi salvo com sucesso, False caso contrário
+        """
+        try:
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            
+            return True
+            
+        except Exception:
+            return False
@@ -1,48 +1,289 @@
 """Logger personalizado para o YouTube Downloader."""
 
-from typing import Any
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, TextIO
 from colorama import Fore
 
+from ..config.settings import paths, settings
+
+
+# Níveis aceitos em ``settings.LOG_LEVEL``
+LEVELS = {"DEBUG": 10, "INFO": 20, "SUCCESS": 25, "WARNING": 30, "ERROR": 40}
+
+# Tipos de registro da fila do escritor
+_LINE = "line"
+_STATUS = "status"
+_CLEAR_STATUS = "clear_status"
+_FLUSH = "flush"
+
+
+class _LogWriter:
+    """
+    Thread única que escreve no console e no arquivo JSON-lines.
+    
+    As threads de download apenas enfileiram tuplas em uma
+    ``queue.SimpleQueue``; a formatação final e as escritas acontecem aqui,
+    em lotes de até ``BATCH_SIZE`` registros com um único ``write`` e
+    ``flush`` por lote. Assim as linhas nunca se intercalam e o stdout deixa
+    de ser um ponto de serialização das threads de trabalho.
+    """
+    
+    BATCH_SIZE = 512
+    
+    # Sequência ANSI: volta ao início da linha e apaga até o fim
+    CLEAR_LINE = "\r\x1b[K"
+    
+    def __init__(self):
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._status_visible = False
+        self._json_path: Optional[str] = None
+        self._json_file: Optional[TextIO] = None
+    
+    def submit(self, record: tuple) -> None:
+        """
+        Enfileira um registro, iniciando a thread na primeira chamada.
+        
+        Args:
+            record: Tupla (tipo, nível, texto, campos, instante)
+        """
+        if self._thread is None:
+            self._start()
+        self._queue.put(record)
+    
+    def flush(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Aguarda a escrita de tudo o que já foi enfileirado.
+        
+        Args:
+            timeout: Espera máxima em segundos
+        """
+        if self._thread is None:
+            return
+        
+        written = threading.Event()
+        self._queue.put((_FLUSH, None, written, None, None))
+        written.wait(timeout)
+    
+    def reset_after_fork(self) -> None:
+        """Descarta o estado herdado: a thread não existe no processo filho."""
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._json_path = None
+        self._json_file = None
+    
+    def _start(self) -> None:
+        """Inicia a thread de escrita uma única vez."""
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                thread.start()
+                self._thread = thread
+                atexit.register(self.flush)
+    
+    def _run(self) -> None:
+        """Laço da thread: agrupa os registros pendentes e os escreve."""
+        while True:
+            batch = [self._queue.get()]
+            
+            try:
+                while len(batch) < self.BATCH_SIZE:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            
+            try:
+                self._write_batch(batch)
+            except Exception:
+                # O log nunca deve derrubar a aplicação
+                pass
+            finally:
+                for kind, _, written, _, _ in batch:
+                    if kind == _FLUSH:
+                        written.set()
+    
+    def _write_batch(self, batch: List[tuple]) -> None:
+        """
+        Escreve um lote de registros.
+        
+        Args:
+            batch: Registros na ordem de publicação
+        """
+        stdout = sys.stdout
+        is_terminal = stdout.isatty()
+        console: List[str] = []
+        json_lines: List[str] = []
+        
+        for kind, level, text, fields, timestamp in batch:
+            if kind == _LINE:
+                if level is None or LEVELS[level] >= LEVELS.get(settings.LOG_LEVEL, 20):
+                    if self._status_visible:
+                        console.append(self.CLEAR_LINE)
+                        self._status_visible = False
+                    console.append(text[0] + text[1] + text[2] + "\n")
+                
+                if level is not None and paths.LOG_JSON_PATH:
+                    json_lines.append(self._to_json(level, text[1], fields, timestamp))
+            
+            elif kind == _STATUS and is_terminal:
+                console.append(self.CLEAR_LINE + text)
+                self._status_visible = True
+            
+            elif kind == _CLEAR_STATUS and self._status_visible:
+                console.append(self.CLEAR_LINE)
+                self._status_visible = False
+        
+        if console:
+            stdout.write("".join(console))
+            stdout.flush()
+        
+        if json_lines:
+            json_file = self._get_json_file()
+            json_file.write("".join(json_lines))
+            json_file.flush()
+    
+    @staticmethod
+    def _to_json(level: str, message: str, fields: Optional[Dict[str, Any]], timestamp: float) -> str:
+        """
+        Serializa um evento para o arquivo JSON-lines.
+        
+        Args:
+            level: Nível do evento
+            message: Mensagem sem cores
+            fields: Campos estruturados (item_id, stage, duration, bytes...)
+            timestamp: Instante do evento (``time.time``)
+        
+        Returns:
+            Linha JSON terminada em quebra de linha
+        """
+        event = {"ts": round(timestamp, 6), "level": level.lower(), "message": message}
+        if fields:
+            event.update(fields)
+        return json.dumps(event, ensure_ascii=False, default=str) + "\n"
+    
+    def _get_json_file(self) -> TextIO:
+        """
+        Obtém o arquivo JSON-lines, reabrindo-o se o caminho mudou.
+        
+        Returns:
+            Arquivo aberto para acréscimo
+        """
+        if self._json_path != paths.LOG_JSON_PATH:
+            if self._json_file is not None:
+                self._json_file.close()
+            
+            directory = os.path.dirname(paths.LOG_JSON_PATH)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            self._json_file = open(paths.LOG_JSON_PATH, "a", encoding="utf-8")
+            self._json_path = paths.LOG_JSON_PATH
+        
+        return self._json_file
+
+
+_writer = _LogWriter()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_writer.reset_after_fork)
+
 
 class Logger:
-    """Logger personalizado com cores."""
+    """
+    Logger personalizado com cores.
+    
+    As chamadas apenas enfileiram o evento; a escrita é feita pela thread
+    de ``_LogWriter``. Os métodos aceitam campos estruturados (``item_id``,
+    ``stage``, ``duration``, ``bytes``), gravados no arquivo JSON-lines
+    configurado em ``paths.LOG_JSON_PATH``.
+    """
     
     # Cores definidas diretamente
     SUCCESS = Fore.GREEN
     ERROR = Fore.LIGHTRED_EX
     INFO = Fore.CYAN
     WARNING = Fore.YELLOW
+    DEBUG = Fore.LIGHTBLACK_EX
     RESET = Fore.RESET
     
     @classmethod
-    def success(cls, message: str) -> None:
+    def _log(cls, level: Optional[str], color: str, message: str, fields: Dict[str, Any]) -> None:
+        """
+        Enfileira uma linha, descartando-a se nenhum destino a aceitar.
+        
+        Args:
+            level: Nível do evento (None para linhas só de console)
+            color: Cor da linha no console
+            message: Mensagem
+            fields: Campos estruturados do evento
+        """
+        if (
+            level is not None
+            and LEVELS[level] < LEVELS.get(settings.LOG_LEVEL, 20)
+            and not paths.LOG_JSON_PATH
+        ):
+            return
+        
+        reset = cls.RESET if color else ""
+        _writer.submit((_LINE, level, (color, message, reset), fields, time.time()))
+    
+    @classmethod
+    def debug(cls, message: str, **fields: Any) -> None:
+        """Registra mensagem de diagnóstico."""
+        cls._log("DEBUG", cls.DEBUG, message, fields)
+    
+    @classmethod
+    def success(cls, message: str, **fields: Any) -> None:
         """Imprime mensagem de sucesso."""
-        print(f"{cls.SUCCESS}{message}{cls.RESET}")
+        cls._log("SUCCESS", cls.SUCCESS, message, fields)
     
     @classmethod
-    def error(cls, message: str) -> None:
+    def error(cls, message: str, **fields: Any) -> None:
         """Imprime mensagem de erro."""
-        print(f"{cls.ERROR}{message}{cls.RESET}")
+        cls._log("ERROR", cls.ERROR, message, fields)
     
     @classmethod
-    def info(cls, message: str) -> None:
+    def info(cls, message: str, **fields: Any) -> None:
         """Imprime mensagem informativa."""
-        print(f"{cls.INFO}{message}{cls.RESET}")
+        cls._log("INFO", cls.INFO, message, fields)
     
     @classmethod
-    def warning(cls, message: str) -> None:
+    def warning(cls, message: str, **fields: Any) -> None:
         """Imprime mensagem de aviso."""
-        print(f"{cls.WARNING}{message}{cls.RESET}")
+        cls._log("WARNING", cls.WARNING, message, fields)
     
     @classmethod
-    def plain(cls, message: str) -> None:
+    def plain(cls, message: str, **fields: Any) -> None:
         """Imprime mensagem sem cor."""
-        print(message)
+        cls._log("INFO", "", message, fields)
+    
+    @classmethod
+    def status(cls, message: str) -> None:
+        """Reescreve a linha de status, sem quebra de linha (apenas em terminais)."""
+        _writer.submit((_STATUS, None, f"{cls.INFO}{message}{cls.RESET}", None, None))
+    
+    @classmethod
+    def clear_status(cls) -> None:
+        """Apaga a linha de status."""
+        _writer.submit((_CLEAR_STATUS, None, None, None, None))
+    
+    @classmethod
+    def flush(cls) -> None:
+        """Aguarda a escrita das mensagens pendentes (ex.: antes de um ``input``)."""
+        _writer.flush()
     
     @classmethod
     def separator(cls, char: str = "─", length: int = 40) -> None:
         """Imprime uma linha separadora."""
-        print(f"{cls.INFO}{char * length}{cls.RESET}")
+        cls._log(None, cls.INFO, char * length, {})
     
     @classmethod
     def header(cls, title: str, width: int = 50) -> None:
@@ -50,9 +291,7 @@ class Logger:
         border = "═" * width
         padding = " " * ((width - len(title) - 2) // 2)
         
-        print(f"{cls.SUCCESS}╔{border}╗")
-        print(f"{cls.SUCCESS}║{padding}{title}{padding}║")
-        print(f"{cls.SUCCESS}╚{border}╝{cls.RESET}")
+        cls._log(None, cls.SUCCESS, f"╔{border}╗\n║{padding}{title}{padding}║\n╚{border}╝", {})
     
     @classmethod
     def box(cls, lines: list[str], width: int = 40) -> None:
@@ -60,13 +299,14 @@ class Logger:
         border_top = "╔" + "═" * width + "╗"
         border_bottom = "╚" + "═" * width + "╝"
         
-        print(f"{cls.INFO}{border_top}")
+        rows = [border_top]
         
         for line in lines:
             padding = " " * (width - len(line))
-            print(f"{cls.INFO}║ {line}{padding}║")
+            rows.append(f"║ {line}{padding}║")
         
-        print(f"{cls.INFO}{border_bottom}{cls.RESET}")
+        rows.append(border_bottom)
+        cls._log(None, cls.INFO, "\n".join(rows), {})
 
 
 # Instância global do logger
@@ -0,0 +1,178 @@
+"""Leitura antecipada e limitada de iteráveis."""
+
+import concurrent.futures
+import queue
+import threading
+from typing import Generic, Iterable, List, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+# Marca o fim do iterável de origem
+END = object()
+
+# Retornado por ``poll`` quando nenhum item foi lido ainda
+EMPTY = object()
+
+
+class ReadAhead(Generic[T]):
+    """
+    Consome um iterável em uma thread, mantendo até ``size`` itens à frente.
+    
+    Permite olhar os próximos itens já disponíveis sem bloquear: uma entrada
+    padrão alimentada aos poucos por um agendador não precisa chegar ao fim
+    (nem a ``size`` linhas) para que o consumidor avance. A memória ocupada
+    é limitada por ``size``, qualquer que seja o tamanho da origem.
+    
+    Quem espera por outras tarefas ao mesmo tempo (futures de um executor)
+    pode incluir ``when_ready`` na espera para acordar quando um item chegar.
+    """
+    
+    POLL_INTERVAL = 0.1
+    
+    def __init__(self, iterable: Iterable[T], size: int):
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, size))
+        self._stop = threading.Event()
+        self._waiter: Optional[concurrent.futures.Future] = None
+        self._waiter_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, args=(iterable,), name="read-ahead", daemon=True
+        )
+        self._thread.start()
+    
+    def _run(self, iterable: Iterable[T]) -> None:
+        """
+        Laço da thread: lê a origem e enfileira os itens (ou o erro).
+        
+        Args:
+            iterable: Origem dos itens
+        """
+        try:
+            for item in iterable:
+                if not self._put(item):
+                    return
+        except Exception as e:
+            self._put(e)
+            return
+        
+        self._put(END)
+    
+    def _put(self, item: object) -> bool:
+        """
+        Enfileira um item, desistindo se o consumidor tiver encerrado.
+        
+        Args:
+            item: Item, exceção da origem ou ``END``
+        
+        Returns:
+            False se a leitura foi encerrada com ``close``
+        """
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=self.POLL_INTERVAL)
+            except queue.Full:
+                continue
+            
+            with self._waiter_lock:
+                if self._waiter is not None:
+                    self._waiter.set_result(None)
+                    self._waiter = None
+            return True
+        
+        return False
+    
+    def get(self) -> object:
+        """
+        Obtém o próximo item, esperando por ele.
+        
+        Returns:
+            Próximo item ou ``END`` ao fim da origem
+        
+        Raises:
+            Exception: Erro lançado pela origem durante a leitura
+        """
+        item = self._queue.get()
+        return self._unwrap(item)
+    
+    def poll(self) -> object:
+        """
+        Obtém o próximo item sem esperar.
+        
+        Returns:
+            Próximo item, ``END`` ao fim da origem ou ``EMPTY`` se nenhum
+            item foi lido ainda
+        
+        Raises:
+            Exception: Erro lançado pela origem durante a leitura
+        """
+        try:
+            item = self._queue.get_nowait()
+        except queue.Empty:
+            return EMPTY
+        
+        return self._unwrap(item)
+    
+    def when_ready(self) -> concurrent.futures.Future:
+        """
+        Obtém uma future concluída quando houver um item a ler.
+        
+        Returns:
+            Future já concluída se a fila tiver itens; senão, concluída na
+            próxima chegada (item, erro ou ``END``)
+        """
+        with self._waiter_lock:
+            if self._waiter is None:
+                self._waiter = concurrent.futures.Future()
+            
+            waiter = self._waiter
+            if not self._queue.empty():
+                waiter.set_result(None)
+                self._waiter = None
+        
+        return waiter
+    
+    def get_ready(self, limit: int) -> List[T]:
+        """
+        Obtém, sem esperar, os itens já lidos.
+        
+        Args:
+            limit: Número máximo de itens
+        
+        Returns:
+            Itens disponíveis (o ``END``, se lido, é devolvido à fila)
+        """
+        items = []
+        
+        while len(items) < limit:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if item is END or isinstance(item, Exception):
+                # Entregue pela próxima chamada de ``get``
+                self._queue.put(item)
+                break
+            
+            items.append(item)
+        
+        return items
+    
+    def close(self) -> None:
+        """Encerra a leitura antecipada."""
+        self._stop.set()
+    
+    @staticmethod
+    def _unwrap(item: object) -> object:
+        """
+        Relança o erro da origem, se for o caso.
+        
+        Args:
+            item: Item retirado da fila
+        
+        Returns:
+            O próprio item
+        """
+        if isinstance(item, Exception):
+            raise item
+        return item
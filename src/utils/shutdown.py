@@ -0,0 +1,50 @@
+"""Encerramento gradual de lotes por sinais do sistema."""
+
+import signal
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from .logger import logger
+
+
+@contextmanager
+def drain_on_signals(drain: Callable[[], None]) -> Iterator[None]:
+    """
+    Trata SIGTERM e o primeiro Ctrl+C como pedido de encerramento gradual.
+    
+    SIGTERM (o que um agendador de tarefas envia) e o primeiro SIGINT chamam
+    ``drain``: nenhuma URL nova é iniciada e o lote termina quando os itens
+    em andamento acabarem. Um segundo SIGINT lança ``KeyboardInterrupt``,
+    cancelando o que ainda estiver na fila. Os tratadores anteriores são
+    restaurados na saída. Fora da thread principal nada é instalado.
+    
+    Args:
+        drain: Função que encerra o lote gradualmente
+    
+    Yields:
+        Nada; o bloco executa o lote
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    
+    def on_terminate(signum, frame):
+        logger.warning("Sinal de término recebido: concluindo os itens em andamento...")
+        drain()
+    
+    def on_interrupt(signum, frame):
+        logger.warning(
+            "\nConcluindo os itens em andamento; pressione Ctrl+C de novo para cancelar."
+        )
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        drain()
+    
+    previous_term = signal.signal(signal.SIGTERM, on_terminate)
+    previous_int = signal.signal(signal.SIGINT, on_interrupt)
+    
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGTERM, previous_term)
+        signal.signal(signal.SIGINT, previous_int)
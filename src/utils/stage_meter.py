@@ -0,0 +1,188 @@
+"""Medição de vazão das etapas do pipeline de download."""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+
+# Etapas cronometradas em cada ``DownloadResult`` (na ordem do pipeline)
+STAGE_LABELS = {
+    "probe": "Sondagem",
+    "existence_check": "Verificação de arquivo",
+    "transfer": "Transferência",
+    "postprocess": "Pós-processamento",
+    "finalize": "Finalização",
+}
+
+PERCENTILES = (50, 95, 99)
+
+
+@contextmanager
+def time_stage(timings: Dict[str, float], stage: str) -> Iterator[None]:
+    """
+    Acumula em ``timings`` o tempo gasto pelo bloco em uma etapa.
+    
+    Args:
+        timings: Tempos por etapa do item (``DownloadResult.stage_timings``)
+        stage: Nome da etapa
+    
+    Yields:
+        Nada; o tempo é somado mesmo se o bloco lançar exceção
+    """
+    started = time.monotonic()
+    
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.monotonic() - started
+
+
+def format_stage_timings(timings: Dict[str, float]) -> str:
+    """
+    Formata os tempos por etapa de um item para relatórios.
+    
+    Args:
+        timings: Tempos por etapa (``DownloadResult.stage_timings``)
+    
+    Returns:
+        Texto como "Sondagem 0.84s, Transferência 3.10s" ou "Não disponível"
+    """
+    if not timings:
+        return "Não disponível"
+    
+    return ", ".join(
+        f"{STAGE_LABELS.get(stage, stage)} {seconds:.2f}s"
+        for stage, seconds in timings.items()
+    )
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """
+    Calcula um percentil pelo método do posto mais próximo.
+    
+    Args:
+        sorted_values: Valores em ordem crescente (não vazio)
+        percent: Percentil entre 0 e 100
+    
+    Returns:
+        Valor do percentil
+    """
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_stage_timings(timings: Iterable[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """
+    Resume os tempos por etapa de vários itens em percentis.
+    
+    Args:
+        timings: Tempos por etapa de cada item
+    
+    Returns:
+        Etapa -> {"count", "total", "p50", "p95", "p99"}, na ordem do pipeline
+    """
+    samples: Dict[str, List[float]] = {}
+    
+    for item_timings in timings:
+        for stage, seconds in item_timings.items():
+            samples.setdefault(stage, []).append(seconds)
+    
+    summary = {}
+    stages = [stage for stage in STAGE_LABELS if stage in samples]
+    stages += [stage for stage in samples if stage not in STAGE_LABELS]
+    
+    for stage in stages:
+        values = sorted(samples[stage])
+        summary[stage] = {"count": len(values), "total": sum(values)}
+        for percent in PERCENTILES:
+            summary[stage][f"p{percent}"] = percentile(values, percent)
+    
+    return summary
+
+
+class StageMeter:
+    """
+    Mede itens, bytes e tempo ativo de uma etapa do pipeline.
+    
+    O tempo ativo é a união dos intervalos em que ao menos um item estava na
+    etapa, de modo que a vazão não é diluída pelos períodos em que a etapa
+    ficou ociosa esperando a anterior.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.bytes = 0
+        self._active = 0
+        self._busy_seconds = 0.0
+        self._busy_since = 0.0
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """
+        Marca a execução de um item na etapa.
+        
+        Yields:
+            Nada; o tempo ativo é contado enquanto o bloco executa
+        """
+        with self._lock:
+            if self._active == 0:
+                self._busy_since = time.monotonic()
+            self._active += 1
+        
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+                if self._active == 0:
+                    self._busy_seconds += time.monotonic() - self._busy_since
+    
+    def add(self, size: int) -> None:
+        """
+        Contabiliza um item concluído pela etapa.
+        
+        Args:
+            size: Bytes processados pelo item
+        """
+        with self._lock:
+            self.items += 1
+            self.bytes += size
+    
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Retorna os contadores da etapa.
+        
+        Returns:
+            Dicionário com itens, bytes e segundos ativos
+        """
+        with self._lock:
+            busy_seconds = self._busy_seconds
+            if self._active:
+                busy_seconds += time.monotonic() - self._busy_since
+            
+            return {"items": self.items, "bytes": self.bytes, "seconds": busy_seconds}
+    
+    @staticmethod
+    def format_stats(name: str, stats: Dict[str, float]) -> str:
+        """
+        Formata os contadores de uma etapa em uma linha legível.
+        
+        Args:
+            name: Nome da etapa
+            stats: Contadores retornados por ``get_stats``
+        
+        Returns:
+            Texto no formato "Download: 12 itens, 48.0 MB em 6.1s (7.9 MB/s)"
+        """
+        megabytes = stats["bytes"] / 1_000_000
+        seconds = stats["seconds"]
+        throughput = megabytes / seconds if seconds else 0.0
+        
+        return (
+            f"{name}: {stats['items']} itens, {megabytes:.1f} MB em {seconds:.1f}s "
+            f"({throughput:.1f} MB/s)"
+        )
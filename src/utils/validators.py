@@ -1,7 +1,7 @@
 """Validadores para URLs e entradas do usuário."""
 
 import re
-from typing import List
+from typing import List, Optional
 
 
 class URLValidator:
@@ -14,6 +14,8 @@ class URLValidator:
         r'youtube\.com/embed'
     ]
     
+    VIDEO_ID_PATTERN = r'(?:[?&]v=|youtu\.be/|youtube\.com/(?:embed|shorts)/)([\w-]{11})'
+    
     @classmethod
     def is_valid_youtube_url(cls, url: str) -> bool:
         """
@@ -44,6 +46,34 @@ class URLValidator:
         """
         return bool(re.search(r"[?&]list=", url))
     
+    @classmethod
+    def extract_video_id(cls, url: str) -> Optional[str]:
+        """
+        Extrai o ID do vídeo de uma URL do YouTube sem acessar a rede.
+        
+        Args:
+            url: URL do vídeo
+        
+        Returns:
+            ID do vídeo ou None se a URL não contiver um
+        """
+        match = re.search(cls.VIDEO_ID_PATTERN, url or "")
+        return match.group(1) if match else None
+    
+    @classmethod
+    def extract_playlist_id(cls, url: str) -> Optional[str]:
+        """
+        Extrai o ID da playlist de uma URL do YouTube sem acessar a rede.
+        
+        Args:
+            url: URL da playlist
+        
+        Returns:
+            ID da playlist ou None se a URL não contiver um
+        """
+        match = re.search(r"[?&]list=([\w-]+)", url or "")
+        return match.group(1) if match else None
+    
     @classmethod
     def validate_url_list(cls, urls: List[str]) -> List[str]:
         """
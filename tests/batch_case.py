@@ -0,0 +1,64 @@
+"""Base dos testes que executam lotes contra o servidor local."""
+
+import os
+import tempfile
+import unittest
+
+from src.config.settings import paths, settings
+from src.services.ffmpeg_manager import FFmpegManager
+from src.services.youtube_downloader import YouTubeDownloader
+
+
+class BatchTestCase(unittest.TestCase):
+    """
+    Prepara um diretório de downloads temporário e um downloader.
+    
+    As configurações de ``OVERRIDES`` valem durante o teste e são
+    restauradas ao final.
+    """
+    
+    OVERRIDES = {
+        "DOWNLOAD_ENGINE": "threads",
+        "PROCESS_SHARDS": 1,
+        "METADATA_CACHE_ENABLED": False,
+        "PROGRESS_STATUS_LINE": False,
+        "LOG_LEVEL": "ERROR",
+    }
+    
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.download_dir = workdir.name
+        
+        previous_dir = paths.DOWNLOAD_DIR
+        paths.DOWNLOAD_DIR = workdir.name
+        self.addCleanup(setattr, paths, "DOWNLOAD_DIR", previous_dir)
+        
+        for name, value in self.OVERRIDES.items():
+            self.override(name, value)
+        
+        self.downloader = YouTubeDownloader(FFmpegManager())
+        self.addCleanup(self.downloader.close)
+    
+    def override(self, name: str, value: object) -> None:
+        """
+        Altera uma configuração até o fim do teste.
+        
+        Args:
+            name: Nome do atributo de ``settings``
+            value: Valor durante o teste
+        """
+        self.addCleanup(setattr, settings, name, getattr(settings, name))
+        setattr(settings, name, value)
+    
+    def output_files(self) -> list:
+        """
+        Lista os arquivos baixados (sem arquivos ocultos e ``.part``).
+        
+        Returns:
+            Nomes dos arquivos, em ordem
+        """
+        return sorted(
+            name for name in os.listdir(self.download_dir)
+            if not name.startswith(".") and not name.endswith(".part")
+        )
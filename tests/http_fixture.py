@@ -0,0 +1,91 @@
+"""Servidor HTTP local usado pelos testes."""
+
+import http.server
+import re
+import threading
+from typing import Dict, List, Optional
+
+
+class FixtureServer:
+    """
+    Serve arquivos em memória em 127.0.0.1, com suporte opcional a ``Range``.
+    
+    Registra o cabeçalho ``Range`` de cada GET em ``requests`` para que os
+    testes confiram quais bytes foram pedidos.
+    """
+    
+    def __init__(self, files: Dict[str, bytes], ranges: bool = True):
+        self.files = files
+        self.ranges = ranges
+        self.requests: List[tuple] = []
+        self._server: Optional[http.server.ThreadingHTTPServer] = None
+    
+    def __enter__(self) -> "FixtureServer":
+        fixture = self
+        
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_HEAD(self):
+                self._respond(send_body=False)
+            
+            def do_GET(self):
+                fixture.requests.append((self.path, self.headers.get("Range")))
+                self._respond(send_body=True)
+            
+            def _respond(self, send_body: bool):
+                data = fixture.files.get(self.path)
+                if data is None:
+                    self.send_error(404)
+                    return
+                
+                match = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range") or "")
+                
+                if fixture.ranges and match:
+                    start = int(match.group(1))
+                    end = min(int(match.group(2) or len(data) - 1), len(data) - 1)
+                    
+                    if start >= len(data):
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{len(data)}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    
+                    body = data[start:end + 1]
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+                else:
+                    body = data
+                    self.send_response(200)
+                
+                if fixture.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                
+                if send_body:
+                    self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def url(self, path: str) -> str:
+        """
+        Monta a URL de um arquivo servido.
+        
+        Args:
+            path: Caminho do arquivo (ex.: "/ffmpeg.zip")
+        
+        Returns:
+            URL completa
+        """
+        return f"http://127.0.0.1:{self._server.server_address[1]}{path}"
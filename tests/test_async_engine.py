@@ -0,0 +1,105 @@
+"""Testes do motor de download asyncio contra o servidor local."""
+
+import os
+import tempfile
+import unittest
+
+from src.config.settings import paths
+from src.models.download_result import DownloadType
+from src.services.async_engine import AsyncDownloadEngine
+from src.services.ffmpeg_manager import FFmpegManager
+from src.services.youtube_downloader import YouTubeDownloader
+from tests.batch_case import BatchTestCase
+from tests.http_fixture import FixtureServer
+
+CHUNK_SIZE = 16 * 1024
+
+
+@unittest.skipUnless(AsyncDownloadEngine.is_available(), "aiohttp não instalado")
+class AsyncEngineTest(BatchTestCase):
+    """Busca por faixas, retomada e contabilização do motor ``asyncio``."""
+    
+    OVERRIDES = {
+        **BatchTestCase.OVERRIDES,
+        "DOWNLOAD_ENGINE": "asyncio",
+        "ASYNC_CHUNK_SIZE": CHUNK_SIZE,
+    }
+    
+    def setUp(self):
+        super().setUp()
+        self.data = os.urandom(4 * CHUNK_SIZE + 100)
+    
+    def _read_output(self, name: str) -> bytes:
+        with open(os.path.join(self.download_dir, name), "rb") as f:
+            return f.read()
+    
+    @staticmethod
+    def _ranges(server: FixtureServer, path: str) -> list:
+        return [header for request_path, header in server.requests if request_path == path and header]
+    
+    def test_ranged_fetch(self):
+        with FixtureServer({"/video.mp4": self.data}) as server:
+            result = self.downloader.download_batch([server.url("/video.mp4")], DownloadType.VIDEO)
+        
+        self.assertEqual(result.successful, 1)
+        self.assertEqual(self._read_output("video.mp4"), self.data)
+        self.assertEqual(sorted(self._ranges(server, "/video.mp4")), sorted(
+            f"bytes={start}-{min(start + CHUNK_SIZE, len(self.data)) - 1}"
+            for start in range(0, len(self.data), CHUNK_SIZE)
+        ))
+        self.assertEqual(self.output_files(), ["video.mp4"])
+    
+    def test_server_ignoring_range(self):
+        with FixtureServer({"/video.mp4": self.data}, ranges=False) as server:
+            result = self.downloader.download_batch([server.url("/video.mp4")], DownloadType.VIDEO)
+        
+        self.assertEqual(result.successful, 1)
+        self.assertEqual(self._read_output("video.mp4"), self.data)
+        # A resposta 200 à primeira faixa já trouxe o arquivo inteiro
+        self.assertEqual(len(self._ranges(server, "/video.mp4")), 1)
+    
+    def test_resume_from_range_log(self):
+        part_path = os.path.join(self.download_dir, "video.mp4.part")
+        done = (0, 2)
+        
+        with open(part_path, "wb") as f:
+            f.write(bytes(len(self.data)))
+            for index in done:
+                f.seek(index * CHUNK_SIZE)
+                f.write(self.data[index * CHUNK_SIZE:(index + 1) * CHUNK_SIZE])
+        with open(part_path + ".ranges", "w", encoding="utf-8") as log:
+            log.write(f"{len(self.data)}\n" + "".join(f"{index}\n" for index in done))
+        
+        with FixtureServer({"/video.mp4": self.data}) as server:
+            result = self.downloader.download_batch([server.url("/video.mp4")], DownloadType.VIDEO)
+        
+        self.assertEqual(result.successful, 1)
+        self.assertEqual(self._read_output("video.mp4"), self.data)
+        requested = {int(header[len("bytes="):].split("-")[0]) for header in self._ranges(server, "/video.mp4")}
+        self.assertEqual(requested, {CHUNK_SIZE, 3 * CHUNK_SIZE, 4 * CHUNK_SIZE})
+        self.assertFalse(os.path.exists(part_path + ".ranges"))
+    
+    def test_failing_url_counts_match_threads_engine(self):
+        files = {f"/video{i}.mp4": self.data for i in range(3)}
+        
+        with FixtureServer(files) as server:
+            urls = [server.url(path) for path in files] + [server.url("/missing.mp4")]
+            result = self.downloader.download_batch(urls, DownloadType.VIDEO)
+            
+            # Mesmo lote pelo motor ``threads``, em outro diretório
+            self.override("DOWNLOAD_ENGINE", "threads")
+            workdir = tempfile.TemporaryDirectory()
+            self.addCleanup(workdir.cleanup)
+            paths.DOWNLOAD_DIR = workdir.name
+            threaded = YouTubeDownloader(FFmpegManager())
+            self.addCleanup(threaded.close)
+            expected = threaded.download_batch(urls, DownloadType.VIDEO)
+        
+        counts = lambda batch: (batch.total_downloads, batch.successful, batch.failed, batch.skipped)
+        self.assertEqual(counts(result), (4, 3, 1, 0))
+        self.assertEqual(counts(result), counts(expected))
+        self.assertEqual(self.output_files(), ["video0.mp4", "video1.mp4", "video2.mp4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
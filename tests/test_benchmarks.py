@@ -0,0 +1,37 @@
+"""Execuções reduzidas dos benchmarks, para que não deixem de funcionar."""
+
+import unittest
+
+from benchmarks import bench_option_profiles, bench_result_memory, bench_ydl_pool
+
+
+class YDLPoolBenchmarkTest(unittest.TestCase):
+    """Sondagem com ``YoutubeDL`` novo x pool, com extrator falso."""
+    
+    def test_pool_reuses_instances(self):
+        result = bench_ydl_pool.run(items=8, workers=2)
+        
+        self.assertLessEqual(result["pooled_instances"], 2)
+        self.assertLess(result["pooled_ms_per_item"], result["fresh_ms_per_item"])
+
+
+class OptionProfilesBenchmarkTest(unittest.TestCase):
+    """Opções de download montadas por item x perfil pronto."""
+    
+    def test_profile_is_cheaper(self):
+        result = bench_option_profiles.run(items=200)
+        
+        self.assertLess(result["profile_us_per_item"], result["rebuilt_us_per_item"])
+
+
+class ResultMemoryBenchmarkTest(unittest.TestCase):
+    """Memória de ``DownloadResult`` com e sem slots."""
+    
+    def test_slots_use_less_memory(self):
+        result = bench_result_memory.run(items=2000)
+        
+        self.assertLess(result["slots_bytes_per_item"], result["plain_bytes_per_item"])
+
+
+if __name__ == "__main__":
+    unittest.main()
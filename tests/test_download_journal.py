@@ -0,0 +1,68 @@
+"""Testes do diário de downloads."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from src.models.download_result import DownloadResult, DownloadStatus, DownloadType
+from src.services.download_journal import DownloadJournal
+
+
+class DownloadJournalTest(unittest.TestCase):
+    """Retomada e compactação do diário."""
+    
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.workdir = workdir.name
+        self.journal_path = os.path.join(self.workdir, "journal.jsonl")
+    
+    def _result(self, status: DownloadStatus, output_path: str = None) -> DownloadResult:
+        return DownloadResult(
+            url="https://www.youtube.com/watch?v=aaaaaaaaaaa",
+            status=status,
+            download_type=DownloadType.VIDEO,
+            output_path=output_path
+        )
+    
+    def _lines(self) -> list:
+        with open(self.journal_path, encoding="utf-8") as f:
+            return f.read().splitlines()
+    
+    def _write_history(self, output_path: str) -> None:
+        journal = DownloadJournal(self.journal_path)
+        journal.record("video:a", self._result(DownloadStatus.FAILED))
+        journal.record("video:a", self._result(DownloadStatus.SUCCESS, output_path))
+        journal.record("video:b", self._result(DownloadStatus.FAILED))
+        
+        # Registro truncado por uma interrupção
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"key": "video:c", "sta')
+    
+    def test_load_keeps_latest_record_per_key(self):
+        output_path = os.path.join(self.workdir, "a.mp4")
+        open(output_path, "wb").close()
+        self._write_history(output_path)
+        
+        journal = DownloadJournal(self.journal_path)
+        self.assertEqual(journal.get_completed("video:a")["output_path"], output_path)
+        self.assertIsNone(journal.get_completed("video:b"))
+        
+        lines = [json.loads(line) for line in self._lines()]
+        self.assertEqual([(r["key"], r["status"]) for r in lines], [("video:a", "success"), ("video:b", "failed")])
+        
+        # Novos registros continuam sendo acrescentados ao arquivo compactado
+        journal.record("video:b", self._result(DownloadStatus.SUCCESS, output_path))
+        self.assertEqual(len(self._lines()), 3)
+    
+    def test_no_compaction_when_disabled(self):
+        self._write_history(os.path.join(self.workdir, "a.mp4"))
+        
+        DownloadJournal(self.journal_path, compact=False).load()
+        
+        self.assertEqual(len(self._lines()), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Testes da expansão de playlists do lote."""
+
+import collections
+import threading
+import types
+import unittest
+from unittest import mock
+
+from src.core import app as app_module
+from src.core.app import YouTubeDownloaderApp
+from src.utils.read_ahead import ReadAhead
+from src.utils.validators import URLValidator
+
+
+def playlist_url(playlist_id: str) -> str:
+    return f"https://www.youtube.com/playlist?list={playlist_id}"
+
+
+def video_url(video_id: str) -> str:
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+class FakePlaylistHandler:
+    """Conta as resoluções de cada playlist, por método."""
+    
+    def __init__(self, playlists: dict):
+        self.playlists = playlists
+        self.calls = collections.Counter()
+        self._lock = threading.Lock()
+    
+    def _entries(self, method: str, url: str) -> list:
+        with self._lock:
+            self.calls[method, url] += 1
+        return [video_url(video_id) for video_id in self.playlists[url]]
+    
+    def get_playlist_entries(self, url: str) -> list:
+        return self._entries("get", url)
+    
+    def iter_playlist_entries(self, url: str):
+        yield from self._entries("iter", url)
+
+
+class PrimedReadAhead(ReadAhead):
+    """Lê a entrada inteira antes de entregar o primeiro item."""
+    
+    def __init__(self, iterable, size):
+        super().__init__(iterable, size)
+        self._thread.join(timeout=5)
+
+
+class ExpandPlaylistsTest(unittest.TestCase):
+    """Ordem, deduplicação e uma resolução por playlist."""
+    
+    def _expand(self, urls: list, playlists: dict) -> tuple:
+        handler = FakePlaylistHandler(playlists)
+        app = types.SimpleNamespace(url_validator=URLValidator(), playlist_handler=handler)
+        
+        # Toda a entrada já está na janela quando a primeira URL é tratada
+        with mock.patch.object(app_module, "ReadAhead", PrimedReadAhead):
+            expanded = list(YouTubeDownloaderApp._expand_playlists(app, iter(urls)))
+        
+        return expanded, handler.calls
+    
+    def test_repeated_playlist_is_resolved_once(self):
+        first, second = playlist_url("PLfirst"), playlist_url("PLsecond")
+        playlists = {first: ["aaaaaaaaaaa", "bbbbbbbbbbb"], second: ["bbbbbbbbbbb", "ccccccccccc"]}
+        
+        expanded, calls = self._expand(
+            [first, video_url("ddddddddddd"), first, second, first], playlists
+        )
+        
+        self.assertEqual(expanded, [
+            video_url("aaaaaaaaaaa"), video_url("bbbbbbbbbbb"),
+            video_url("ddddddddddd"), video_url("ccccccccccc"),
+        ])
+        # A playlist atual é gerada página a página; só a da janela é
+        # resolvida em segundo plano
+        self.assertEqual(calls, {("iter", first): 1, ("get", second): 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
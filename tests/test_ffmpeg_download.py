@@ -0,0 +1,149 @@
+"""Testes do download retomável do FFmpeg."""
+
+import hashlib
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+
+from src.config.settings import settings
+from src.services.ffmpeg_manager import FFmpegManager
+from tests.http_fixture import FixtureServer
+
+
+def build_fixture_zip() -> bytes:
+    """Monta um ZIP com a mesma estrutura do pacote publicado."""
+    buffer = io.BytesIO()
+    
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        archive.writestr("ffmpeg-release/bin/ffmpeg", b"#!/bin/sh\necho ffmpeg\n")
+        # Conteúdo incompressível para que o ZIP tenha vários blocos
+        archive.writestr("ffmpeg-release/doc/padding.bin", os.urandom(3 * 1024 * 1024))
+    
+    return buffer.getvalue()
+
+
+class FFmpegDownloadTest(unittest.TestCase):
+    """Baixa um ZIP de fixture servido localmente."""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.zip_data = build_fixture_zip()
+        cls.checksum = hashlib.sha256(cls.zip_data).hexdigest()
+    
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        
+        self.previous = (settings.FFMPEG_DOWNLOAD_PARTS, settings.FFMPEG_VERIFY_CHECKSUM)
+        self.addCleanup(self._restore_settings)
+        settings.FFMPEG_DOWNLOAD_PARTS = 4
+        settings.FFMPEG_VERIFY_CHECKSUM = True
+        
+        FFmpegManager.CHUNK_SIZE = 64 * 1024
+        self.addCleanup(setattr, FFmpegManager, "CHUNK_SIZE", 1024 * 1024)
+    
+    def _restore_settings(self):
+        settings.FFMPEG_DOWNLOAD_PARTS, settings.FFMPEG_VERIFY_CHECKSUM = self.previous
+    
+    def _make_manager(self, server: FixtureServer) -> FFmpegManager:
+        manager = FFmpegManager()
+        manager.ffmpeg_dir = self.workdir.name
+        manager.ffmpeg_path = os.path.join(self.workdir.name, "ffmpeg")
+        manager.download_url = server.url("/ffmpeg.zip")
+        manager.checksum_url = server.url("/ffmpeg.zip.sha256")
+        return manager
+    
+    def _files(self, checksum: str = None) -> dict:
+        return {
+            "/ffmpeg.zip": self.zip_data,
+            "/ffmpeg.zip.sha256": f"{checksum or self.checksum}  ffmpeg.zip\n".encode()
+        }
+    
+    def _zip_ranges(self, server: FixtureServer) -> list:
+        return [header for path, header in server.requests if path == "/ffmpeg.zip"]
+    
+    def _read_zip(self, zip_path: str) -> bytes:
+        with open(zip_path, "rb") as f:
+            return f.read()
+    
+    def test_parallel_parts(self):
+        with FixtureServer(self._files()) as server:
+            zip_path = self._make_manager(server)._download_ffmpeg()
+        
+        self.assertEqual(self._read_zip(zip_path), self.zip_data)
+        self.assertEqual(len(self._zip_ranges(server)), 4)
+        self.assertTrue(all(header.startswith("bytes=") for header in self._zip_ranges(server)))
+        self.assertEqual(os.listdir(self.workdir.name), ["ffmpeg.zip"])
+    
+    def test_resume_partial_segment(self):
+        part_size = -(-len(self.zip_data) // 4)
+        zip_path = os.path.join(self.workdir.name, "ffmpeg.zip")
+        
+        # Segunda faixa interrompida após 1000 bytes
+        segment_path = f"{zip_path}.{part_size}-{2 * part_size - 1}.part"
+        with open(segment_path, "wb") as f:
+            f.write(self.zip_data[part_size:part_size + 1000])
+        
+        with FixtureServer(self._files()) as server:
+            self._make_manager(server)._download_ffmpeg()
+        
+        self.assertEqual(self._read_zip(zip_path), self.zip_data)
+        self.assertIn(f"bytes={part_size + 1000}-{2 * part_size - 1}", self._zip_ranges(server))
+    
+    def test_resume_finished_single_stream_part(self):
+        settings.FFMPEG_DOWNLOAD_PARTS = 1
+        zip_path = os.path.join(self.workdir.name, "ffmpeg.zip")
+        
+        with open(zip_path + ".part", "wb") as f:
+            f.write(self.zip_data)
+        
+        with FixtureServer(self._files()) as server:
+            self._make_manager(server)._download_ffmpeg()
+        
+        self.assertEqual(self._read_zip(zip_path), self.zip_data)
+        self.assertEqual(self._zip_ranges(server), [])
+    
+    def test_finished_part_answered_with_416(self):
+        manager = FFmpegManager()
+        part_path = os.path.join(self.workdir.name, "ffmpeg.zip.part")
+        
+        with open(part_path, "wb") as f:
+            f.write(self.zip_data)
+        
+        with FixtureServer(self._files()) as server:
+            manager.download_url = server.url("/ffmpeg.zip")
+            manager._fetch_range(part_path, 0, None)
+        
+        self.assertEqual(self._read_zip(part_path), self.zip_data)
+        self.assertEqual(self._zip_ranges(server), [f"bytes={len(self.zip_data)}-"])
+    
+    def test_checksum_mismatch(self):
+        with FixtureServer(self._files(checksum="0" * 64)) as server:
+            manager = self._make_manager(server)
+            
+            with self.assertRaisesRegex(Exception, "Checksum"):
+                manager._download_ffmpeg()
+        
+        self.assertFalse(os.path.exists(os.path.join(self.workdir.name, "ffmpeg.zip")))
+    
+    def test_server_without_range_support(self):
+        zip_path = os.path.join(self.workdir.name, "ffmpeg.zip")
+        
+        # Um ``.part`` antigo não pode ser retomado: o download recomeça
+        with open(zip_path + ".part", "wb") as f:
+            f.write(b"stale")
+        
+        with FixtureServer(self._files(), ranges=False) as server:
+            manager = self._make_manager(server)
+            manager._download_ffmpeg()
+            manager._extract_ffmpeg(zip_path)
+        
+        self.assertEqual(self._read_zip(zip_path), self.zip_data)
+        self.assertEqual(self._zip_ranges(server), [None])
+        self.assertTrue(os.path.exists(manager.ffmpeg_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""Testes do cache de metadados em SQLite."""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from src.services.metadata_cache import MetadataCache
+
+
+class MetadataCacheTest(unittest.TestCase):
+    """Acertos, gravação em lote dos acessos e remoção LRU."""
+    
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.db_path = os.path.join(workdir.name, "cache.sqlite3")
+    
+    def _make_cache(self, **kwargs) -> MetadataCache:
+        cache = MetadataCache(db_path=self.db_path, ttl=0, enabled=True, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+    
+    def _accessed_at(self, key: str) -> float:
+        with sqlite3.connect(self.db_path) as connection:
+            return connection.execute(
+                "SELECT accessed_at FROM metadata WHERE key = ?", (key,)
+            ).fetchone()[0]
+    
+    def test_hit_access_time_is_written_in_batches(self):
+        cache = self._make_cache()
+        cache.put("a", {"title": "A"})
+        written = self._accessed_at("a")
+        
+        self.assertEqual(cache.get("a"), {"title": "A"})
+        self.assertEqual(self._accessed_at("a"), written)
+        
+        cache.close()
+        self.assertGreater(self._accessed_at("a"), written)
+        self.assertEqual(cache.get_stats()["hits"], 1)
+    
+    def test_eviction_keeps_recently_read_entries(self):
+        cache = self._make_cache(max_entries=10)
+        for i in range(10):
+            cache.put(f"v{i}", {"i": i})
+        
+        # ``v0`` foi lido depois de todas as inserções: não é o menos recente
+        cache.get("v0")
+        cache.put("v10", {"i": 10})
+        
+        self.assertEqual(cache.get("v0"), {"i": 0})
+        self.assertIsNone(cache.get("v1"))
+        self.assertEqual(cache.get_stats()["evictions"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
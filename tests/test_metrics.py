@@ -0,0 +1,85 @@
+"""Testes do endpoint de métricas do Prometheus."""
+
+import os
+import re
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from typing import Optional
+
+from src.models.download_result import DownloadType
+from src.services.metrics import MetricsServer
+from tests.batch_case import BatchTestCase
+from tests.http_fixture import FixtureServer
+
+
+def scrape(url: str) -> str:
+    """Lê o corpo de ``/metrics``."""
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.read().decode("utf-8")
+
+
+def sample(body: str, name: str) -> Optional[float]:
+    """Obtém o valor de uma amostra (nome com rótulos, se houver)."""
+    match = re.search(rf"^{re.escape(name)} (\S+)$", body, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+class MetricsEndpointTest(BatchTestCase):
+    """Coleta ``/metrics`` durante um lote servido localmente."""
+    
+    def test_scrape_during_batch(self):
+        files = {f"/video{i}.mp4": os.urandom(256 * 1024) for i in range(3)}
+        server = MetricsServer(self.downloader.metrics, port=0)
+        self.assertTrue(server.start())
+        self.addCleanup(server.stop)
+        metrics_url = f"http://127.0.0.1:{server.port}/metrics"
+        
+        scrapes = []
+        stop = threading.Event()
+        
+        def scrape_loop():
+            while not stop.is_set():
+                scrapes.append(scrape(metrics_url))
+                stop.wait(0.05)
+        
+        with FixtureServer(files) as fixture:
+            urls = [fixture.url(path) for path in files] + [fixture.url("/missing.mp4")]
+            
+            scraper = threading.Thread(target=scrape_loop)
+            scraper.start()
+            try:
+                result = self.downloader.download_batch(urls, DownloadType.VIDEO)
+            finally:
+                stop.set()
+                scraper.join()
+        
+        self.assertEqual((result.successful, result.failed), (3, 1))
+        self.assertTrue(scrapes)
+        
+        body = scrape(metrics_url)
+        self.assertEqual(sample(body, 'youtube_downloader_items_total{status="success"}'), 3)
+        self.assertEqual(sample(body, 'youtube_downloader_items_total{status="failed"}'), 1)
+        self.assertEqual(sample(body, "youtube_downloader_downloaded_bytes_total"), 3 * 256 * 1024)
+        self.assertEqual(sample(body, "youtube_downloader_downloads_in_flight"), 0)
+        self.assertEqual(sample(body, "youtube_downloader_probe_duration_seconds_count"), 4)
+        self.assertEqual(sample(body, "youtube_downloader_transfer_duration_seconds_count"), 3)
+        self.assertEqual(
+            sample(body, 'youtube_downloader_transfer_duration_seconds_bucket{le="+Inf"}'), 3
+        )
+        self.assertIn("# TYPE youtube_downloader_transfer_duration_seconds histogram", body)
+    
+    def test_unknown_path(self):
+        server = MetricsServer(self.downloader.metrics, port=0)
+        self.assertTrue(server.start())
+        self.addCleanup(server.stop)
+        
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            scrape(f"http://127.0.0.1:{server.port}/")
+        
+        self.assertEqual(context.exception.code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+"""Testes da leitura de playlists paginadas."""
+
+import unittest
+
+from yt_dlp.utils import InAdvancePagedList, OnDemandPagedList
+
+from src.services.playlist_handler import PlaylistHandler
+
+
+class PagedEntriesTest(unittest.TestCase):
+    """As páginas são buscadas só quando o consumidor chega a elas."""
+    
+    def setUp(self):
+        self.fetched = []
+    
+    def _page(self, pagenum: int, last_page: int = 2) -> list:
+        self.fetched.append(pagenum)
+        size = 3 if pagenum < last_page else 1
+        return [{"id": f"{pagenum}-{i}"} for i in range(size)]
+    
+    def test_on_demand_pages_are_fetched_lazily(self):
+        entries = PlaylistHandler._iter_pages(OnDemandPagedList(self._page, 3))
+        
+        self.assertEqual(next(entries), {"id": "0-0"})
+        self.assertEqual(self.fetched, [0])
+        
+        self.assertEqual(len(list(entries)), 6)
+        self.assertEqual(self.fetched, [0, 1, 2])
+    
+    def test_in_advance_pages_stop_at_page_count(self):
+        entries = PlaylistHandler._iter_pages(
+            InAdvancePagedList(lambda n: self._page(n, last_page=3), 2, 3)
+        )
+        
+        self.assertEqual([entry["id"] for entry in entries][-1], "1-2")
+        self.assertEqual(self.fetched, [0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
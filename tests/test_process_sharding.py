@@ -0,0 +1,66 @@
+"""Testes dos lotes divididos entre processos."""
+
+import os
+import time
+import unittest
+
+from src.models.download_result import DownloadType
+from tests.batch_case import BatchTestCase
+from tests.http_fixture import FixtureServer
+
+
+class ShardedBatchTest(BatchTestCase):
+    """Alimentação incremental, resultados por item e encerramento gradual."""
+    
+    OVERRIDES = {**BatchTestCase.OVERRIDES, "PROCESS_SHARDS": 2}
+    
+    def _wait_for_results(self, count: int, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.downloader._batch_results.total >= count:
+                return True
+            time.sleep(0.05)
+        return False
+    
+    def test_results_stream_while_source_is_read(self):
+        files = {f"/video{i}.mp4": os.urandom(16 * 1024) for i in range(3)}
+        first_result_while_reading = []
+        
+        with FixtureServer(files) as server:
+            def urls():
+                yield server.url("/video0.mp4")
+                yield server.url("/missing.mp4")
+                # Os processos ainda esperam por URLs: os resultados já
+                # concluídos precisam chegar ao processo pai antes do fim
+                first_result_while_reading.append(self._wait_for_results(2, timeout=30))
+                yield server.url("/video1.mp4")
+                yield server.url("/video2.mp4")
+            
+            result = self.downloader.download_batch(urls(), DownloadType.VIDEO)
+        
+        self.assertEqual(first_result_while_reading, [True])
+        self.assertEqual((result.total_downloads, result.successful, result.failed), (4, 3, 1))
+        self.assertEqual(self.output_files(), ["video0.mp4", "video1.mp4", "video2.mp4"])
+    
+    def test_drain_is_forwarded_to_shards(self):
+        files = {f"/video{i}.mp4": os.urandom(16 * 1024) for i in range(2)}
+        
+        with FixtureServer(files) as server:
+            def urls():
+                yield server.url("/video0.mp4")
+                yield server.url("/video1.mp4")
+                self._wait_for_results(2, timeout=30)
+                # Como um SIGTERM enviado só ao processo pai
+                self.downloader.drain_batch()
+                # Origem sem fim: o lote só termina se a leitura for interrompida
+                while True:
+                    yield server.url("/video0.mp4")
+            
+            result = self.downloader.download_batch(urls(), DownloadType.VIDEO)
+        
+        self.assertEqual(result.successful, 2)
+        self.assertEqual(result.failed, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Testes do pipeline em threads (sondagem, transferência e conversão)."""
+
+import os
+import time
+import unittest
+from unittest import mock
+
+from src.models.download_result import DownloadType
+from tests.batch_case import BatchTestCase
+from tests.http_fixture import FixtureServer
+
+
+class ThreadedPipelineTest(BatchTestCase):
+    """Lotes servidos localmente pelo motor ``threads``."""
+    
+    def _wait_for_file(self, name: str, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if name in self.output_files():
+                return True
+            time.sleep(0.05)
+        return False
+    
+    def test_slow_source_does_not_stall_transfers(self):
+        files = {f"/video{i}.mp4": os.urandom(64 * 1024) for i in range(2)}
+        first_done_while_reading = []
+        
+        with FixtureServer(files) as server:
+            def urls():
+                yield server.url("/video0.mp4")
+                # Simula a busca demorada da próxima página de uma playlist:
+                # o primeiro item precisa terminar enquanto a origem espera
+                first_done_while_reading.append(self._wait_for_file("video0.mp4", timeout=10))
+                yield server.url("/video1.mp4")
+            
+            result = self.downloader.download_batch(urls(), DownloadType.VIDEO)
+        
+        self.assertEqual(first_done_while_reading, [True])
+        self.assertEqual(result.successful, 2)
+        self.assertEqual(self.output_files(), ["video0.mp4", "video1.mp4"])
+    
+    def test_full_transcode_queue_holds_transfers(self):
+        self.override("ADAPTIVE_CONCURRENCY", False)
+        self.override("MAX_PARALLEL_DOWNLOADS", 1)
+        self.override("TRANSCODE_WORKERS", 1)
+        self.override("TRANSCODE_QUEUE_FACTOR", 1)
+        
+        files = {f"/audio{i}.m4a": os.urandom(16 * 1024) for i in range(3)}
+        transferred_during_transcode = []
+        
+        def transcode(source_path):
+            # A primeira conversão ocupa a única vaga da fila: nenhum outro
+            # item pode ser transferido enquanto ela dura
+            if not transferred_during_transcode:
+                known = self.output_files()
+                time.sleep(1)
+                transferred_during_transcode.append(self.output_files() != known)
+            return source_path
+        
+        with FixtureServer(files) as server, mock.patch.object(
+            self.downloader.transcoder, "transcode", side_effect=transcode
+        ):
+            result = self.downloader.download_batch(
+                [server.url(path) for path in files], DownloadType.AUDIO
+            )
+        
+        self.assertEqual(transferred_during_transcode, [False])
+        self.assertEqual(result.successful, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()